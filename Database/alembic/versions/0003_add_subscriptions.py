@@ -0,0 +1,42 @@
+"""Add alert subscriptions
+Revision ID: 0003_add_subscriptions
+Revises: 0002_add_auth_tables
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0003_add_subscriptions'
+down_revision = '0002_add_auth_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'subscriptions',
+        sa.Column('subscription_id', postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('channel', sa.String(length=32), nullable=False),
+        sa.Column('target', sa.String(length=512), nullable=False),
+        sa.Column('disaster_types', postgresql.ARRAY(sa.String(length=64)), nullable=True),
+        sa.Column('severities', postgresql.ARRAY(sa.String(length=16)), nullable=True),
+        sa.Column('center_lat', sa.Float(), nullable=True),
+        sa.Column('center_lng', sa.Float(), nullable=True),
+        sa.Column('radius_km', sa.Float(), nullable=True),
+        sa.Column('polygon', postgresql.JSONB(), nullable=True),
+        sa.Column('active', sa.Boolean(), nullable=False, server_default=sa.text('true')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.CheckConstraint('radius_km IS NULL OR radius_km > 0', name='ck_subscription_radius_positive'),
+    )
+    op.create_foreign_key(None, 'subscriptions', 'users', ['user_id'], ['user_id'], ondelete='CASCADE')
+    op.create_index('ix_subscriptions_user_id', 'subscriptions', ['user_id'])
+    op.create_index('ix_subscriptions_updated_at', 'subscriptions', ['updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_subscriptions_updated_at', table_name='subscriptions')
+    op.drop_index('ix_subscriptions_user_id', table_name='subscriptions')
+    op.drop_table('subscriptions')
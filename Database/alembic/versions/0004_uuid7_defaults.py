@@ -0,0 +1,51 @@
+"""Time-ordered UUIDv7 key defaults
+Revision ID: 0004_uuid7_defaults
+Revises: 0003_add_subscriptions
+Create Date: 2026-10-19 00:00:00.000000
+
+The ORM generates keys client-side (python/ids.py); the server default covers rows inserted in SQL.
+Existing uuid4 keys are kept: they are referenced by foreign keys, and a UUID column takes both kinds.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0004_uuid7_defaults'
+down_revision = '0003_add_subscriptions'
+branch_labels = None
+depends_on = None
+
+# table -> primary key column
+KEYS = {
+    'social_media_posts': 'post_id',
+    'disasters': 'disaster_id',
+    'results': 'result_id',
+    'credibility': 'credibility_id',
+}
+
+UUID_V7_FUNCTION = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid
+LANGUAGE plpgsql VOLATILE PARALLEL SAFE AS $$
+DECLARE
+  v bytea := overlay(gen_random_bytes(16)
+                     PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                     FROM 1 FOR 6);
+BEGIN
+  v := set_byte(v, 6, (get_byte(v, 6) & 15) | 112);
+  v := set_byte(v, 8, (get_byte(v, 8) & 63) | 128);
+  RETURN encode(v, 'hex')::uuid;
+END;
+$$
+"""
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pgcrypto')
+    op.execute(UUID_V7_FUNCTION)
+    for table, column in KEYS.items():
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT uuid_generate_v7()')
+
+
+def downgrade():
+    for table, column in KEYS.items():
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT')
+    # uuid_generate_v7() is kept: schema.sql tables may use it as well
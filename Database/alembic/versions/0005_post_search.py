@@ -0,0 +1,30 @@
+"""Full-text and trigram search on social_media_posts.post_text
+Revision ID: 0005_post_search
+Revises: 0004_uuid7_defaults
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0005_post_search'
+down_revision = '0004_uuid7_defaults'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column(
+        'social_media_posts',
+        sa.Column('post_text_search', postgresql.TSVECTOR(), sa.Computed("to_tsvector('english', coalesce(post_text, ''))", persisted=True)),
+    )
+    op.create_index('ix_social_posts_text_search', 'social_media_posts', ['post_text_search'], postgresql_using='gin')
+    op.create_index('ix_social_posts_text_trgm', 'social_media_posts', ['post_text'], postgresql_using='gin', postgresql_ops={'post_text': 'gin_trgm_ops'})
+
+
+def downgrade():
+    op.drop_index('ix_social_posts_text_trgm', table_name='social_media_posts')
+    op.drop_index('ix_social_posts_text_search', table_name='social_media_posts')
+    op.drop_column('social_media_posts', 'post_text_search')
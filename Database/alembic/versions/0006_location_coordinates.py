@@ -0,0 +1,38 @@
+"""Location coordinates and geohash index
+Revision ID: 0006_location_coordinates
+Revises: 0005_post_search
+Create Date: 2026-10-19 00:00:00.000000
+
+Existing locations keep NULL coordinates until they are geocoded; the ORM sets geohash whenever
+latitude/longitude change (python/models.py).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006_location_coordinates'
+down_revision = '0005_post_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('locations', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('locations', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('locations', sa.Column('geohash', sa.String(length=9, collation='C'), nullable=True))
+    op.create_check_constraint('ck_location_latitude_range', 'locations', 'latitude IS NULL OR latitude BETWEEN -90 AND 90')
+    op.create_check_constraint('ck_location_longitude_range', 'locations', 'longitude IS NULL OR longitude BETWEEN -180 AND 180')
+    op.create_check_constraint('ck_location_coordinates_pair', 'locations', '(latitude IS NULL) = (longitude IS NULL)')
+    op.create_index('ix_locations_geohash', 'locations', ['geohash'])
+    op.create_index('ix_disaster_location_location', 'disaster_location', ['location_id'])
+
+
+def downgrade():
+    op.drop_index('ix_disaster_location_location', table_name='disaster_location')
+    op.drop_index('ix_locations_geohash', table_name='locations')
+    op.drop_constraint('ck_location_coordinates_pair', 'locations', type_='check')
+    op.drop_constraint('ck_location_longitude_range', 'locations', type_='check')
+    op.drop_constraint('ck_location_latitude_range', 'locations', type_='check')
+    op.drop_column('locations', 'geohash')
+    op.drop_column('locations', 'longitude')
+    op.drop_column('locations', 'latitude')
@@ -0,0 +1,57 @@
+"""Change-data-capture of results inserts into cdc_outbox
+Revision ID: 0007_results_cdc
+Revises: 0006_location_coordinates
+Create Date: 2026-10-19 00:00:00.000000
+
+Same outbox, functions and notification as migrations/V15__cdc_outbox.sql (all idempotent, so either may run
+first on a shared database); real_time/cdc_relay.py publishes the events to the Redis stream rtmd:cdc:results.
+Downgrade removes only the results trigger: the outbox may still serve the pipeline tables.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0007_results_cdc'
+down_revision = '0006_location_coordinates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cdc_outbox (
+          event_id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+          table_name TEXT NOT NULL,
+          op TEXT NOT NULL,
+          payload JSONB NOT NULL,
+          captured_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+        ) WITH (fillfactor = 70, autovacuum_vacuum_scale_factor = 0, autovacuum_vacuum_threshold = 1000)
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION cdc_capture() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+          INSERT INTO cdc_outbox (table_name, op, payload) VALUES (TG_ARGV[0], TG_OP, to_jsonb(NEW));
+          RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION cdc_notify() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+          PERFORM pg_notify('rtmd_cdc', '');
+          RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute('DROP TRIGGER IF EXISTS trg_cdc_outbox_notify ON cdc_outbox')
+    op.execute('CREATE TRIGGER trg_cdc_outbox_notify AFTER INSERT ON cdc_outbox FOR EACH STATEMENT EXECUTE FUNCTION cdc_notify()')
+    op.execute("CREATE TRIGGER trg_results_cdc AFTER INSERT ON results FOR EACH ROW EXECUTE FUNCTION cdc_capture('results')")
+
+
+def downgrade():
+    op.execute('DROP TRIGGER IF EXISTS trg_results_cdc ON results')
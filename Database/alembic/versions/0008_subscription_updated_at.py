@@ -0,0 +1,38 @@
+"""Stamp subscriptions.updated_at in the database
+Revision ID: 0008_subscription_updated_at
+Revises: 0007_results_cdc
+Create Date: 2026-10-19 00:00:00.000000
+
+The dispatcher's geofence index syncs incrementally on updated_at (real_time/geofence.py). It was set by the
+client with a naive datetime.utcnow, which a non-UTC session stores shifted by its offset, and raw SQL updates
+did not set it at all. A BEFORE INSERT OR UPDATE trigger now stamps every row version with clock_timestamp().
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0008_subscription_updated_at'
+down_revision = '0007_results_cdc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION subscriptions_touch() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+          NEW.updated_at := clock_timestamp();
+          RETURN NEW;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        'CREATE TRIGGER trg_subscriptions_touch BEFORE INSERT OR UPDATE ON subscriptions '
+        'FOR EACH ROW EXECUTE FUNCTION subscriptions_touch()'
+    )
+
+
+def downgrade():
+    op.execute('DROP TRIGGER IF EXISTS trg_subscriptions_touch ON subscriptions')
+    op.execute('DROP FUNCTION IF EXISTS subscriptions_touch()')
@@ -0,0 +1,23 @@
+"""Stop capturing results inserts into cdc_outbox
+Revision ID: 0009_drop_results_cdc
+Revises: 0008_subscription_updated_at
+Create Date: 2026-10-19 00:00:00.000000
+
+The worker records its assessments in credibility_assessment (published as rtmd:cdc:credibility_assessment by
+migrations/V18__credibility_assessment_cdc.sql), not in `results`, so the rtmd:cdc:results stream of 0007 stayed empty.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0009_drop_results_cdc'
+down_revision = '0008_subscription_updated_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('DROP TRIGGER IF EXISTS trg_results_cdc ON results')
+
+
+def downgrade():
+    op.execute("CREATE TRIGGER trg_results_cdc AFTER INSERT ON results FOR EACH ROW EXECUTE FUNCTION cdc_capture('results')")
@@ -0,0 +1,144 @@
+"""
+Login throughput under concurrency: Argon2 verification inline on the request threads (as python/auth_demo.py does)
+versus on the process pool of python/auth_service.py. Each --concurrency level runs --logins logins per mode
+and reports logins/s and p50/p95/p99 login latency, plus the latency of a cheap concurrent request (a probe thread
+doing a little Python work every 10 ms), which shows how much a login burst slows everything else in the process.
+
+With a database (migrations/V02 applied), --users accounts bench-auth+N@example.com are created, logged into, and
+deleted afterwards. --hash-only measures verification alone, without a database.
+
+Run (from Database/): python benchmarks/bench_auth.py --concurrency 1,8,32 --logins 200 [--hash-only]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from argon2 import PasswordHasher, exceptions as argon2_exceptions  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from python import db  # noqa: E402
+from python.auth_service import SELECT_LOGIN_SQL, AuthBusyError, AuthService  # noqa: E402
+
+PASSWORD = 'S3cureP@ssw0rd!'
+EMAIL = 'bench-auth+{}@example.com'
+
+ph = PasswordHasher()
+
+
+def inline_login(email: str, password: str) -> Optional[str]:
+    """auth_demo.login's flow: SELECT, verify on this thread, UPDATE(s), COMMIT."""
+    with db.engine.begin() as conn:
+        user = conn.execute(SELECT_LOGIN_SQL, {'email': email}).mappings().first()
+        if user is None or user['status'] != 'active':
+            return None
+        try:
+            ph.verify(user['password_hash'], password)
+        except argon2_exceptions.VerifyMismatchError:
+            return None
+        if ph.check_needs_rehash(user['password_hash']):
+            conn.execute(text('UPDATE users SET password_hash = :h WHERE user_id = :id'), {'h': ph.hash(password), 'id': user['user_id']})
+        conn.execute(text('UPDATE users SET last_login = now() WHERE user_id = :id'), {'id': user['user_id']})
+    return str(user['user_id'])
+
+
+def _percentile(ordered: List[float], q: float) -> Optional[float]:
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 2) if ordered else None
+
+
+def measure(login: Callable[[str, str], object], emails: List[str], concurrency: int, logins: int) -> dict:
+    timings, probe, busy = [], [], [0]
+    stop = threading.Event()
+
+    def one(i: int):
+        start = time.perf_counter()
+        try:
+            login(random.choice(emails), PASSWORD)
+        except AuthBusyError:
+            busy[0] += 1
+            return
+        timings.append((time.perf_counter() - start) * 1000)
+
+    def probe_loop():
+        while not stop.is_set():
+            start = time.perf_counter()
+            sum(i * i for i in range(2000))
+            probe.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.01)
+
+    prober = threading.Thread(target=probe_loop)
+    prober.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(one, range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    prober.join()
+    timings.sort()
+    probe.sort()
+    return {
+        'concurrency': concurrency,
+        'logins': len(timings),
+        'rejected_busy': busy[0],
+        'logins_per_second': round(len(timings) / elapsed, 1),
+        'p50_ms': _percentile(timings, 0.50),
+        'p95_ms': _percentile(timings, 0.95),
+        'p99_ms': _percentile(timings, 0.99),
+        'probe_p95_ms': _percentile(probe, 0.95),
+    }
+
+
+def create_users(service: AuthService, n: int) -> List[str]:
+    emails = [EMAIL.format(i) for i in range(n)]
+    with db.engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE email LIKE 'bench-auth+%'"))
+    stored = service.hash_password(PASSWORD)
+    with db.engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO users (email, password_hash, status, email_verified) VALUES (:email, :password_hash, 'active', true)"),
+            [{'email': email, 'password_hash': stored} for email in emails],
+        )
+    return emails
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', default='1,8,32')
+    parser.add_argument('--logins', type=int, default=200, help='logins per mode and concurrency level')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=None, help='hashing processes (default AUTH_HASH_WORKERS)')
+    parser.add_argument('--hash-only', action='store_true', help='verify only, no database')
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(',')]
+    os.environ.setdefault('DB_POOL_SIZE', str(max(levels)))
+    db.configure('default')
+    service = AuthService(**({'workers': args.workers} if args.workers else {}), max_queue=max(levels))
+    service.warm_up()
+    try:
+        if args.hash_only:
+            stored = ph.hash(PASSWORD)
+            emails = [stored]
+            modes = {'inline': lambda h, p: ph.verify(h, p), 'pool': service.verify_password}
+        else:
+            emails = create_users(service, args.users)
+            modes = {'inline': inline_login, 'pool': service.login}
+        for concurrency in levels:
+            for mode, login in modes.items():
+                print(json.dumps({'mode': mode, 'hash_only': args.hash_only, **measure(login, emails, concurrency, args.logins)}))
+    finally:
+        service.close()
+        if not args.hash_only:
+            with db.engine.begin() as conn:
+                conn.execute(text("DELETE FROM users WHERE email LIKE 'bench-auth+%'"))
+
+
+if __name__ == '__main__':
+    main()
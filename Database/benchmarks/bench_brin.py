@@ -0,0 +1,103 @@
+"""
+Compare B-tree and BRIN indexes on the partitioned tables' timestamp columns (requires Postgres with schema.sql
+applied). For each table, each index kind is built inside a transaction that is rolled back afterwards, with the
+production indexes on that column dropped inside the same transaction, so the database is left unchanged.
+Reports build time, total index size across partitions, and the median latency of a recent-window query.
+
+Data: load with --load N first (python/generate_synthetic.py; N posts -> ~4N rows over the four tables,
+so --load 25000000 gives ~100M rows).
+
+Run (from Database/): python benchmarks/bench_brin.py --windows "1 hour,1 day" --repeat 20
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+
+from python.db import engine  # noqa: E402
+
+# table -> (timestamp column, payload column read by the query, production indexes leading with the column)
+TARGETS = {
+    'social_posts': ('ingestion_timestamp', 'text_content', ['idx_posts_ingestion_ts_brin']),
+    'credibility_assessment': ('assessment_timestamp', 'credibility_label', ['idx_cred_assess_ts_score', 'idx_cred_assess_ts_brin']),
+    'disaster_detection': ('detection_timestamp', 'disaster_type', ['idx_detect_ts_conf', 'idx_detect_ts_brin']),
+    'alerts': ('alert_timestamp', 'alert_severity', ['idx_alert_ts_brin']),
+}
+
+INDEX_DDL = {
+    'btree': 'CREATE INDEX bench_ts_idx ON {table} ({column})',
+    'brin': 'CREATE INDEX bench_ts_idx ON {table} USING BRIN ({column}) WITH (pages_per_range = {pages_per_range})',
+}
+
+
+def load(count: int) -> None:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python'))
+    from generate_synthetic import seed
+
+    seed(count)
+
+
+def measure(conn, table: str, kind: str, windows, repeat: int, pages_per_range: int) -> dict:
+    column, payload, production = TARGETS[table]
+    trans = conn.begin()
+    try:
+        for name in production:
+            conn.execute(text(f'DROP INDEX IF EXISTS {name}'))
+        start = time.perf_counter()
+        conn.execute(text(INDEX_DDL[kind].format(table=table, column=column, pages_per_range=pages_per_range)))
+        build_seconds = time.perf_counter() - start
+        conn.execute(text(f'ANALYZE {table}'))
+        size = conn.execute(text("SELECT sum(pg_relation_size(relid)) FROM pg_partition_tree('bench_ts_idx'::regclass)")).scalar()
+        latest = conn.execute(text(f'SELECT max({column}) FROM {table}')).scalar()
+        result = {'table': table, 'index': kind, 'build_seconds': round(build_seconds, 2), 'index_bytes': int(size or 0), 'windows': {}}
+        query = text(f'SELECT count({payload}) FROM {table} WHERE {column} > :latest - CAST(:window AS interval) AND {column} <= :latest')
+        for window in windows:
+            params = {'latest': latest, 'window': window}
+            plan = conn.execute(text('EXPLAIN ' + str(query)), params).scalars().all()
+            timings, rows = [], None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                rows = conn.execute(query, params).scalar()
+                timings.append((time.perf_counter() - start) * 1000)
+            result['windows'][window] = {
+                'rows': rows,
+                'median_ms': round(statistics.median(timings), 2),
+                'plan': next((line.strip() for line in plan if 'Scan' in line), plan[0]),
+            }
+        return result
+    finally:
+        trans.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--load', type=int, default=0, help='seed this many synthetic posts first')
+    parser.add_argument('--tables', default=','.join(TARGETS))
+    parser.add_argument('--windows', default='1 hour,1 day')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--pages-per-range', type=int, default=32)
+    args = parser.parse_args()
+
+    if args.load:
+        load(args.load)
+    windows = [w.strip() for w in args.windows.split(',')]
+    results = []
+    with engine.connect() as conn:
+        for table in args.tables.split(','):
+            for kind in ('btree', 'brin'):
+                result = measure(conn, table, kind, windows, args.repeat, args.pages_per_range)
+                print(json.dumps(result))
+                results.append(result)
+    for table in args.tables.split(','):
+        btree, brin = [r for r in results if r['table'] == table]
+        print(f"{table}: BRIN is {btree['index_bytes'] / max(brin['index_bytes'], 1):.0f}x smaller than B-tree")
+
+
+if __name__ == '__main__':
+    main()
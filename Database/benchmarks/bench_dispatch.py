@@ -0,0 +1,103 @@
+"""
+Benchmark dispatcher claim/mark throughput against a growing alert history (requires Postgres with schema.sql
+applied and partitions for the current month).
+Preloads --history already-sent alerts, then --pending pending ones, and drains the pending set with the
+dispatcher's claim + mark statements (no delivery), reporting alerts/s. Run with increasing --history to
+check that throughput stays flat.
+
+Run (from Database/): python benchmarks/bench_dispatch.py --history 10000000 --pending 20000 --batch 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+
+from python.db import get_session  # noqa: E402
+from real_time.alert_dispatcher import claim_pending_alerts, mark_sent  # noqa: E402
+
+SEED_DETECTION_SQL = text(
+    """
+    WITH post AS (
+      INSERT INTO social_posts (source_platform, text_content, processing_status)
+      VALUES ('bench', 'dispatch benchmark', 'processed') RETURNING post_id, ingestion_timestamp
+    )
+    INSERT INTO disaster_detection (post_id, post_ingested_at, disaster_type, text_confidence, image_confidence, fused_confidence)
+    SELECT post_id, ingestion_timestamp, 'flood', 0.9, 0.9, 0.9 FROM post RETURNING detection_id, detection_timestamp
+    """
+)
+
+INSERT_ALERTS_SQL = text(
+    """
+    INSERT INTO alerts (detection_id, detection_timestamp, alert_severity, alert_status)
+    SELECT :detection_id, :detection_timestamp, (ARRAY['low','medium','high'])[1 + i % 3], :status
+    FROM generate_series(1, :n) AS i
+    """
+)
+
+
+def preload(detection, n: int, status: str, chunk: int = 500_000) -> None:
+    for start in range(0, n, chunk):
+        session = get_session()
+        try:
+            session.execute(INSERT_ALERTS_SQL, {"detection_id": detection.detection_id, "detection_timestamp": detection.detection_timestamp, "n": min(chunk, n - start), "status": status})
+            session.commit()
+        finally:
+            session.close()
+
+
+def drain(batch_size: int) -> int:
+    drained = 0
+    while True:
+        session = get_session()
+        try:
+            rows = claim_pending_alerts(session, batch_size)
+            mark_sent(session, [r["alert_id"] for r in rows])
+            session.commit()
+        finally:
+            session.close()
+        if not rows:
+            return drained
+        drained += len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--history", type=int, default=1_000_000)
+    parser.add_argument("--pending", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--skip-preload", action="store_true", help="reuse the history already in the database")
+    args = parser.parse_args()
+
+    session = get_session()
+    detection = session.execute(SEED_DETECTION_SQL).one()
+    session.commit()
+    session.close()
+
+    if not args.skip_preload:
+        start = time.perf_counter()
+        preload(detection, args.history, "sent")
+        print(f"Preloaded {args.history} sent alerts in {time.perf_counter() - start:.1f}s")
+
+    # Clear anything left pending by earlier runs so only this run's alerts are timed
+    drain(args.batch)
+    preload(detection, args.pending, "pending")
+    start = time.perf_counter()
+    drained = drain(args.batch)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "history": args.history,
+        "pending": args.pending,
+        "batch": args.batch,
+        "drained": drained,
+        "seconds": round(elapsed, 3),
+        "alerts_per_second": round(drained / elapsed, 1) if elapsed else None,
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark the dispatcher's subscriber geofence index (no database required).
+Builds N random subscriptions over Sri Lanka (mix of radius and polygon geofences plus a few global ones),
+then measures build time, incremental update rate and lookup latency.
+
+Run (from Database/): python benchmarks/bench_geofence.py --subscriptions 100000 --lookups 10000
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import os
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from real_time.geofence import GeofenceIndex, GeofenceSubscription  # noqa: E402
+
+# Rough bounding box of Sri Lanka
+LAT_RANGE = (5.9, 9.9)
+LNG_RANGE = (79.6, 81.9)
+DISASTERS = ['fire', 'flood', 'earthquake', 'storm']
+SEVERITIES = ['low', 'medium', 'high']
+
+
+def random_subscription(rng):
+    lat, lng = rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)
+    kwargs = {
+        'subscription_id': uuid.uuid4(),
+        'channel': rng.choice(['email', 'webhook']),
+        'target': 'user@example.org',
+        'disaster_types': frozenset(rng.sample(DISASTERS, rng.randint(1, 4))) if rng.random() < 0.7 else None,
+        'severities': frozenset(rng.sample(SEVERITIES, rng.randint(1, 3))) if rng.random() < 0.5 else None,
+    }
+    shape = rng.random()
+    if shape < 0.001:
+        pass  # global subscription
+    elif shape < 0.8:
+        kwargs['center'] = (lat, lng)
+        # Mostly neighbourhood/town-sized geofences, a few district-wide ones
+        kwargs['radius_km'] = rng.choices([1, 2, 5, 10, 25, 50], weights=[30, 30, 20, 12, 6, 2])[0]
+    else:
+        d = rng.uniform(0.01, 0.2)
+        kwargs['polygon'] = [(lat, lng), (lat, lng + d), (lat + d, lng + d), (lat + d, lng)]
+    return GeofenceSubscription(**kwargs)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--subscriptions', type=int, default=100000)
+    parser.add_argument('--lookups', type=int, default=10000)
+    parser.add_argument('--updates', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    subs = [random_subscription(rng) for _ in range(args.subscriptions)]
+
+    index = GeofenceIndex()
+    start = time.perf_counter()
+    for s in subs:
+        index.upsert(s)
+    build_s = time.perf_counter() - start
+
+    # Incremental changes: move existing subscriptions to new geofences
+    changes = []
+    for _ in range(args.updates):
+        replacement = random_subscription(rng)
+        replacement.subscription_id = rng.choice(subs).subscription_id
+        changes.append(replacement)
+    start = time.perf_counter()
+    for s in changes:
+        index.upsert(s)
+    update_s = time.perf_counter() - start
+
+    latencies, matches = [], []
+    for _ in range(args.lookups):
+        lat, lng = rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)
+        t0 = time.perf_counter()
+        found = index.match(lat, lng, rng.choice(DISASTERS), rng.choice(SEVERITIES))
+        latencies.append((time.perf_counter() - t0) * 1000)
+        matches.append(len(found))
+
+    print(json.dumps({
+        'subscriptions': len(index),
+        'build_seconds': round(build_s, 3),
+        'updates_per_second': round(args.updates / update_s),
+        'lookup_ms_p50': round(percentile(latencies, 50), 4),
+        'lookup_ms_p99': round(percentile(latencies, 99), 4),
+        'lookup_ms_mean': round(statistics.mean(latencies), 4),
+        'mean_recipients': round(statistics.mean(matches), 1),
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
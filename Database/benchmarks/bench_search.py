@@ -0,0 +1,64 @@
+"""
+Measure post search latency (python/search.py) against the target of < 100 ms over 50M posts (requires Postgres with
+V12 applied; load data with python/generate_synthetic.py, e.g. --count 50000000).
+Runs each query --repeat times over the --days window and reports median / p95 latency, the number of rows on the
+first page, which mode answered (full-text or fuzzy) and the plan line of the candidate scan.
+
+Run (from Database/): python benchmarks/bench_search.py --queries "flood,fire reported,-storm earthquake,eartquake" --days 30
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+
+from python.db import get_session  # noqa: E402
+from python.search import SEARCH_MAX_CANDIDATES, POSTS, build_search_sql, search_posts  # noqa: E402
+
+
+def measure(session, query: str, days: float, limit: int, repeat: int) -> dict:
+    until = datetime.now(timezone.utc)
+    since = until - timedelta(days=days)
+    timings, page = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        page = search_posts(session, query, since=since, until=until, limit=limit)
+        timings.append((time.perf_counter() - start) * 1000)
+    mode = page.rows[0]['match'] if page.rows else 'fts'
+    params = {'q': query, 'since': since, 'until': until, 'limit': limit + 1, 'max_candidates': SEARCH_MAX_CANDIDATES}
+    plan = session.execute(text('EXPLAIN ' + str(build_search_sql(POSTS, mode, False, False))), params).scalars().all()
+    timings.sort()
+    return {
+        'query': query,
+        'rows': len(page.rows),
+        'mode': mode,
+        'median_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+        'plan': next((line.strip() for line in plan if 'Bitmap Index Scan' in line or 'Index Scan' in line), plan[0]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--queries', default='flood,fire reported,-storm earthquake,eartquake')
+    parser.add_argument('--days', type=float, default=30)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    session = get_session(readonly=True)
+    try:
+        for query in args.queries.split(','):
+            print(json.dumps(measure(session, query, args.days, args.limit, args.repeat)))
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    main()
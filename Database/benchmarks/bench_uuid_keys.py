@@ -0,0 +1,118 @@
+"""
+Compare random uuid4 and time-ordered uuid7 primary keys under a sustained insert load (requires Postgres; the
+scratch tables bench_keys_uuid4 / bench_keys_uuid7 are created and dropped by the run).
+Keys are generated client-side with the same NumPy code as python/generate_synthetic.py, so both runs pay the
+same client cost, and loaded with COPY in --batch rows per transaction. For each batch the run records rows/s and
+WAL bytes written; at the end it reports the primary key index size. uuid4 throughput drops once the key index
+outgrows shared_buffers, while uuid7 stays flat because inserts only touch the rightmost leaf.
+
+Run (from Database/): python benchmarks/bench_uuid_keys.py --rows 50000000 --batch 1000000
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python'))
+
+import numpy as np  # noqa: E402
+
+from generate_synthetic import get_conn, uuid4_hex, uuid7_hex  # noqa: E402
+
+# Row shape close to alerts: key, parent key, a short label and a timestamp
+TABLE_DDL = """
+CREATE TABLE {table} (
+  id UUID PRIMARY KEY,
+  parent_id UUID NOT NULL,
+  label TEXT NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL
+)
+"""
+
+
+def batch_csv(rng: np.random.Generator, kind: str, start_us: int, n: int) -> str:
+    # one row per 100 us of simulated time (10k rows/s), like a steady ingest stream
+    us = start_us + np.arange(n, dtype=np.int64) * 100
+    ids = uuid7_hex(rng, us) if kind == 'uuid7' else uuid4_hex(rng, n)
+    stamps = np.datetime_as_string(us.astype('datetime64[us]'), unit='us', timezone='UTC')
+    return '\n'.join(map(','.join, zip(ids, uuid4_hex(rng, n), np.full(n, 'high'), stamps))) + '\n'
+
+
+def run(conn, kind: str, rows: int, batch: int, random_seed: int) -> dict:
+    table = f'bench_keys_{kind}'
+    rng = np.random.default_rng(random_seed)
+    start_us = int(time.time() * 1_000_000)
+    with conn.cursor() as cur:
+        cur.execute(f'DROP TABLE IF EXISTS {table}')
+        cur.execute(TABLE_DDL.format(table=table))
+    conn.commit()
+
+    batches = []
+    done = 0
+    try:
+        while done < rows:
+            n = min(batch, rows - done)
+            data = batch_csv(rng, kind, start_us + done * 100, n)
+            with conn.cursor() as cur:
+                cur.execute('SELECT pg_current_wal_insert_lsn()')
+                lsn_before = cur.fetchone()[0]
+                started = time.perf_counter()
+                cur.copy_expert(f'COPY {table} (id, parent_id, label, created_at) FROM STDIN WITH (FORMAT csv)', io.StringIO(data))
+                conn.commit()
+                seconds = time.perf_counter() - started
+                cur.execute('SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), %s)', (lsn_before,))
+                wal_bytes = int(cur.fetchone()[0])
+            conn.commit()
+            done += n
+            batches.append({'rows_total': done, 'rows_per_s': round(n / seconds), 'wal_bytes': wal_bytes})
+            print(json.dumps({'keys': kind, **batches[-1]}), file=sys.stderr)
+
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT pg_relation_size('{table}_pkey'), pg_relation_size('{table}')")
+            index_bytes, heap_bytes = cur.fetchone()
+        conn.commit()
+    finally:
+        with conn.cursor() as cur:
+            cur.execute(f'DROP TABLE IF EXISTS {table}')
+        conn.commit()
+
+    tail = batches[-max(1, len(batches) // 10):]  # last 10% of the load, when the index is largest
+    return {
+        'keys': kind,
+        'rows': done,
+        'rows_per_s_median': round(statistics.median(b['rows_per_s'] for b in batches)),
+        'rows_per_s_last_10pct': round(statistics.median(b['rows_per_s'] for b in tail)),
+        'wal_bytes_per_row': round(sum(b['wal_bytes'] for b in batches) / done, 1),
+        'pkey_index_bytes': int(index_bytes),
+        'heap_bytes': int(heap_bytes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=50_000_000)
+    parser.add_argument('--batch', type=int, default=1_000_000)
+    parser.add_argument('--keys', default='uuid4,uuid7')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    conn = get_conn()
+    try:
+        results = [run(conn, kind, args.rows, args.batch, args.seed) for kind in args.keys.split(',')]
+    finally:
+        conn.close()
+    for result in results:
+        print(json.dumps(result))
+    if len(results) == 2:
+        v4, v7 = results
+        print(f"uuid7 vs uuid4: {v7['rows_per_s_last_10pct'] / max(v4['rows_per_s_last_10pct'], 1):.1f}x insert rate at the end of the load, "
+              f"{v4['pkey_index_bytes'] / max(v7['pkey_index_bytes'], 1):.2f}x smaller key index, "
+              f"{v4['wal_bytes_per_row'] / max(v7['wal_bytes_per_row'], 1):.1f}x less WAL per row")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+"""
+Workload benchmark for the hot queries (requires Postgres with the migrations applied and partitions for the
+current month, python/partition_manager.py). Seeds --scale synthetic posts (python/generate_synthetic.py), folds
+them into the dashboard rollups, then replays:
+- worker_insert: the worker's transaction for one post (real_time/worker.py load_post + write_results); the post
+  itself is inserted untimed beforehand, as the ingest API would
+- claim_pending: the dispatcher's pending-alert claim (FOR UPDATE SKIP LOCKED), rolled back so the queue stays the same
+- pending_high_alerts: python/connect_and_demo.py list_pending_high_alerts
+- recent_high_confidence: the newest rows of v_recent_high_confidence_detections
+- dashboard: the three rollup reads of real_time/rollups.py
+Each scenario runs alone for --duration seconds at each --concurrency (threads, one session per operation as in the
+services), then all together as a weighted mix (--mix). One JSON line per run and scenario: throughput, p50/p95/p99.
+Throughput is over the time the threads were not in untimed `prepare` work, which is reported as prepare_s.
+
+Plans: each scenario's statements are captured once (on the primary and, for readonly scenarios, the replica) and
+EXPLAINed (FORMAT JSON, not executed). The plan shape (node types, relations, indexes) and cost are printed as one
+JSON line per scenario. --out writes the whole report; passing an earlier report as --baseline adds regressions:
+changed plan shapes, plans that are no longer captured, cost or p95 above --tolerance times the baseline.
+
+Run (from Database/): python benchmarks/bench_workload.py --scale 1000000 --concurrency 1,8 --duration 30 --out run.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python'))
+
+from sqlalchemy import event, text  # noqa: E402
+
+from python import db  # noqa: E402
+from python.models import Post  # noqa: E402
+from real_time import rollups, worker  # noqa: E402
+from real_time.alert_dispatcher import ALERT_BATCH_SIZE, claim_pending_alerts  # noqa: E402
+from connect_and_demo import PENDING_HIGH_ALERTS_SQL  # noqa: E402
+
+RECENT_HIGH_CONFIDENCE_SQL = text('SELECT * FROM v_recent_high_confidence_detections LIMIT :limit')
+DEFAULT_MIX = 'worker_insert=50,claim_pending=20,pending_high_alerts=10,recent_high_confidence=10,dashboard=10'
+
+
+@dataclass(frozen=True)
+class Scenario:
+    run: Callable  # (session, prepared, rng) -> None, timed
+    prepare: Optional[Callable] = None  # (session, rng) -> prepared, untimed
+    readonly: bool = False
+
+
+def _ingest_post(session, rng: random.Random):
+    post = Post(source_platform=rng.choice(['twitter', 'facebook', 'reddit']), text_content='workload benchmark: flood reported',
+                processing_status='queued', ingestion_timestamp=datetime.now(timezone.utc))
+    session.add(post)
+    session.commit()
+    return post.post_id, post.ingestion_timestamp
+
+
+def _worker_insert(session, key, rng: random.Random):
+    post_id, ingested_at = key
+    dequeued_at = datetime.now(timezone.utc)
+    post = worker.load_post(session, post_id, ingested_at)
+    label = rng.choice(['fire', 'flood', 'earthquake', 'storm', None])
+    conf = round(rng.uniform(0.4, 0.95), 2) if label else 0.0
+    worker.write_results(session, post, label, conf, round(rng.random(), 2), ingested_at, dequeued_at, datetime.now(timezone.utc))
+    session.commit()
+
+
+def _claim_pending(session, _, rng):
+    claim_pending_alerts(session, ALERT_BATCH_SIZE)
+    session.rollback()
+
+
+def _pending_high_alerts(session, _, rng):
+    session.connection().exec_driver_sql(PENDING_HIGH_ALERTS_SQL, {'minutes': 60, 'limit': 50}).fetchall()
+
+
+def _recent_high_confidence(session, _, rng):
+    session.execute(RECENT_HIGH_CONFIDENCE_SQL, {'limit': 50}).all()
+
+
+def _dashboard(session, _, rng):
+    rollups.detections_per_hour(session, 24)
+    rollups.alerts_per_severity(session, 60)
+    rollups.mean_credibility_by_platform(session, 24)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    'worker_insert': Scenario(_worker_insert, prepare=_ingest_post),
+    'claim_pending': Scenario(_claim_pending),
+    'pending_high_alerts': Scenario(_pending_high_alerts, readonly=True),
+    'recent_high_confidence': Scenario(_recent_high_confidence, readonly=True),
+    'dashboard': Scenario(_dashboard, readonly=True),
+}
+
+
+def seed(scale: int) -> None:
+    from generate_synthetic import seed as seed_synthetic
+
+    seed_synthetic(scale)
+    with db.engine.connect() as conn:
+        conn.execution_options(isolation_level='AUTOCOMMIT').execute(text('ANALYZE'))
+    session = db.get_session()
+    try:
+        print(json.dumps({'rollup_steps': rollups.refresh_all(session)}))
+    finally:
+        session.close()
+
+
+# --- plans ---
+
+def _summarise(node: dict, shape: List[str], relations: set) -> None:
+    label = node['Node Type']
+    if 'Relation Name' in node:
+        label += f" on {node['Relation Name']}"
+        relations.add(node['Relation Name'])
+    if 'Index Name' in node:
+        label += f" using {node['Index Name']}"
+    shape.append(label)
+    for child in node.get('Plans', []):
+        _summarise(child, shape, relations)
+
+
+def capture_plans(scenario: Scenario) -> List[dict]:
+    """EXPLAIN every statement one run of the scenario sends (not executed again)."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(None, 1)[0].upper() in ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE') and not executemany:
+            statements.append((statement, parameters))
+
+    rng = random.Random(0)
+    # readonly sessions may be bound to the replica
+    engines = [e for e in (db.engine, db.replica_engine) if e is not None]
+    session = db.get_session(readonly=scenario.readonly)
+    try:
+        prepared = scenario.prepare(session, rng) if scenario.prepare else None
+        for e in engines:
+            event.listen(e, 'before_cursor_execute', record)
+        try:
+            scenario.run(session, prepared, rng)
+        finally:
+            for e in engines:
+                event.remove(e, 'before_cursor_execute', record)
+        session.rollback()
+        plans = []
+        for statement, parameters in statements:
+            raw = session.connection().exec_driver_sql('EXPLAIN (FORMAT JSON) ' + statement, parameters).scalar()
+            root = (json.loads(raw) if isinstance(raw, str) else raw)[0]['Plan']
+            shape, relations = [], set()
+            _summarise(root, shape, relations)
+            plans.append({'statement': ' '.join(statement.split())[:200], 'shape': shape, 'relations': len(relations),
+                          'total_cost': root['Total Cost']})
+        session.rollback()
+        return plans
+    finally:
+        session.close()
+
+
+# --- load ---
+
+def _percentile(ordered: Sequence[float], q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 2)
+
+
+def run(names: Sequence[str], weights: Sequence[float], concurrency: int, duration: float, seed_value: int) -> Dict[str, dict]:
+    """Run the scenarios (picked by weight per operation) on `concurrency` threads for `duration` seconds."""
+    timings = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    prepare_seconds = {name: 0.0 for name in names}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def loop(thread: int):
+        rng = random.Random(seed_value * 1000 + thread)
+        local = {name: [] for name in names}
+        failed = {name: 0 for name in names}
+        preparing = {name: 0.0 for name in names}
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            scenario = SCENARIOS[name]
+            session = db.get_session(readonly=scenario.readonly)
+            try:
+                start = time.perf_counter()
+                prepared = scenario.prepare(session, rng) if scenario.prepare else None
+                preparing[name] += time.perf_counter() - start
+                start = time.perf_counter()
+                scenario.run(session, prepared, rng)
+                local[name].append((time.perf_counter() - start) * 1000)
+            except Exception as exc:
+                session.rollback()
+                failed[name] += 1
+                if failed[name] == 1:
+                    print(f'{name}: {exc}', file=sys.stderr)
+            finally:
+                session.close()
+        with lock:
+            for name in names:
+                timings[name].extend(local[name])
+                errors[name] += failed[name]
+                prepare_seconds[name] += preparing[name]
+
+    threads = [threading.Thread(target=loop, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    # wall time the threads spent on timed work: untimed prepare time, spread over the threads, is taken out
+    busy = max(elapsed - sum(prepare_seconds.values()) / concurrency, 1e-9)
+
+    results = {}
+    for name in names:
+        ordered = sorted(timings[name])
+        results[name] = {
+            'ops': len(ordered),
+            'errors': errors[name],
+            'ops_per_second': round(len(ordered) / busy, 1),
+            'prepare_s': round(prepare_seconds[name], 2),
+            'p50_ms': _percentile(ordered, 0.50),
+            'p95_ms': _percentile(ordered, 0.95),
+            'p99_ms': _percentile(ordered, 0.99),
+        }
+    return results
+
+
+# --- comparison ---
+
+def regressions(report: dict, baseline: dict, tolerance: float) -> List[dict]:
+    found = []
+    for name, plans in report['plans'].items():
+        before = baseline.get('plans', {}).get(name)
+        if before is None:
+            continue
+        if before and not plans:
+            found.append({'scenario': name, 'kind': 'plans_missing', 'before': len(before), 'after': 0})
+        for i, plan in enumerate(plans):
+            old = before[i] if i < len(before) else None
+            if old is None:
+                continue
+            if plan['shape'] != old['shape']:
+                found.append({'scenario': name, 'statement': i, 'kind': 'plan_changed', 'before': old['shape'], 'after': plan['shape']})
+            elif plan['total_cost'] > old['total_cost'] * tolerance:
+                found.append({'scenario': name, 'statement': i, 'kind': 'cost', 'before': old['total_cost'], 'after': plan['total_cost']})
+    old_results = {(r['run'], r['scenario'], r['concurrency']): r for r in baseline.get('results', [])}
+    for result in report['results']:
+        old = old_results.get((result['run'], result['scenario'], result['concurrency']))
+        if old and old['p95_ms'] and result['p95_ms'] and result['p95_ms'] > old['p95_ms'] * tolerance:
+            found.append({'scenario': result['scenario'], 'run': result['run'], 'concurrency': result['concurrency'],
+                          'kind': 'p95', 'before': old['p95_ms'], 'after': result['p95_ms']})
+    return found
+
+
+def _mix(value: str) -> Dict[str, float]:
+    weights = {}
+    for part in filter(None, value.split(',')):
+        name, _, weight = part.partition('=')
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f'unknown scenario: {name}')
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', type=int, default=0, help='seed this many synthetic posts first')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='scenarios to run alone')
+    parser.add_argument('--mix', type=_mix, default=_mix(DEFAULT_MIX), help='weights for the mixed run (empty: skip it)')
+    parser.add_argument('--concurrency', default='1,8', help='comma-separated thread counts')
+    parser.add_argument('--duration', type=float, default=30, help='seconds per run')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='write the full report (JSON) here')
+    parser.add_argument('--baseline', help='earlier --out report to compare with')
+    parser.add_argument('--tolerance', type=float, default=1.5, help='ratio to the baseline that counts as a regression')
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(',')]
+    # one connection per thread, so pool waits are not measured as query time
+    os.environ.setdefault('DB_POOL_SIZE', str(max(levels)))
+    db.configure('default')
+    if args.scale:
+        seed(args.scale)
+
+    names = [n.strip() for n in args.scenarios.split(',') if n.strip()]
+    report = {'scale': args.scale, 'duration': args.duration, 'plans': {}, 'results': []}
+    for name in dict.fromkeys(names + list(args.mix)):
+        report['plans'][name] = capture_plans(SCENARIOS[name])
+        print(json.dumps({'scenario': name, 'plans': report['plans'][name]}))
+
+    runs = [(name, [name], [1.0]) for name in names]
+    if args.mix:
+        runs.append(('mix', list(args.mix), list(args.mix.values())))
+    for concurrency in levels:
+        for label, scenario_names, weights in runs:
+            for name, stats in run(scenario_names, weights, concurrency, args.duration, args.seed).items():
+                result = {'run': label, 'scenario': name, 'concurrency': concurrency, **stats}
+                report['results'].append(result)
+                print(json.dumps(result))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = regressions(report, json.load(f), args.tolerance)
+        for regression in report['regressions']:
+            print(json.dumps({'regression': regression}))
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
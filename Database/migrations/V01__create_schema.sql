@@ -1,39 +1,40 @@
--- V1__create_schema.sql
+-- V01__create_schema.sql
 -- Migration: Create core schema for Real-Time Multimodal Disaster Detection
 
 CREATE EXTENSION IF NOT EXISTS pgcrypto;
 
--- Parent tables (partitioned by timestamp where appropriate)
+-- Parent tables (partitioned by timestamp where appropriate). Unique keys of a partitioned table must include
+-- the partition column, so the keys are (id, timestamp); foreign keys to them are composite (V13).
 CREATE TABLE IF NOT EXISTS social_posts (
-  post_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  post_id UUID NOT NULL DEFAULT gen_random_uuid(),
   source_platform TEXT NOT NULL,
   source_post_id TEXT,
   ingestion_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
   text_content TEXT,
   image_reference TEXT,
   processing_status TEXT NOT NULL CHECK (processing_status IN ('raw','queued','processing','processed','failed')),
-  UNIQUE (source_platform, source_post_id)
+  PRIMARY KEY (post_id, ingestion_timestamp)
 ) PARTITION BY RANGE (ingestion_timestamp);
 
 CREATE TABLE IF NOT EXISTS credibility_assessment (
-  assessment_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  assessment_id UUID NOT NULL DEFAULT gen_random_uuid(),
   post_id UUID NOT NULL,
   credibility_score DOUBLE PRECISION NOT NULL CHECK (credibility_score >= 0 AND credibility_score <= 1),
   credibility_label TEXT NOT NULL CHECK (credibility_label IN ('credible','questionable','misinformation')),
   threshold_value DOUBLE PRECISION NOT NULL CHECK (threshold_value >= 0 AND threshold_value <= 1),
   assessment_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
-  FOREIGN KEY (post_id) REFERENCES social_posts(post_id) ON DELETE CASCADE
+  PRIMARY KEY (assessment_id, assessment_timestamp)
 ) PARTITION BY RANGE (assessment_timestamp);
 
 CREATE TABLE IF NOT EXISTS disaster_detection (
-  detection_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  detection_id UUID NOT NULL DEFAULT gen_random_uuid(),
   post_id UUID NOT NULL,
   disaster_type TEXT NOT NULL,
   text_confidence DOUBLE PRECISION NOT NULL CHECK (text_confidence >=0 AND text_confidence <=1),
   image_confidence DOUBLE PRECISION NOT NULL CHECK (image_confidence >=0 AND image_confidence <=1),
   fused_confidence DOUBLE PRECISION NOT NULL CHECK (fused_confidence >=0 AND fused_confidence <=1),
   detection_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
-  FOREIGN KEY (post_id) REFERENCES social_posts(post_id) ON DELETE CASCADE
+  PRIMARY KEY (detection_id, detection_timestamp)
 ) PARTITION BY RANGE (detection_timestamp);
 
 CREATE TABLE IF NOT EXISTS alerts (
@@ -41,8 +42,7 @@ CREATE TABLE IF NOT EXISTS alerts (
   detection_id UUID NOT NULL,
   alert_severity TEXT NOT NULL CHECK (alert_severity IN ('low','medium','high')),
   alert_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
-  alert_status TEXT NOT NULL CHECK (alert_status IN ('pending','sent','acknowledged','suppressed')),
-  FOREIGN KEY (detection_id) REFERENCES disaster_detection(detection_id) ON DELETE CASCADE
+  alert_status TEXT NOT NULL CHECK (alert_status IN ('pending','sent','acknowledged','suppressed'))
 );
 
 -- Create example initial partitions (adjust or create dynamically)
@@ -1,4 +1,4 @@
--- V2__add_auth.sql
+-- V02__add_auth.sql
 -- Add authentication-related tables: users, user_identities, password_reset_tokens
 
 -- users table
@@ -0,0 +1,8 @@
+-- V03__alert_claim_index.sql
+-- Index matching the dispatcher's claim order (severity rank, then oldest first) over pending alerts only.
+-- The expression must stay identical to the ORDER BY in real_time/alert_dispatcher.py for the planner to use it.
+
+CREATE INDEX IF NOT EXISTS idx_alert_claim ON alerts (
+  (CASE alert_severity WHEN 'high' THEN 0 WHEN 'medium' THEN 1 ELSE 2 END),
+  alert_timestamp
+) WHERE alert_status = 'pending';
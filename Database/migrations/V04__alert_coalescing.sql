@@ -0,0 +1,10 @@
+-- V04__alert_coalescing.sql
+-- Alert coalescing: the dispatcher folds pending alerts sharing (disaster type, region, severity, window)
+-- into one delivered digest and marks the rest 'coalesced' against the delivered leader.
+
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS region TEXT; -- district/province or detection cluster, set by the producer when known
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS coalesced_into UUID; -- leader alert this row was folded into
+
+ALTER TABLE alerts DROP CONSTRAINT IF EXISTS alerts_alert_status_check;
+ALTER TABLE alerts ADD CONSTRAINT alerts_alert_status_check
+  CHECK (alert_status IN ('pending','sent','acknowledged','suppressed','coalesced'));
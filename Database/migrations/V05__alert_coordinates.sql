@@ -0,0 +1,6 @@
+-- V05__alert_coordinates.sql
+-- Alert coordinates for subscriber geofence routing in the dispatcher (real_time/geofence.py).
+-- Alerts without coordinates are only routed to subscriptions that have no geofence.
+
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION CHECK (latitude BETWEEN -90 AND 90);
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION CHECK (longitude BETWEEN -180 AND 180);
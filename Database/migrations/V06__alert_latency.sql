@@ -0,0 +1,13 @@
+-- V06__alert_latency.sql
+-- Per-alert pipeline timestamps for end-to-end latency tracking (real_time/latency_exporter.py).
+-- ingest_api -> rtmd:posts -> worker -> alerts -> alert_dispatcher:
+--   ingested_at (API received the post), dequeued_at (worker read it from the stream),
+--   inferred_at (detection/credibility done), alert_timestamp (alert created), sent_at (delivered or coalesced).
+
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMPTZ;
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS dequeued_at TIMESTAMPTZ;
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS inferred_at TIMESTAMPTZ;
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS sent_at TIMESTAMPTZ;
+
+-- the exporter aggregates over recently sent alerts
+CREATE INDEX IF NOT EXISTS idx_alert_sent_at ON alerts (sent_at) WHERE sent_at IS NOT NULL;
@@ -0,0 +1,85 @@
+-- V07__alert_state_log.sql
+-- Append-only alert state tracking. alerts rows are no longer updated after insert:
+--   * alert_pending holds only the alerts waiting for dispatch (a small, hot table the dispatcher claims from);
+--   * alert_state_log records every later transition (sent, coalesced, acknowledged, suppressed),
+--     range-partitioned by ts so old history can be detached without touching the hot path.
+-- alerts.alert_status is now the state at insert time; v_alert_current_state gives the current one.
+
+CREATE TABLE IF NOT EXISTS alert_pending (
+  alert_id UUID PRIMARY KEY,
+  severity_rank SMALLINT NOT NULL, -- 0 high, 1 medium, 2 low (dispatcher claim order)
+  alert_timestamp TIMESTAMPTZ NOT NULL
+) WITH (fillfactor = 70, autovacuum_vacuum_scale_factor = 0, autovacuum_vacuum_threshold = 1000);
+
+CREATE INDEX IF NOT EXISTS idx_alert_pending_claim ON alert_pending (severity_rank, alert_timestamp);
+
+CREATE TABLE IF NOT EXISTS alert_state_log (
+  alert_id UUID NOT NULL,
+  state TEXT NOT NULL CHECK (state IN ('sent','acknowledged','suppressed','coalesced')),
+  ts TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
+  coalesced_into UUID -- leader alert when state = 'coalesced'
+) PARTITION BY RANGE (ts);
+
+CREATE INDEX IF NOT EXISTS idx_alert_state_log_alert ON alert_state_log (alert_id, ts DESC);
+CREATE INDEX IF NOT EXISTS idx_alert_state_log_ts ON alert_state_log USING BRIN (ts);
+
+-- Monthly partitions from the oldest transition being backfilled through next month
+DO $$
+DECLARE
+  month_start TIMESTAMPTZ;
+BEGIN
+  FOR month_start IN
+    SELECT generate_series(
+      date_trunc('month', LEAST(now(), COALESCE((SELECT min(COALESCE(sent_at, alert_timestamp)) FROM alerts WHERE alert_status <> 'pending'), now())) AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+      date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' + interval '1 month',
+      interval '1 month')
+  LOOP
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF alert_state_log FOR VALUES FROM (%L) TO (%L)',
+                   'alert_state_log_' || to_char(month_start AT TIME ZONE 'UTC', 'YYYY_MM'), month_start, month_start + interval '1 month');
+  END LOOP;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION alerts_track_state() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF NEW.alert_status = 'pending' THEN
+    INSERT INTO alert_pending (alert_id, severity_rank, alert_timestamp)
+    VALUES (NEW.alert_id, CASE NEW.alert_severity WHEN 'high' THEN 0 WHEN 'medium' THEN 1 ELSE 2 END, NEW.alert_timestamp);
+  ELSE
+    INSERT INTO alert_state_log (alert_id, state) VALUES (NEW.alert_id, NEW.alert_status);
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_alerts_track_state ON alerts;
+CREATE TRIGGER trg_alerts_track_state AFTER INSERT ON alerts
+  FOR EACH ROW EXECUTE FUNCTION alerts_track_state();
+
+-- Backfill from the in-place columns, then drop them
+INSERT INTO alert_pending (alert_id, severity_rank, alert_timestamp)
+SELECT alert_id, CASE alert_severity WHEN 'high' THEN 0 WHEN 'medium' THEN 1 ELSE 2 END, alert_timestamp
+FROM alerts WHERE alert_status = 'pending'
+ON CONFLICT (alert_id) DO NOTHING;
+
+INSERT INTO alert_state_log (alert_id, state, ts, coalesced_into)
+SELECT alert_id, alert_status, COALESCE(sent_at, alert_timestamp), coalesced_into
+FROM alerts WHERE alert_status <> 'pending';
+
+DROP INDEX IF EXISTS idx_alert_active;
+DROP INDEX IF EXISTS idx_alert_claim;
+DROP INDEX IF EXISTS idx_alert_sent_at;
+ALTER TABLE alerts DROP COLUMN IF EXISTS coalesced_into;
+ALTER TABLE alerts DROP COLUMN IF EXISTS sent_at;
+
+CREATE OR REPLACE VIEW v_alert_current_state AS
+SELECT a.alert_id, a.alert_severity, a.alert_timestamp,
+       CASE WHEN p.alert_id IS NOT NULL THEN 'pending' ELSE COALESCE(l.state, a.alert_status) END AS state,
+       l.ts AS state_timestamp,
+       l.coalesced_into
+FROM alerts a
+LEFT JOIN alert_pending p ON p.alert_id = a.alert_id
+LEFT JOIN LATERAL (
+  SELECT s.state, s.ts, s.coalesced_into FROM alert_state_log s
+  WHERE s.alert_id = a.alert_id ORDER BY s.ts DESC LIMIT 1
+) l ON true;
@@ -0,0 +1,61 @@
+-- V08__partition_alerts_brin.sql
+-- 1) Range-partition alerts by alert_timestamp. The primary key becomes (alert_id, alert_timestamp)
+--    because it has to include the partition column. alert_pending carries alert_timestamp, so the
+--    dispatcher's join prunes to one partition. New partitions come from python/partition_manager.py.
+-- 2) BRIN indexes on the append-mostly timestamp columns of the partitioned tables. Rows arrive in
+--    time order, so a block range summary is enough for recent-window scans, at a fraction of the
+--    B-tree size (see benchmarks/bench_brin.py). Single-column time B-trees are replaced. The
+--    composite (ts, score/confidence) B-trees stay because they serve ordered top-N queries.
+
+DROP VIEW IF EXISTS v_alert_current_state;
+
+ALTER TABLE alerts RENAME TO alerts_unpartitioned;
+
+CREATE TABLE alerts (
+  LIKE alerts_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+  PRIMARY KEY (alert_id, alert_timestamp)
+) PARTITION BY RANGE (alert_timestamp);
+
+-- Monthly partitions covering the existing alerts through next month
+DO $$
+DECLARE
+  month_start TIMESTAMPTZ;
+BEGIN
+  FOR month_start IN
+    SELECT generate_series(
+      date_trunc('month', LEAST(now(), COALESCE((SELECT min(alert_timestamp) FROM alerts_unpartitioned), now())) AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+      date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' + interval '1 month',
+      interval '1 month')
+  LOOP
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF alerts FOR VALUES FROM (%L) TO (%L)',
+                   'alerts_' || to_char(month_start AT TIME ZONE 'UTC', 'YYYY_MM'), month_start, month_start + interval '1 month');
+  END LOOP;
+END;
+$$;
+
+-- Copy before the trigger exists so alert_pending/alert_state_log are not filled twice
+INSERT INTO alerts SELECT * FROM alerts_unpartitioned;
+DROP TABLE alerts_unpartitioned;
+
+CREATE TRIGGER trg_alerts_track_state AFTER INSERT ON alerts
+  FOR EACH ROW EXECUTE FUNCTION alerts_track_state();
+
+CREATE INDEX IF NOT EXISTS idx_alert_detection_id ON alerts (detection_id);
+CREATE INDEX IF NOT EXISTS idx_alert_ts_brin ON alerts USING BRIN (alert_timestamp) WITH (pages_per_range = 32);
+
+DROP INDEX IF EXISTS idx_posts_ingestion_ts;
+CREATE INDEX IF NOT EXISTS idx_posts_ingestion_ts_brin ON social_posts USING BRIN (ingestion_timestamp) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_cred_assess_ts_brin ON credibility_assessment USING BRIN (assessment_timestamp) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_detect_ts_brin ON disaster_detection USING BRIN (detection_timestamp) WITH (pages_per_range = 32);
+
+CREATE OR REPLACE VIEW v_alert_current_state AS
+SELECT a.alert_id, a.alert_severity, a.alert_timestamp,
+       CASE WHEN p.alert_id IS NOT NULL THEN 'pending' ELSE COALESCE(l.state, a.alert_status) END AS state,
+       l.ts AS state_timestamp,
+       l.coalesced_into
+FROM alerts a
+LEFT JOIN alert_pending p ON p.alert_id = a.alert_id
+LEFT JOIN LATERAL (
+  SELECT s.state, s.ts, s.coalesced_into FROM alert_state_log s
+  WHERE s.alert_id = a.alert_id ORDER BY s.ts DESC LIMIT 1
+) l ON true;
@@ -0,0 +1,27 @@
+-- V09__dashboard_rollups.sql
+-- Pre-aggregated dashboard rollups at 1-minute and 1-hour grain, keyed by (bucket, disaster_type, platform, severity).
+-- Maintained incrementally by real_time/rollups.py: each source table is folded in from its watermark
+-- (rollup_watermarks) up to now() minus a settle delay, so a refresh only reads the newest partition(s).
+-- '' in a key column means "not applicable to this metric" (detections have no severity,
+-- credibility assessments no disaster type or severity).
+
+CREATE TABLE IF NOT EXISTS dashboard_rollup_1m (
+  bucket TIMESTAMPTZ NOT NULL,
+  disaster_type TEXT NOT NULL DEFAULT '',
+  platform TEXT NOT NULL DEFAULT '',
+  severity TEXT NOT NULL DEFAULT '',
+  detections BIGINT NOT NULL DEFAULT 0,
+  fused_confidence_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+  high_confidence_detections BIGINT NOT NULL DEFAULT 0, -- fused_confidence >= 0.8
+  alerts BIGINT NOT NULL DEFAULT 0,
+  credibility_assessments BIGINT NOT NULL DEFAULT 0,
+  credibility_score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+  PRIMARY KEY (bucket, disaster_type, platform, severity)
+);
+
+CREATE TABLE IF NOT EXISTS dashboard_rollup_1h (LIKE dashboard_rollup_1m INCLUDING ALL);
+
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+  source TEXT PRIMARY KEY, -- 'disaster_detection', 'alerts', 'credibility_assessment'
+  processed_until TIMESTAMPTZ NOT NULL
+);
@@ -0,0 +1,35 @@
+-- V10__uuid_v7_keys.sql
+-- Time-ordered UUIDv7 primary keys for the insert-heavy tables (social_posts, credibility_assessment,
+-- disaster_detection, alerts). Random uuid4 keys put every insert on a random B-tree leaf, so WAL (full-page
+-- images) and buffer misses grow with the index; v7 keys start with the Unix time in milliseconds and append
+-- at the right edge. See benchmarks/bench_uuid_keys.py.
+-- Services generate keys client-side (python/ids.py); uuid_generate_v7() is the default for rows inserted
+-- without one (psql, seed scripts). PostgreSQL 18 has a built-in uuidv7() that can replace it.
+--
+-- Existing data: keys are not rewritten (they are referenced by detections, alerts, alert_pending and
+-- alert_state_log). The tables are partitioned by time, so partitions created after this migration hold
+-- only v7 keys, and the uuid4 partitions age out through python/partition_manager.py retention.
+-- The current partitions mix both kinds; REINDEX INDEX CONCURRENTLY on them once they are closed gives
+-- back the space left by earlier random page splits.
+
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid
+LANGUAGE plpgsql VOLATILE PARALLEL SAFE AS $$
+DECLARE
+  -- 48-bit Unix milliseconds, then random bits with the version (7) and variant (10) set
+  v bytea := overlay(gen_random_bytes(16)
+                     PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                     FROM 1 FOR 6);
+BEGIN
+  v := set_byte(v, 6, (get_byte(v, 6) & 15) | 112);
+  v := set_byte(v, 8, (get_byte(v, 8) & 63) | 128);
+  RETURN encode(v, 'hex')::uuid;
+END;
+$$;
+
+-- Defaults on partitioned parents also apply to their partitions
+ALTER TABLE social_posts ALTER COLUMN post_id SET DEFAULT uuid_generate_v7();
+ALTER TABLE credibility_assessment ALTER COLUMN assessment_id SET DEFAULT uuid_generate_v7();
+ALTER TABLE disaster_detection ALTER COLUMN detection_id SET DEFAULT uuid_generate_v7();
+ALTER TABLE alerts ALTER COLUMN alert_id SET DEFAULT uuid_generate_v7();
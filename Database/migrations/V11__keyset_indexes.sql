@@ -0,0 +1,8 @@
+-- V11__keyset_indexes.sql
+-- Indexes for keyset pagination (python/queries.py): newest-first pages ordered by (timestamp, id).
+-- Detections reuse idx_detect_ts_conf (timestamp first, fused_confidence filter checked in the index) and pending
+-- alerts reuse idx_alert_pending_claim; posts and alerts only had BRIN indexes on their timestamps, which cannot
+-- return rows in order, so they get B-trees on (timestamp, id).
+
+CREATE INDEX IF NOT EXISTS idx_posts_ts_id ON social_posts (ingestion_timestamp DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS idx_alert_ts_id ON alerts (alert_timestamp DESC, alert_id DESC);
@@ -0,0 +1,14 @@
+-- V12__post_search.sql
+-- Full-text and fuzzy search over post text (python/search.py), replacing ILIKE scans.
+-- text_search is a stored generated tsvector ('english': stemmed keywords, stop words dropped); the GIN index is
+-- created on the partitioned parent, so every partition (existing and future) gets its own index.
+-- The trigram index serves fuzzy matches (misspelt place names) through the word-similarity operator (<%).
+-- Adding the column rewrites each partition; run outside peak hours.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE social_posts
+  ADD COLUMN IF NOT EXISTS text_search tsvector GENERATED ALWAYS AS (to_tsvector('english', coalesce(text_content, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_posts_text_search ON social_posts USING GIN (text_search);
+CREATE INDEX IF NOT EXISTS idx_posts_text_trgm ON social_posts USING GIN (text_content gin_trgm_ops);
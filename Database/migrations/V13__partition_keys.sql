@@ -0,0 +1,60 @@
+-- V13__partition_keys.sql
+-- Composite foreign keys between the partitioned tables. A foreign key to a partitioned table has to reference
+-- its whole primary key, (id, partition column), so each child row carries its parent's timestamp:
+--   credibility_assessment.post_ingested_at, disaster_detection.post_ingested_at -> social_posts.ingestion_timestamp
+--   alerts.detection_timestamp -> disaster_detection.detection_timestamp
+-- Joins and lookups on the full key prune to the parent's partition instead of probing every partition
+-- (real_time/worker.py, real_time/alert_dispatcher.py, real_time/rollups.py). The ORM mappings for these tables
+-- are python/models.py Post, CredibilityAssessment, DisasterDetection and Alert.
+--
+-- V1 and V8 declared single-column keys and foreign keys on these tables, which PostgreSQL rejects for
+-- partitioned tables, and the dedup constraint UNIQUE (source_platform, source_post_id) could not include
+-- ingestion_timestamp; both files were corrected to what can be applied. Dedup lookups use idx_posts_source.
+--
+-- The backfills rewrite the existing rows once; run outside peak hours. Rows whose parent is missing
+-- (possible only without the foreign keys) are deleted so the constraints can be added.
+--
+-- social_posts also gets the post language and the platform's own post time (posted_at), which the ingest API
+-- takes from the client and the legacy social_media_posts table stored (language, timestamp).
+
+ALTER TABLE social_posts ADD COLUMN IF NOT EXISTS language TEXT;
+ALTER TABLE social_posts ADD COLUMN IF NOT EXISTS posted_at TIMESTAMPTZ;
+
+ALTER TABLE credibility_assessment ADD COLUMN IF NOT EXISTS post_ingested_at TIMESTAMPTZ;
+ALTER TABLE disaster_detection ADD COLUMN IF NOT EXISTS post_ingested_at TIMESTAMPTZ;
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS detection_timestamp TIMESTAMPTZ;
+
+UPDATE credibility_assessment c SET post_ingested_at = p.ingestion_timestamp
+FROM social_posts p WHERE p.post_id = c.post_id AND c.post_ingested_at IS NULL;
+DELETE FROM credibility_assessment WHERE post_ingested_at IS NULL;
+
+UPDATE disaster_detection d SET post_ingested_at = p.ingestion_timestamp
+FROM social_posts p WHERE p.post_id = d.post_id AND d.post_ingested_at IS NULL;
+DELETE FROM disaster_detection WHERE post_ingested_at IS NULL;
+
+UPDATE alerts a SET detection_timestamp = d.detection_timestamp
+FROM disaster_detection d WHERE d.detection_id = a.detection_id AND a.detection_timestamp IS NULL;
+DELETE FROM alert_pending q USING alerts a WHERE a.alert_id = q.alert_id AND a.detection_timestamp IS NULL;
+DELETE FROM alerts WHERE detection_timestamp IS NULL;
+
+ALTER TABLE credibility_assessment ALTER COLUMN post_ingested_at SET NOT NULL;
+ALTER TABLE disaster_detection ALTER COLUMN post_ingested_at SET NOT NULL;
+ALTER TABLE alerts ALTER COLUMN detection_timestamp SET NOT NULL;
+
+ALTER TABLE credibility_assessment
+  ADD CONSTRAINT credibility_assessment_post_fkey FOREIGN KEY (post_id, post_ingested_at)
+  REFERENCES social_posts (post_id, ingestion_timestamp) ON DELETE CASCADE;
+ALTER TABLE disaster_detection
+  ADD CONSTRAINT disaster_detection_post_fkey FOREIGN KEY (post_id, post_ingested_at)
+  REFERENCES social_posts (post_id, ingestion_timestamp) ON DELETE CASCADE;
+ALTER TABLE alerts
+  ADD CONSTRAINT alerts_detection_fkey FOREIGN KEY (detection_id, detection_timestamp)
+  REFERENCES disaster_detection (detection_id, detection_timestamp) ON DELETE CASCADE;
+
+-- The referencing side of each key, for the cascades and for "children of this parent" lookups
+DROP INDEX IF EXISTS idx_cred_post_id;
+DROP INDEX IF EXISTS idx_detect_post_id;
+DROP INDEX IF EXISTS idx_alert_detection_id;
+CREATE INDEX IF NOT EXISTS idx_cred_post ON credibility_assessment (post_id, post_ingested_at);
+CREATE INDEX IF NOT EXISTS idx_detect_post ON disaster_detection (post_id, post_ingested_at);
+CREATE INDEX IF NOT EXISTS idx_alert_detection ON alerts (detection_id, detection_timestamp);
@@ -0,0 +1,13 @@
+-- V14__auth_token_indexes.sql
+-- Token lookups of the database-backed auth flows (python/auth_demo.py): email verification and password reset
+-- look tokens up by their SHA-256 hash, which had no index, so each lookup scanned users / password_reset_tokens.
+-- Services keep these tokens in Redis instead (python/session_store.py TokenStore, used by python/auth_service.py);
+-- these indexes are for the remaining database path.
+
+-- Only pending users carry a verification token
+CREATE INDEX IF NOT EXISTS idx_users_verification_token
+  ON users (verification_token_hash) WHERE verification_token_hash IS NOT NULL;
+
+-- Only unused tokens are ever looked up
+CREATE INDEX IF NOT EXISTS idx_password_reset_tokens_hash
+  ON password_reset_tokens (token_hash) WHERE used = false;
@@ -0,0 +1,57 @@
+-- V15__cdc_outbox.sql
+-- Change-data-capture outbox: every row inserted into disaster_detection and alerts is captured as an event in
+-- cdc_outbox by a trigger, in the inserting transaction, so an event exists exactly when its row committed.
+-- real_time/cdc_relay.py publishes the events to the Redis streams rtmd:cdc:<table> and deletes them, replacing the
+-- readers that poll those tables. The ORM `results` table gets the same trigger in Alembic revision 0007.
+--
+-- The payload is the whole row as JSONB, so consumers never re-query it. Alert events also carry the type,
+-- confidence and post of their detection (a lookup on the full detection key, pruned to one partition).
+-- Trigger arguments name the table: on a partitioned table TG_TABLE_NAME is the partition the row landed in.
+
+CREATE TABLE IF NOT EXISTS cdc_outbox (
+  event_id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  table_name TEXT NOT NULL,
+  op TEXT NOT NULL,
+  payload JSONB NOT NULL,
+  captured_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+) WITH (fillfactor = 70, autovacuum_vacuum_scale_factor = 0, autovacuum_vacuum_threshold = 1000);
+
+CREATE OR REPLACE FUNCTION cdc_capture() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  INSERT INTO cdc_outbox (table_name, op, payload) VALUES (TG_ARGV[0], TG_OP, to_jsonb(NEW));
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION cdc_capture_alert() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  INSERT INTO cdc_outbox (table_name, op, payload)
+  SELECT 'alerts', TG_OP, to_jsonb(NEW) || coalesce((
+    SELECT jsonb_build_object('disaster_type', d.disaster_type, 'fused_confidence', d.fused_confidence,
+                              'post_id', d.post_id, 'post_ingested_at', d.post_ingested_at)
+    FROM disaster_detection d
+    WHERE d.detection_id = NEW.detection_id AND d.detection_timestamp = NEW.detection_timestamp
+  ), '{}'::jsonb);
+  RETURN NULL;
+END;
+$$;
+
+-- One notification per statement wakes the relay; NOTIFY is delivered at commit and not at all on rollback
+CREATE OR REPLACE FUNCTION cdc_notify() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  PERFORM pg_notify('rtmd_cdc', '');
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_disaster_detection_cdc ON disaster_detection;
+CREATE TRIGGER trg_disaster_detection_cdc AFTER INSERT ON disaster_detection
+  FOR EACH ROW EXECUTE FUNCTION cdc_capture('disaster_detection');
+
+DROP TRIGGER IF EXISTS trg_alerts_cdc ON alerts;
+CREATE TRIGGER trg_alerts_cdc AFTER INSERT ON alerts
+  FOR EACH ROW EXECUTE FUNCTION cdc_capture_alert();
+
+DROP TRIGGER IF EXISTS trg_cdc_outbox_notify ON cdc_outbox;
+CREATE TRIGGER trg_cdc_outbox_notify AFTER INSERT ON cdc_outbox
+  FOR EACH STATEMENT EXECUTE FUNCTION cdc_notify();
@@ -0,0 +1,12 @@
+-- V16__alert_retry.sql
+-- Retry backoff and dead-lettering for the dispatcher (real_time/alert_dispatcher.py). Claims took the oldest
+-- alerts of the highest severity first, so an alert that failed on every channel was claimed again at the head of
+-- every batch. Now a failed digest's alerts count an attempt and are not claimable before next_attempt_at
+-- (exponential backoff); after ALERT_MAX_ATTEMPTS they leave alert_pending with a 'failed' transition.
+
+ALTER TABLE alert_pending ADD COLUMN IF NOT EXISTS attempts SMALLINT NOT NULL DEFAULT 0;
+ALTER TABLE alert_pending ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT '-infinity';
+
+ALTER TABLE alert_state_log DROP CONSTRAINT IF EXISTS alert_state_log_state_check;
+ALTER TABLE alert_state_log ADD CONSTRAINT alert_state_log_state_check
+  CHECK (state IN ('sent','acknowledged','suppressed','coalesced','failed'));
@@ -0,0 +1,32 @@
+-- V17__rollup_commit_order.sql
+-- Fold rows into the dashboard rollups in commit order instead of event time (real_time/rollups.py). The event-time
+-- watermark with a settle delay skipped every row committed later than the delay after its timestamp: long worker
+-- transactions, back-dated rows, bulk seeds after the first refresh.
+-- Each source row now records the id of the transaction that wrote it (rollup_xid). A refresh folds the rows with
+-- rollup_xid in [processed_xid, xmin of its snapshot): every transaction below that xmin has finished, so each row is
+-- counted exactly once whenever it commits. A transaction left open holds the xmin back and delays the rollups.
+-- Existing rows keep a NULL rollup_xid (already counted by the time watermark), except those past it, which are
+-- stamped with this migration's transaction so the next refresh picks them up.
+
+ALTER TABLE rollup_watermarks ADD COLUMN IF NOT EXISTS processed_xid BIGINT;
+
+ALTER TABLE disaster_detection ADD COLUMN IF NOT EXISTS rollup_xid BIGINT;
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS rollup_xid BIGINT;
+ALTER TABLE credibility_assessment ADD COLUMN IF NOT EXISTS rollup_xid BIGINT;
+
+UPDATE disaster_detection SET rollup_xid = pg_current_xact_id()::text::bigint
+WHERE detection_timestamp > COALESCE((SELECT processed_until FROM rollup_watermarks WHERE source = 'disaster_detection'), '-infinity');
+UPDATE alerts SET rollup_xid = pg_current_xact_id()::text::bigint
+WHERE alert_timestamp > COALESCE((SELECT processed_until FROM rollup_watermarks WHERE source = 'alerts'), '-infinity');
+UPDATE credibility_assessment SET rollup_xid = pg_current_xact_id()::text::bigint
+WHERE assessment_timestamp > COALESCE((SELECT processed_until FROM rollup_watermarks WHERE source = 'credibility_assessment'), '-infinity');
+UPDATE rollup_watermarks SET processed_xid = pg_current_xact_id()::text::bigint;
+
+ALTER TABLE disaster_detection ALTER COLUMN rollup_xid SET DEFAULT pg_current_xact_id()::text::bigint;
+ALTER TABLE alerts ALTER COLUMN rollup_xid SET DEFAULT pg_current_xact_id()::text::bigint;
+ALTER TABLE credibility_assessment ALTER COLUMN rollup_xid SET DEFAULT pg_current_xact_id()::text::bigint;
+
+-- transaction ids grow with insertion order, so BRIN ranges stay tight
+CREATE INDEX IF NOT EXISTS idx_detect_rollup_xid_brin ON disaster_detection USING BRIN (rollup_xid) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_alert_rollup_xid_brin ON alerts USING BRIN (rollup_xid) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_cred_rollup_xid_brin ON credibility_assessment USING BRIN (rollup_xid) WITH (pages_per_range = 32);
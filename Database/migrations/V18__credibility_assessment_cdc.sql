@@ -0,0 +1,8 @@
+-- V18__credibility_assessment_cdc.sql
+-- Publish credibility assessments on the CDC outbox (stream rtmd:cdc:credibility_assessment). The worker writes
+-- its assessments to credibility_assessment, not to the ORM `results` table, so the results trigger of Alembic
+-- 0007 never fired for pipeline traffic; Alembic 0009 removes it.
+
+DROP TRIGGER IF EXISTS trg_credibility_assessment_cdc ON credibility_assessment;
+CREATE TRIGGER trg_credibility_assessment_cdc AFTER INSERT ON credibility_assessment
+  FOR EACH ROW EXECUTE FUNCTION cdc_capture('credibility_assessment');
@@ -0,0 +1,23 @@
+-- V19__alert_state_log_alert_timestamp.sql
+-- alert_state_log rows carry their alert's alert_timestamp, the partition key of alerts, so joins from a transition
+-- to its alert use the full key and prune alerts to one partition (real_time/latency_exporter.py,
+-- real_time/alert_dispatcher.py). The dispatcher copies it from alert_pending; the insert trigger from the alert.
+-- The backfill rewrites the existing transitions once; run outside peak hours. Transitions whose alert is already
+-- gone keep a NULL alert_timestamp.
+
+ALTER TABLE alert_state_log ADD COLUMN IF NOT EXISTS alert_timestamp TIMESTAMPTZ;
+
+UPDATE alert_state_log s SET alert_timestamp = a.alert_timestamp
+FROM alerts a WHERE a.alert_id = s.alert_id AND s.alert_timestamp IS NULL;
+
+CREATE OR REPLACE FUNCTION alerts_track_state() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF NEW.alert_status = 'pending' THEN
+    INSERT INTO alert_pending (alert_id, severity_rank, alert_timestamp)
+    VALUES (NEW.alert_id, CASE NEW.alert_severity WHEN 'high' THEN 0 WHEN 'medium' THEN 1 ELSE 2 END, NEW.alert_timestamp);
+  ELSE
+    INSERT INTO alert_state_log (alert_id, alert_timestamp, state) VALUES (NEW.alert_id, NEW.alert_timestamp, NEW.alert_status);
+  END IF;
+  RETURN NULL;
+END;
+$$;
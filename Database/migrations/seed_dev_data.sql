@@ -12,18 +12,18 @@ VALUES ('instagram','insta-001','Flooding in downtown area after heavy rains.','
 RETURNING post_id INTO TEMP TABLE tmp_post2;
 
 -- For predictable sample, grab ids
-WITH p AS (SELECT post_id FROM social_posts ORDER BY ingestion_timestamp DESC LIMIT 2)
-INSERT INTO credibility_assessment (post_id, credibility_score, credibility_label, threshold_value)
-SELECT post_id, 0.15, 'misinformation', 0.5 FROM p
+WITH p AS (SELECT post_id, ingestion_timestamp FROM social_posts ORDER BY ingestion_timestamp DESC LIMIT 2)
+INSERT INTO credibility_assessment (post_id, post_ingested_at, credibility_score, credibility_label, threshold_value)
+SELECT post_id, ingestion_timestamp, 0.15, 'misinformation', 0.5 FROM p
 RETURNING assessment_id;
 
-WITH p AS (SELECT post_id FROM social_posts ORDER BY ingestion_timestamp DESC LIMIT 2)
-INSERT INTO disaster_detection (post_id, disaster_type, text_confidence, image_confidence, fused_confidence)
-SELECT post_id, 'fire', 0.9, 0.7, 0.85 FROM p
+WITH p AS (SELECT post_id, ingestion_timestamp FROM social_posts ORDER BY ingestion_timestamp DESC LIMIT 2)
+INSERT INTO disaster_detection (post_id, post_ingested_at, disaster_type, text_confidence, image_confidence, fused_confidence)
+SELECT post_id, ingestion_timestamp, 'fire', 0.9, 0.7, 0.85 FROM p
 RETURNING detection_id;
 
 -- Create alerts for last inserted detections
-INSERT INTO alerts (detection_id, alert_severity, alert_status)
-SELECT detection_id, 'high', 'pending' FROM (
-  SELECT detection_id FROM disaster_detection ORDER BY detection_timestamp DESC LIMIT 2
+INSERT INTO alerts (detection_id, detection_timestamp, alert_severity, alert_status)
+SELECT detection_id, detection_timestamp, 'high', 'pending' FROM (
+  SELECT detection_id, detection_timestamp FROM disaster_detection ORDER BY detection_timestamp DESC LIMIT 2
 ) d;
@@ -0,0 +1,231 @@
+"""
+Cold-partition tiering: move partitions older than a cut-off from Postgres to compressed Parquet on local disk,
+and read them back with predicate pushdown.
+- archive: for each table in ARCHIVE_TABLES (referencing tables first, since a partition cannot be detached while
+  rows in another table still reference it), every partition that ended more than ARCHIVE_AFTER_DAYS ago (a
+  referenced table one period earlier than the tables referencing it, as for retention) is
+  1) exported to <ARCHIVE_DIR>/<table>/<partition>.parquet (python/export.py, zstd, one row group per chunk),
+  2) detached (CONCURRENTLY on PostgreSQL 14+), 3) row-counted again now that no rows can arrive and compared with
+  the file (re-exported once from the detached table on a mismatch), 4) dropped and recorded in the manifest.
+  A partition that fails verification stays detached (not dropped) for inspection
+- read_range / iter_range: historical range queries over the archive. Files outside the range are skipped using
+  the manifest, and the time filter (plus any extra filter) is pushed down to Parquet row-group statistics
+- query_through / iter_through: a range with the archived part read from Parquet and the rest from Postgres, the
+  latter through named (server-side) cursors in chunk-size batches as in python/export.py
+
+Keep ARCHIVE_DIR on backed-up storage: archived rows are no longer in pg_dump backups (scripts/backup_restore.ps1).
+Partition retention (PARTITION_RETENTION_DAYS) must be 0 or longer than ARCHIVE_AFTER_DAYS, or it drops partitions first.
+
+Configuration (env): DB_* as for python/partition_manager.py, ARCHIVE_DIR (default ./archive), ARCHIVE_AFTER_DAYS
+(default 180), ARCHIVE_TABLES (comma-separated, default alerts,disaster_detection,credibility_assessment,social_posts).
+Requires: pyarrow, psycopg2-binary
+Run: python python/archive.py archive [--dry-run] | list
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional, Sequence
+
+import psycopg2
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from export import CHUNK_SIZE, EXPORTS, export_partition, select_sql, to_batch
+from partition_manager import (
+    PARTITION_DAILY_TABLES, PARTITIONED_TABLES, expired_partitions, fk_safe_cutoffs, get_conn, list_partitions, overlaps,
+)
+
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'archive')
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 180))
+ARCHIVE_TABLES = [t.strip() for t in os.getenv('ARCHIVE_TABLES', 'alerts,disaster_detection,credibility_assessment,social_posts').split(',') if t.strip()]
+
+MANIFEST = '_manifest.json'
+
+
+class ArchiveVerificationError(Exception):
+    pass
+
+
+def _ordered(tables: Sequence[str]) -> List[str]:
+    # same order as partition retention: referencing tables before the tables they reference
+    return sorted(tables, key=lambda t: PARTITIONED_TABLES.index(t) if t in PARTITIONED_TABLES else len(PARTITIONED_TABLES))
+
+
+def load_manifest(table: str, archive_dir: str = ARCHIVE_DIR) -> List[dict]:
+    """Archived partitions of `table`: name, file, range (from, to as datetimes), rows, archived_at."""
+    path = os.path.join(archive_dir, table, MANIFEST)
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        entries = json.load(f)
+    for entry in entries:
+        entry['range'] = tuple(datetime.fromisoformat(v) for v in entry['range'])
+    return entries
+
+
+def _save_manifest(table: str, entries: List[dict], archive_dir: str) -> None:
+    path = os.path.join(archive_dir, table, MANIFEST)
+    serialisable = [{**e, 'range': [v.isoformat() for v in e['range']]} for e in sorted(entries, key=lambda e: e['range'])]
+    with open(path + '.tmp', 'w') as f:
+        json.dump(serialisable, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def _count(conn, partition: dict) -> int:
+    with conn.cursor() as cur:
+        cur.execute(f'SELECT count(*) FROM "{partition["schema"]}"."{partition["name"]}";')
+        return cur.fetchone()[0]
+
+
+def archive_partition(conn, table: str, partition: dict, archive_dir: str = ARCHIVE_DIR, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Export, detach, verify and drop one partition. `conn` must be in autocommit mode (get_conn)."""
+    job = (table, partition, archive_dir, 'parquet', chunk_size, None, None, True)
+    export_partition(job)
+    path = os.path.join(archive_dir, table, f"{partition['name']}.parquet")
+
+    qualified = f'"{partition["schema"]}"."{partition["name"]}"'
+    concurrently = ' CONCURRENTLY' if conn.server_version >= 140000 else ''
+    with conn.cursor() as cur:
+        cur.execute(f'ALTER TABLE "{table}" DETACH PARTITION {qualified}{concurrently};')
+
+    # Rows inserted between the export snapshot and the detach are caught here
+    rows = _count(conn, partition)
+    if pq.ParquetFile(path).metadata.num_rows != rows:
+        export_partition(job)
+    written = pq.ParquetFile(path).metadata.num_rows
+    if written != rows:
+        raise ArchiveVerificationError(f'{partition["name"]}: {rows} rows in Postgres, {written} in {path}; partition left detached')
+
+    with conn.cursor() as cur:
+        cur.execute(f'DROP TABLE {qualified};')
+    return {
+        'partition': partition['name'],
+        'file': os.path.basename(path),
+        'range': partition['range'],
+        'rows': rows,
+        'bytes': os.path.getsize(path),
+        'archived_at': datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def archive(conn, tables: Sequence[str] = ARCHIVE_TABLES, after_days: int = ARCHIVE_AFTER_DAYS, archive_dir: str = ARCHIVE_DIR,
+            now: Optional[datetime] = None, dry_run: bool = False) -> List[dict]:
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=after_days)
+    cutoffs = fk_safe_cutoffs(dict.fromkeys(tables, cutoff), {t: 'day' if t in PARTITION_DAILY_TABLES else 'month' for t in tables})
+    done = []
+    for table in _ordered(tables):
+        if cutoffs[table] is None:
+            print(f'Skipping {table}: a table referencing it is not archived')
+            continue
+        os.makedirs(os.path.join(archive_dir, table), exist_ok=True)
+        manifest = load_manifest(table, archive_dir)
+        for partition in expired_partitions(list_partitions(conn, table), cutoffs[table]):
+            if dry_run:
+                print(f"Would archive {partition['name']} (~{max(partition['rows'], 0)} rows)")
+                continue
+            try:
+                entry = archive_partition(conn, table, partition, archive_dir)
+            except psycopg2.errors.ForeignKeyViolation as e:
+                print(f"Keeping {partition['name']} and newer partitions of {table}, still referenced: {e}")
+                break
+            manifest = [e for e in manifest if e['partition'] != entry['partition']] + [entry]
+            _save_manifest(table, manifest, archive_dir)
+            print(f"Archived {entry['partition']}: {entry['rows']} rows, {entry['bytes'] / 1e6:,.1f} MB")
+            done.append(entry)
+    return done
+
+
+# --- reading the archive ---
+
+def _range_files(table: str, since: datetime, until: datetime, archive_dir: str) -> List[str]:
+    return [
+        os.path.join(archive_dir, table, e['file'])
+        for e in load_manifest(table, archive_dir)
+        if overlaps(e['range'], (since, until))
+    ]
+
+
+def _scanner(table: str, since: datetime, until: datetime, columns: Optional[List[str]], where: Optional[ds.Expression], archive_dir: str):
+    ts_column, schema = EXPORTS[table]
+    files = _range_files(table, since, until, archive_dir)
+    predicate = (ds.field(ts_column) >= pa.scalar(since, schema.field(ts_column).type)) & (
+        ds.field(ts_column) < pa.scalar(until, schema.field(ts_column).type)
+    )
+    if where is not None:
+        predicate = predicate & where
+    return ds.dataset(files, schema=schema, format='parquet').scanner(columns=columns, filter=predicate)
+
+
+def read_range(table: str, since: datetime, until: datetime, columns: Optional[List[str]] = None,
+               where: Optional[ds.Expression] = None, archive_dir: str = ARCHIVE_DIR) -> pa.Table:
+    """Archived rows with since <= timestamp < until, e.g. `where=ds.field('source_platform') == 'twitter'`."""
+    return _scanner(table, since, until, columns, where, archive_dir).to_table()
+
+
+def iter_range(table: str, since: datetime, until: datetime, columns: Optional[List[str]] = None,
+               where: Optional[ds.Expression] = None, archive_dir: str = ARCHIVE_DIR) -> Iterator[pa.RecordBatch]:
+    """Like `read_range`, streamed as record batches."""
+    yield from _scanner(table, since, until, columns, where, archive_dir).to_batches()
+
+
+def iter_through(conn, table: str, since: datetime, until: datetime, archive_dir: str = ARCHIVE_DIR,
+                 chunk_size: int = CHUNK_SIZE) -> Iterator[pa.RecordBatch]:
+    """Rows in [since, until) from the archive, then from the partitions still in Postgres, as record batches."""
+    schema = EXPORTS[table][1]
+    yield from iter_range(table, since, until, archive_dir=archive_dir)
+    partitions = [p for p in list_partitions(conn, table) if p['range'] is None or overlaps(p['range'], (since, until))]
+    # named cursors need a transaction (get_conn is autocommit)
+    autocommit = conn.autocommit
+    conn.autocommit = False
+    try:
+        for partition in partitions:
+            sql, params = select_sql(partition, table, since, until)
+            with conn.cursor(name=f"query_through_{partition['name']}") as cur:
+                cur.itersize = chunk_size
+                cur.execute(sql, params)
+                while True:
+                    chunk = cur.fetchmany(chunk_size)
+                    if not chunk:
+                        break
+                    yield to_batch(chunk, schema)
+    finally:
+        conn.rollback()
+        conn.autocommit = autocommit
+
+
+def query_through(conn, table: str, since: datetime, until: datetime, archive_dir: str = ARCHIVE_DIR) -> pa.Table:
+    """Like `iter_through`, as one table."""
+    return pa.Table.from_batches(iter_through(conn, table, since, until, archive_dir), schema=EXPORTS[table][1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('action', choices=['archive', 'list'])
+    parser.add_argument('--dry-run', action='store_true', help='only list the partitions that would be archived')
+    args = parser.parse_args()
+
+    if args.action == 'list':
+        for table in ARCHIVE_TABLES:
+            for e in load_manifest(table):
+                print(f"{table:<24} {e['partition']:<40} {e['range'][0]:%Y-%m-%d} .. {e['range'][1]:%Y-%m-%d} {e['rows']:>12} rows")
+        return
+
+    try:
+        conn = get_conn()
+    except Exception as e:
+        print('Error connecting to DB:', e)
+        sys.exit(1)
+    try:
+        archive(conn, dry_run=args.dry_run)
+    except ArchiveVerificationError as e:
+        print('Archive verification failed:', e)
+        sys.exit(2)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
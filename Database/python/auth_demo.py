@@ -2,6 +2,7 @@
 auth_demo.py
 Simple demonstration of sign-up, login, and password reset flows (application-side responsibilities).
 Uses Argon2id for password hashing and SHA-256 to store token hashes.
+Hashes inline on the calling thread; services use python/auth_service.py, which runs Argon2 on a bounded process pool.
 
 Note: This is a demo only — in production, add rate-limiting, logging, account lockout, email verification delivery, and MFA.
 """
@@ -0,0 +1,179 @@
+"""
+Password authentication for services: the Argon2id work runs on a bounded process pool instead of request threads.
+- Argon2 is deliberately CPU- and memory-heavy (64 MiB per hash with the default parameters), so hashing inline
+  lets a burst of logins occupy every request thread. Here each hash/verify is one task on AUTH_HASH_WORKERS
+  processes; a verify that needs a rehash returns the new hash from the same task
+- At most AUTH_MAX_QUEUE tasks wait for a worker; beyond that `AuthBusyError` is raised at once, so the caller can
+  answer 503 / Retry-After instead of queueing requests it cannot serve in time
+- Login is one SELECT before the verification and one UPDATE after it (autocommit, no separate COMMIT): the rehash
+  and last_login are written by the same statement. The rehash applies only if the stored hash is unchanged, so a
+  concurrent password reset is not overwritten. The SELECT cannot be folded into the UPDATE: the stored hash is
+  needed to verify before anything is written
+- Unknown emails are verified against a dummy hash, so response time does not reveal which accounts exist
+- Verification and reset tokens are issued and consumed through python/session_store.py TokenStore (Redis, TTL,
+  single use); a password reset ends every session of the user in the SessionStore
+
+Flows as in python/auth_demo.py (users table: migrations/V02__add_auth.sql), which keeps tokens in the database.
+Configuration (env): AUTH_HASH_WORKERS (default: CPU count), AUTH_MAX_QUEUE (default 64), AUTH_HASH_TIMEOUT (seconds, 10)
+Requires: argon2-cffi, redis
+"""
+import multiprocessing
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence, Tuple
+
+from argon2 import PasswordHasher, exceptions as argon2_exceptions
+from sqlalchemy import text
+
+from python import db
+from python.session_store import SessionStore, TokenStore
+
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", os.cpu_count() or 1))
+AUTH_MAX_QUEUE = int(os.getenv("AUTH_MAX_QUEUE", "64"))
+AUTH_HASH_TIMEOUT = float(os.getenv("AUTH_HASH_TIMEOUT", "10"))
+
+SELECT_LOGIN_SQL = text("SELECT user_id, password_hash, status, roles FROM users WHERE email = :email")
+
+RECORD_LOGIN_SQL = text(
+    """
+    UPDATE users
+    SET last_login = now(),
+        password_hash = CASE WHEN CAST(:new_hash AS text) IS NOT NULL AND password_hash = :old_hash
+                             THEN :new_hash ELSE password_hash END
+    WHERE user_id = :user_id
+    """
+)
+
+INSERT_USER_SQL = text(
+    """
+    INSERT INTO users (email, password_hash, roles, status)
+    VALUES (:email, :password_hash, :roles, 'pending')
+    RETURNING user_id
+    """
+)
+
+VERIFY_EMAIL_SQL = text(
+    """
+    UPDATE users SET email_verified = true, status = 'active'
+    WHERE user_id = :user_id AND status = 'pending'
+    RETURNING user_id
+    """
+)
+
+SELECT_USER_ID_SQL = text("SELECT user_id FROM users WHERE email = :email")
+
+SET_PASSWORD_SQL = text("UPDATE users SET password_hash = :password_hash WHERE user_id = :user_id RETURNING user_id")
+
+
+class AuthBusyError(Exception):
+    """The hashing queue is full; retry later."""
+
+
+# --- worker processes ---
+
+_hasher: Optional[PasswordHasher] = None
+
+
+def _init_worker():
+    global _hasher
+    _hasher = PasswordHasher()
+
+
+def _hash(password: str) -> str:
+    return _hasher.hash(password)
+
+
+def _verify(stored_hash: str, password: str) -> Tuple[bool, Optional[str]]:
+    """(matches, new hash if the parameters changed)."""
+    try:
+        _hasher.verify(stored_hash, password)
+    except (argon2_exceptions.VerifyMismatchError, argon2_exceptions.InvalidHashError):
+        return False, None
+    return True, (_hasher.hash(password) if _hasher.check_needs_rehash(stored_hash) else None)
+
+
+class AuthService:
+    def __init__(self, workers: int = AUTH_HASH_WORKERS, max_queue: int = AUTH_MAX_QUEUE, timeout: float = AUTH_HASH_TIMEOUT,
+                 tokens: Optional[TokenStore] = None, sessions: Optional[SessionStore] = None):
+        # spawn: request threads may hold locks (DB pools, logging) that a forked child would inherit held
+        self._pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker)
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._timeout = timeout
+        self._dummy_hash: Optional[str] = None
+        self.tokens = tokens or TokenStore()
+        self.sessions = sessions or SessionStore()
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise AuthBusyError("Password hashing queue is full")
+        try:
+            future = self._pool.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result(self._timeout)
+
+    def hash_password(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    def verify_password(self, stored_hash: str, password: str) -> Tuple[bool, Optional[str]]:
+        return self._run(_verify, stored_hash, password)
+
+    def warm_up(self) -> None:
+        """Start the worker processes now rather than on the first request."""
+        self._dummy_hash = self._dummy_hash or self.hash_password(secrets.token_urlsafe(16))
+
+    def signup(self, email: str, password: str, roles: Sequence[str] = ()) -> Tuple[str, str]:
+        """Create a pending user; returns (user_id, raw verification token to send by email)."""
+        password_hash = self.hash_password(password)
+        with db.engine.begin() as conn:
+            user_id = str(conn.execute(INSERT_USER_SQL, {"email": email, "password_hash": password_hash, "roles": list(roles)}).scalar_one())
+        return user_id, self.tokens.issue("verify_email", user_id)
+
+    def verify_email(self, token: str) -> Optional[str]:
+        """Activate the account a verification token was issued for; returns its user id."""
+        user_id = self.tokens.consume("verify_email", token)
+        if user_id is None:
+            return None
+        with db.engine.begin() as conn:
+            return user_id if conn.execute(VERIFY_EMAIL_SQL, {"user_id": user_id}).first() else None
+
+    def login(self, email: str, password: str) -> Optional[dict]:
+        """{"user_id", "roles"} when the password matches an active account, else None."""
+        # No pooled connection is held while the hash is verified: one for the lookup, another for the update
+        with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            user = conn.execute(SELECT_LOGIN_SQL, {"email": email}).mappings().first()
+        if user is None or not user["password_hash"]:
+            self.warm_up()
+            self.verify_password(self._dummy_hash, password)
+            return None
+        ok, new_hash = self.verify_password(user["password_hash"], password)
+        if not ok or user["status"] != "active":
+            return None
+        with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(RECORD_LOGIN_SQL, {"user_id": user["user_id"], "old_hash": user["password_hash"], "new_hash": new_hash})
+        return {"user_id": str(user["user_id"]), "roles": list(user["roles"] or [])}
+
+    def create_password_reset(self, email: str) -> Optional[str]:
+        """A raw reset token (valid 1 h, send by email), or None for an unknown email."""
+        with db.engine.connect() as conn:
+            user_id = conn.execute(SELECT_USER_ID_SQL, {"email": email}).scalar()
+        return self.tokens.issue("password_reset", str(user_id)) if user_id else None
+
+    def reset_password(self, token: str, new_password: str) -> bool:
+        """Consume a reset token, set the new password and end the user's sessions."""
+        password_hash = self.hash_password(new_password)
+        user_id = self.tokens.consume("password_reset", token)
+        if user_id is None:
+            return False
+        with db.engine.begin() as conn:
+            if conn.execute(SET_PASSWORD_SQL, {"user_id": user_id, "password_hash": password_hash}).first() is None:
+                return False
+        self.sessions.revoke_user(user_id)
+        return True
+
+    def close(self) -> None:
+        self._pool.shutdown()
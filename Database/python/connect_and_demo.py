@@ -4,16 +4,28 @@ Requires: psycopg2-binary
 """
 import os
 import sys
-import datetime
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from partition_manager import default_policies, ensure_partitions
+
 DB_HOST = os.getenv('DB_HOST', 'localhost')
 DB_PORT = int(os.getenv('DB_PORT', 5432))
 DB_NAME = os.getenv('DB_NAME', 'rtmd')
 DB_USER = os.getenv('DB_USER', 'rtmd_user')
 DB_PASS = os.getenv('DB_PASS', 'change_me')
 
+# Newest page only; python/queries.py (alerts_page(pending=True)) pages through the rest by cursor.
+# Also replayed by benchmarks/bench_workload.py.
+PENDING_HIGH_ALERTS_SQL = (
+    "SELECT a.alert_id, a.alert_severity, a.alert_timestamp, d.disaster_type, d.fused_confidence FROM alert_pending p "
+    "JOIN alerts a ON a.alert_id = p.alert_id AND a.alert_timestamp = p.alert_timestamp "
+    "JOIN disaster_detection d ON d.detection_id = a.detection_id AND d.detection_timestamp = a.detection_timestamp "
+    "WHERE p.severity_rank = 0 AND p.alert_timestamp >= now() - make_interval(mins => %(minutes)s) "
+    "ORDER BY p.alert_timestamp DESC, p.alert_id DESC LIMIT %(limit)s;"
+)
+
+
 def get_conn():
     return psycopg2.connect(host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASS)
 
@@ -34,49 +46,44 @@ def seed_sample(conn):
     with conn.cursor() as cur:
         cur.execute("BEGIN;")
         cur.execute(
-            "INSERT INTO social_posts (source_platform, source_post_id, text_content, image_reference, processing_status) VALUES (%s,%s,%s,%s,%s) RETURNING post_id;",
+            "INSERT INTO social_posts (source_platform, source_post_id, text_content, image_reference, processing_status) VALUES (%s,%s,%s,%s,%s) RETURNING post_id, ingestion_timestamp;",
             ('demo','demo-001','Demo: small brush fire near riverbank','https://example.org/img.jpg','processed')
         )
-        post_id = cur.fetchone()[0]
+        # child rows reference the full (id, partition timestamp) key of their parent
+        post_id, ingested_at = cur.fetchone()
         cur.execute(
-            "INSERT INTO credibility_assessment (post_id, credibility_score, credibility_label, threshold_value) VALUES (%s,%s,%s,%s);",
-            (post_id, 0.4, 'questionable', 0.5)
+            "INSERT INTO credibility_assessment (post_id, post_ingested_at, credibility_score, credibility_label, threshold_value) VALUES (%s,%s,%s,%s,%s);",
+            (post_id, ingested_at, 0.4, 'questionable', 0.5)
         )
         cur.execute(
-            "INSERT INTO disaster_detection (post_id, disaster_type, text_confidence, image_confidence, fused_confidence) VALUES (%s,%s,%s,%s,%s) RETURNING detection_id;",
-            (post_id, 'fire', 0.82, 0.6, 0.74)
+            "INSERT INTO disaster_detection (post_id, post_ingested_at, disaster_type, text_confidence, image_confidence, fused_confidence) VALUES (%s,%s,%s,%s,%s,%s) RETURNING detection_id, detection_timestamp;",
+            (post_id, ingested_at, 'fire', 0.82, 0.6, 0.74)
         )
-        detection_id = cur.fetchone()[0]
+        detection_id, detected_at = cur.fetchone()
         cur.execute(
-            "INSERT INTO alerts (detection_id, alert_severity, alert_status) VALUES (%s,%s,%s);",
-            (detection_id, 'medium', 'pending')
+            "INSERT INTO alerts (detection_id, detection_timestamp, alert_severity, alert_status) VALUES (%s,%s,%s,%s);",
+            (detection_id, detected_at, 'medium', 'pending')
         )
         cur.execute("COMMIT;")
         print('Seeded sample post/detection/alert (post_id/detection_id):', post_id, detection_id)
 
 
-def list_pending_high_alerts(conn, minutes=30):
+def list_pending_high_alerts(conn, minutes=30, limit=50):
     with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute(
-            "SELECT a.alert_id, a.alert_severity, a.alert_timestamp, d.disaster_type, d.fused_confidence FROM alerts a JOIN disaster_detection d ON a.detection_id = d.detection_id WHERE a.alert_status = 'pending' AND a.alert_severity = 'high' AND a.alert_timestamp >= now() - interval '%s minutes' ORDER BY a.alert_timestamp DESC;" % minutes
-        )
+        cur.execute(PENDING_HIGH_ALERTS_SQL, {'minutes': minutes, 'limit': int(limit)})
         rows = cur.fetchall()
-        print(f"Pending high alerts in last {minutes} minutes: {len(rows)}")
+        print(f"Pending high alerts in last {minutes} minutes (newest {limit}): {len(rows)}")
         for r in rows:
             print(r)
 
 
 def create_partitions(conn, months_ahead=3):
-    now = datetime.datetime.utcnow()
-    with conn.cursor() as cur:
-        for i in range(months_ahead):
-            dt = now + datetime.timedelta(days=30 * i)
-            year = dt.year
-            month = dt.month
-            for parent in ('social_posts','disaster_detection','credibility_assessment'):
-                cur.execute("SELECT create_month_partition(%s, %s, %s);", (parent, year, month))
-        conn.commit()
-        print(f'Created partitions for next {months_ahead} months.')
+    # Delegates to the partition manager (calendar-month arithmetic, skips ranges that already exist)
+    for policy in default_policies():
+        policy.ahead = months_ahead if policy.granularity == 'month' else policy.ahead
+        ensure_partitions(conn, policy)
+    conn.commit()
+    print(f'Ensured partitions for the current and next {months_ahead} months.')
 
 
 if __name__ == '__main__':
@@ -1,6 +1,6 @@
 """Create the PostgreSQL database schema using SQLAlchemy models."""
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from models import Base  # relative import
@@ -14,6 +14,9 @@ def main():
     db_url = get_database_url()
     engine = create_engine(db_url, echo=False, future=True)
     print(f"Creating database schema on {db_url}")
+    with engine.begin() as conn:
+        # gin_trgm_ops for ix_social_posts_text_trgm
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
     Base.metadata.create_all(engine)
     print("Schema created successfully")
 
@@ -0,0 +1,27 @@
+"""
+Opaque keyset page cursors: the last row's (timestamp, id, ...) as a url-safe string.
+Shared by python/queries.py, python/geo.py (two ids) and the UI's alert API (UI Design/app.py); it has no dependencies, so the UI can use
+it without the database stack.
+"""
+import base64
+import uuid
+from datetime import datetime
+from typing import Callable, Tuple
+
+
+def encode_cursor(ts: datetime, *keys) -> str:
+    return base64.urlsafe_b64encode("|".join([ts.isoformat(), *map(str, keys)]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_type: Callable = uuid.UUID, keys: int = 1) -> Tuple:
+    """
+    Inverse of `encode_cursor`: (ts, id, ...) with each of the `keys` ids parsed by `key_type`; raises ValueError
+    for a malformed cursor.
+    """
+    try:
+        ts, *parts = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split("|")
+        if len(parts) != keys:
+            raise ValueError(f"expected {keys} keys, got {len(parts)}")
+        return (datetime.fromisoformat(ts), *(key_type(part) for part in parts))
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Invalid page cursor: {cursor!r}") from exc
@@ -0,0 +1,207 @@
+"""
+Export detections and credibility scores (or any partitioned table) to Parquet or CSV, one file per partition.
+- Each partition is read through a named (server-side) cursor in --chunk-size row chunks, and each chunk is
+  written as one Arrow record batch, so memory stays at about chunk-size rows per worker whatever the export size
+- Partitions are exported in parallel by worker processes, each with its own connection and a READ ONLY
+  REPEATABLE READ snapshot; partitions are read directly (no pruning over the parent)
+- Files go to <out>/<table>/<partition>.<format>, written to a temporary name and renamed when complete;
+  existing files are skipped unless --overwrite, so an interrupted export can be resumed
+- --since/--until select the partitions that overlap the window and filter rows inside them. When the window cuts
+  into a partition, its bounds are part of the file name (<partition>__<since>_<until>), so a file is only skipped
+  as existing if it was exported for the same rows
+Requires: pyarrow, psycopg2-binary
+Usage: python export.py --tables disaster_detection,credibility_assessment --since 2026-01-01 --out exports --workers 4
+"""
+import os
+import argparse
+import time
+from datetime import datetime, timezone
+from multiprocessing import Pool
+from typing import List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from partition_manager import get_conn, list_partitions, overlaps
+
+CHUNK_SIZE = 100_000
+FORMATS = ('parquet', 'csv')
+
+_UUID = pa.string()
+_TS = pa.timestamp('us', tz='UTC')
+
+# table -> (timestamp column, Arrow schema; field order is the SELECT order). Schemas cover every column,
+# since python/archive.py uses them for partitions that are dropped afterwards.
+EXPORTS = {
+    'disaster_detection': ('detection_timestamp', pa.schema([
+        ('detection_id', _UUID), ('post_id', _UUID), ('post_ingested_at', _TS), ('disaster_type', pa.string()),
+        ('text_confidence', pa.float64()), ('image_confidence', pa.float64()), ('fused_confidence', pa.float64()),
+        ('detection_timestamp', _TS),
+    ])),
+    'credibility_assessment': ('assessment_timestamp', pa.schema([
+        ('assessment_id', _UUID), ('post_id', _UUID), ('post_ingested_at', _TS), ('credibility_score', pa.float64()),
+        ('credibility_label', pa.string()), ('threshold_value', pa.float64()), ('assessment_timestamp', _TS),
+    ])),
+    'social_posts': ('ingestion_timestamp', pa.schema([
+        ('post_id', _UUID), ('source_platform', pa.string()), ('source_post_id', pa.string()),
+        ('ingestion_timestamp', _TS), ('text_content', pa.string()), ('image_reference', pa.string()),
+        ('processing_status', pa.string()), ('posted_at', _TS), ('language', pa.string()),
+    ])),
+    'alerts': ('alert_timestamp', pa.schema([
+        ('alert_id', _UUID), ('detection_id', _UUID), ('detection_timestamp', _TS), ('alert_severity', pa.string()), ('alert_timestamp', _TS),
+        ('alert_status', pa.string()), ('region', pa.string()), ('latitude', pa.float64()), ('longitude', pa.float64()),
+        ('ingested_at', _TS), ('dequeued_at', _TS), ('inferred_at', _TS),
+    ])),
+}
+
+
+def to_batch(rows: Sequence[tuple], schema: pa.Schema) -> pa.RecordBatch:
+    """One fetched chunk as a record batch (columns converted in bulk, UUIDs as text)."""
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    return pa.record_batch([pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema)
+
+
+def select_sql(partition: dict, table: str, since: Optional[datetime], until: Optional[datetime]):
+    column, schema = EXPORTS[table]
+    conditions, params = [], []
+    if since is not None:
+        conditions.append(f'{column} >= %s')
+        params.append(since)
+    if until is not None:
+        conditions.append(f'{column} < %s')
+        params.append(until)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+    return f'SELECT {", ".join(schema.names)} FROM "{partition["schema"]}"."{partition["name"]}"{where}', params
+
+
+def partitions_to_export(partitions: List[dict], since: Optional[datetime], until: Optional[datetime]) -> List[dict]:
+    window = (since or datetime.min.replace(tzinfo=timezone.utc), until or datetime.max.replace(tzinfo=timezone.utc))
+    # DEFAULT partitions (no range) may hold rows of any time, so they are always included
+    return [p for p in partitions if p['range'] is None or overlaps(p['range'], window)]
+
+
+def _stamp(ts: Optional[datetime], open_end: str) -> str:
+    if ts is None:
+        return open_end
+    ts = ts.astimezone(timezone.utc)
+    return ts.strftime('%Y%m%dT%H%M%S.%fZ' if ts.microsecond else '%Y%m%dT%H%M%SZ')
+
+
+def export_name(partition: dict, since: Optional[datetime], until: Optional[datetime]) -> str:
+    """File name (without extension): the partition name, plus the window bounds that fall inside the partition."""
+    lo, hi = partition['range'] or (None, None)
+    since = since if since is not None and (lo is None or since > lo) else None
+    until = until if until is not None and (hi is None or until < hi) else None
+    if since is None and until is None:
+        return partition['name']
+    return f"{partition['name']}__{_stamp(since, 'min')}_{_stamp(until, 'max')}"
+
+
+class _Writer:
+    """Parquet or CSV output with the same write/close interface."""
+
+    def __init__(self, path: str, schema: pa.Schema, fmt: str):
+        if fmt == 'parquet':
+            self._writer = pq.ParquetWriter(path, schema, compression='zstd')
+        else:
+            self._writer = pacsv.CSVWriter(path, schema)
+
+    def write(self, batch: pa.RecordBatch) -> None:
+        self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def export_partition(job) -> dict:
+    table, partition, out_dir, fmt, chunk_size, since, until, overwrite = job
+    path = os.path.join(out_dir, table, f"{export_name(partition, since, until)}.{fmt}")
+    if os.path.exists(path) and not overwrite:
+        return {'partition': partition['name'], 'rows': 0, 'bytes': 0, 'seconds': 0.0, 'skipped': True}
+
+    schema = EXPORTS[table][1]
+    sql, params = select_sql(partition, table, since, until)
+    tmp_path = path + '.tmp'
+    start = time.perf_counter()
+    rows = 0
+    conn = get_conn()
+    try:
+        # named cursors need a transaction (get_conn is autocommit)
+        conn.set_session(isolation_level='REPEATABLE READ', readonly=True, autocommit=False)
+        writer = _Writer(tmp_path, schema, fmt)
+        try:
+            with conn.cursor(name=f"export_{partition['name']}") as cur:
+                cur.itersize = chunk_size
+                cur.execute(sql, params)
+                while True:
+                    chunk = cur.fetchmany(chunk_size)
+                    if not chunk:
+                        break
+                    writer.write(to_batch(chunk, schema))
+                    rows += len(chunk)
+        finally:
+            writer.close()
+        conn.rollback()
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return {'partition': partition['name'], 'rows': rows, 'bytes': os.path.getsize(path), 'seconds': time.perf_counter() - start, 'skipped': False}
+
+
+def export(tables: Sequence[str], out_dir: str, fmt: str = 'parquet', workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE,
+           since: Optional[datetime] = None, until: Optional[datetime] = None, overwrite: bool = False) -> List[dict]:
+    conn = get_conn()
+    try:
+        jobs = []
+        for table in tables:
+            os.makedirs(os.path.join(out_dir, table), exist_ok=True)
+            for partition in partitions_to_export(list_partitions(conn, table), since, until):
+                jobs.append((table, partition, out_dir, fmt, chunk_size, since, until, overwrite))
+    finally:
+        conn.close()
+    # largest partitions first so a big one does not start last
+    jobs.sort(key=lambda job: job[1]['bytes'], reverse=True)
+
+    start = time.perf_counter()
+    results = []
+    with Pool(workers or min(len(jobs), os.cpu_count()) or 1) as pool:
+        for result in pool.imap_unordered(export_partition, jobs):
+            results.append(result)
+            if result['skipped']:
+                print(f"{result['partition']}: exists, skipped")
+            else:
+                rate = result['rows'] / max(result['seconds'], 1e-9)
+                print(f"{result['partition']}: {result['rows']:,} rows, {result['bytes'] / 1e6:,.1f} MB ({rate:,.0f} rows/s)")
+    total_rows = sum(r['rows'] for r in results)
+    total_bytes = sum(r['bytes'] for r in results)
+    elapsed = time.perf_counter() - start
+    print(f"Exported {total_rows:,} rows ({total_bytes / 1e6:,.1f} MB) from {len(jobs)} partitions in {elapsed:.1f}s "
+          f"({total_bytes / 1e6 / max(elapsed, 1e-9):,.1f} MB/s)")
+    return results
+
+
+def _timestamp(value: str) -> datetime:
+    ts = datetime.fromisoformat(value)
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tables', default='disaster_detection,credibility_assessment', help=f"comma-separated: {', '.join(EXPORTS)}")
+    parser.add_argument('--out', default='exports')
+    parser.add_argument('--format', choices=FORMATS, default='parquet')
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='rows per fetch and per record batch')
+    parser.add_argument('--since', type=_timestamp, default=None, help='ISO timestamp (UTC if no offset)')
+    parser.add_argument('--until', type=_timestamp, default=None)
+    parser.add_argument('--overwrite', action='store_true')
+    args = parser.parse_args()
+    unknown = set(args.tables.split(',')) - set(EXPORTS)
+    if unknown:
+        parser.error(f"unknown tables: {', '.join(sorted(unknown))}")
+    export(args.tables.split(','), args.out, args.format, args.workers, args.chunk_size, args.since, args.until, args.overwrite)
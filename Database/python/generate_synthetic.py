@@ -1,74 +1,209 @@
 """
 Generate synthetic social posts, credibility assessments, disaster detections, and alerts for load testing.
-Usage: python generate_synthetic.py --count 1000
+- Rows are built per chunk with vectorized NumPy draws, including the time-ordered UUIDv7 keys and streamed with COPY FROM STDIN (CSV)
+- Chunks are spread over worker processes; chunk i is always seeded from (--seed, i), so output does not
+  depend on the number of workers
+- Timestamps cover the ranges that have partitions in all four tables (python/partition_manager.py ensure);
+  each chunk gets its own contiguous time slice and is written in time order, like real ingestion
+Requires: numpy, psycopg2-binary
+Usage: python generate_synthetic.py --count 10000000 --workers 8 --seed 42
 """
 import os
+import io
 import argparse
-import random
-import uuid
-from datetime import datetime
+import time
+from multiprocessing import Pool
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
 import psycopg2
 
+from partition_manager import list_partitions
+
 DB_HOST = os.getenv('DB_HOST', 'localhost')
 DB_PORT = int(os.getenv('DB_PORT', 5432))
 DB_NAME = os.getenv('DB_NAME', 'rtmd')
 DB_USER = os.getenv('DB_USER', 'rtmd_user')
 DB_PASS = os.getenv('DB_PASS', 'change_me')
 
-SOURCES = ['twitter','instagram','facebook','telegram']
-DISASTERS = ['fire','flood','earthquake','storm']
+SOURCES = np.array(['twitter','instagram','facebook','telegram'])
+DISASTERS = np.array(['fire','flood','earthquake','storm'])
+
+CHUNK_SIZE = 100_000
+# Upper bound on post -> assessment/detection -> alert delays, kept clear of partition ends
+MAX_PIPELINE_DELAY_US = 60_000_000
+
+# Insert order satisfies the foreign keys (posts, then their assessments/detections, then alerts); children carry
+# the parent's partition timestamp (post_ingested_at, detection_timestamp) for the composite keys
+COLUMNS = {
+    'social_posts': ('post_id', 'source_platform', 'source_post_id', 'ingestion_timestamp', 'text_content', 'image_reference', 'processing_status'),
+    'credibility_assessment': ('assessment_id', 'post_id', 'post_ingested_at', 'credibility_score', 'credibility_label', 'threshold_value', 'assessment_timestamp'),
+    'disaster_detection': ('detection_id', 'post_id', 'post_ingested_at', 'disaster_type', 'text_confidence', 'image_confidence', 'fused_confidence', 'detection_timestamp'),
+    'alerts': ('alert_id', 'detection_id', 'detection_timestamp', 'alert_severity', 'alert_timestamp', 'alert_status'),
+}
+
+TimeRange = Tuple[int, int]  # [start, end) in microseconds since the epoch
+
 
 def get_conn():
     return psycopg2.connect(host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASS)
 
 
-def gen_text(i):
-    return f"Synthetic post #{i} - possible {random.choice(DISASTERS)} reported."
+def uuid4_hex(rng: np.random.Generator, n: int) -> np.ndarray:
+    """n random version-4 UUIDs as 32-digit hex strings (a form Postgres' uuid input accepts)."""
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return np.frombuffer(raw.tobytes().hex().encode(), dtype='S32').astype(str)
 
 
-def seed(count):
-    conn = get_conn()
-    cur = conn.cursor()
-    for i in range(count):
-        source = random.choice(SOURCES)
-        source_post_id = str(uuid.uuid4())
-        text = gen_text(i)
-        image_ref = None
-        status = 'processed'
-        cur.execute("INSERT INTO social_posts (post_id, source_platform, source_post_id, text_content, image_reference, processing_status) VALUES (gen_random_uuid(), %s, %s, %s, %s, %s) RETURNING post_id;", (source, source_post_id, text, image_ref, status))
-        post_id = cur.fetchone()[0]
-        # credibility
-        score = round(random.random(), 2)
-        label = 'credible' if score > 0.6 else ('questionable' if score > 0.25 else 'misinformation')
-        threshold = 0.5
-        cur.execute("INSERT INTO credibility_assessment (assessment_id, post_id, credibility_score, credibility_label, threshold_value) VALUES (gen_random_uuid(), %s, %s, %s, %s);", (post_id, score, label, threshold))
-        # detection
-        dtype = random.choice(DISASTERS)
-        tconf = round(random.random(), 2)
-        iconf = round(random.random(), 2)
-        fused = round((tconf + iconf) / 2, 2)
-        cur.execute("INSERT INTO disaster_detection (detection_id, post_id, disaster_type, text_confidence, image_confidence, fused_confidence) VALUES (gen_random_uuid(), %s, %s, %s, %s, %s) RETURNING detection_id;", (post_id, dtype, tconf, iconf, fused))
-        detection_id = cur.fetchone()[0]
-        if fused > 0.75:
-            sev = 'high'
-            status = 'pending'
-        elif fused > 0.5:
-            sev = 'medium'
-            status = 'pending'
+def uuid7_hex(rng: np.random.Generator, us: np.ndarray) -> np.ndarray:
+    """Version-7 UUIDs (hex) for row times `us` (microseconds): time-ordered like the keys python/ids.py generates."""
+    raw = rng.integers(0, 256, size=(len(us), 16), dtype=np.uint8)
+    ms = (np.asarray(us, dtype=np.int64) // 1000).astype('>u8')
+    raw[:, :6] = ms.view(np.uint8).reshape(-1, 8)[:, 2:]
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x70
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return np.frombuffer(raw.tobytes().hex().encode(), dtype='S32').astype(str)
+
+
+def covered_ranges(conn) -> List[TimeRange]:
+    """Time ranges that have a partition in every table, merged and sorted."""
+    ranges = None
+    for table in COLUMNS:
+        table_ranges = [(_us(p['range'][0]), _us(p['range'][1])) for p in list_partitions(conn, table) if p['range']]
+        ranges = table_ranges if ranges is None else _intersect(ranges, table_ranges)
+    return _merge(ranges or [])
+
+
+def _us(dt) -> int:
+    return int(dt.timestamp() * 1_000_000)
+
+
+def _intersect(a: Sequence[TimeRange], b: Sequence[TimeRange]) -> List[TimeRange]:
+    return [(max(a0, b0), min(a1, b1)) for a0, a1 in a for b0, b1 in b if max(a0, b0) < min(a1, b1)]
+
+
+def _merge(ranges: Sequence[TimeRange]) -> List[TimeRange]:
+    merged: List[TimeRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
         else:
-            sev = 'low'
-            status = 'suppressed'
-        cur.execute("INSERT INTO alerts (alert_id, detection_id, alert_severity, alert_status) VALUES (gen_random_uuid(), %s, %s, %s);", (detection_id, sev, status))
-        if i % 500 == 0:
-            conn.commit()
-    conn.commit()
-    cur.close()
-    conn.close()
-    print(f"Seeded {count} synthetic posts.")
+            merged.append((start, end))
+    return merged
+
+
+def chunk_timestamps(rng: np.random.Generator, ranges: Sequence[TimeRange], chunk: int, chunks: int, n: int) -> np.ndarray:
+    """Sorted ingestion times (us) for one chunk, drawn from the chunk's slice of the usable time axis.
+
+    The usable axis is the concatenation of `ranges`, each shortened by the maximum pipeline delay so
+    derived timestamps stay inside the same partitions.
+    """
+    usable = [(start, end - MAX_PIPELINE_DELAY_US) for start, end in ranges if end - start > MAX_PIPELINE_DELAY_US]
+    if not usable:
+        raise ValueError('No partition range is long enough; run python/partition_manager.py ensure first')
+    lengths = np.array([end - start for start, end in usable], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    span = offsets[-1]
+    lo, hi = span * chunk // chunks, span * (chunk + 1) // chunks
+    axis = np.sort(rng.integers(lo, max(hi, lo + 1), size=n, dtype=np.int64))
+    which = np.searchsorted(offsets, axis, side='right') - 1
+    starts = np.array([start for start, _ in usable], dtype=np.int64)
+    return starts[which] + (axis - offsets[which])
+
+
+def _ts(us: np.ndarray) -> np.ndarray:
+    return np.datetime_as_string(us.astype('datetime64[us]'), unit='us', timezone='UTC')
+
+
+def _delay(rng: np.random.Generator, mean_seconds: float, n: int) -> np.ndarray:
+    return np.minimum(rng.exponential(mean_seconds * 1_000_000, n), MAX_PIPELINE_DELAY_US / 3).astype(np.int64)
+
+
+def _csv(*columns) -> str:
+    # No generated value contains a comma, quote or newline, so plain joining is valid CSV
+    return '\n'.join(map(','.join, zip(*columns))) + '\n'
+
+
+def build_chunk(chunk: int, first: int, n: int, random_seed: int, ranges: Sequence[TimeRange], chunks: int) -> Dict[str, str]:
+    """CSV text per table for posts first..first+n-1; identical for the same arguments."""
+    rng = np.random.default_rng([random_seed, chunk])
+
+    ingested = chunk_timestamps(rng, ranges, chunk, chunks, n)
+    post_ids = uuid7_hex(rng, ingested)
+    sources = SOURCES[rng.integers(0, len(SOURCES), n)]
+    mentioned = DISASTERS[rng.integers(0, len(DISASTERS), n)]
+    numbers = np.arange(first, first + n).astype(str)
+    texts = [f'Synthetic post #{i} - possible {d} reported.' for i, d in zip(numbers, mentioned)]
+    has_image = rng.random(n) < 0.3
+    images = np.where(has_image, np.char.add('https://blob.example.org/img/', numbers), '')
+    ingested_ts = _ts(ingested)
+    posts = _csv(post_ids, sources, uuid4_hex(rng, n), ingested_ts, texts, images, np.full(n, 'processed'))
+
+    score = np.round(rng.random(n), 2)
+    label = np.where(score > 0.6, 'credible', np.where(score > 0.25, 'questionable', 'misinformation'))
+    assessed = ingested + _delay(rng, 2.0, n)
+    credibility = _csv(uuid7_hex(rng, assessed), post_ids, ingested_ts, score.astype(str), label, np.full(n, '0.5'), _ts(assessed))
+
+    dtype = DISASTERS[rng.integers(0, len(DISASTERS), n)]
+    tconf = np.round(rng.random(n), 2)
+    iconf = np.round(rng.random(n), 2)
+    fused = np.round((tconf + iconf) / 2, 2)
+    detected = ingested + _delay(rng, 3.0, n)
+    detection_ids = uuid7_hex(rng, detected)
+    detected_ts = _ts(detected)
+    detections = _csv(detection_ids, post_ids, ingested_ts, dtype, tconf.astype(str), iconf.astype(str), fused.astype(str), detected_ts)
+
+    severity = np.where(fused > 0.75, 'high', np.where(fused > 0.5, 'medium', 'low'))
+    status = np.where(fused > 0.5, 'pending', 'suppressed')
+    alerted = detected + _delay(rng, 1.0, n)
+    alerts = _csv(uuid7_hex(rng, alerted), detection_ids, detected_ts, severity, _ts(alerted), status)
+
+    return {'social_posts': posts, 'credibility_assessment': credibility, 'disaster_detection': detections, 'alerts': alerts}
+
+
+_worker_conn = None
+
+
+def _init_worker():
+    global _worker_conn
+    _worker_conn = get_conn()
+
+
+def _copy_chunk(job) -> int:
+    chunk, first, size, random_seed, ranges, chunks = job
+    data = build_chunk(chunk, first, size, random_seed, ranges, chunks)
+    with _worker_conn.cursor() as cur:
+        for table, columns in COLUMNS.items():
+            cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", io.StringIO(data[table]))
+    _worker_conn.commit()
+    return size
+
+
+def seed(count, workers=None, random_seed=0, chunk_size=CHUNK_SIZE):
+    conn = get_conn()
+    try:
+        ranges = covered_ranges(conn)
+    finally:
+        conn.close()
+    chunks = max(1, -(-count // chunk_size))
+    jobs = [(i, i * chunk_size, min(chunk_size, count - i * chunk_size), random_seed, ranges, chunks) for i in range(chunks)]
+    start = time.perf_counter()
+    done = 0
+    with Pool(workers or os.cpu_count(), initializer=_init_worker) as pool:
+        for rows in pool.imap_unordered(_copy_chunk, jobs):
+            done += rows
+            elapsed = time.perf_counter() - start
+            print(f"{done}/{count} posts ({done / elapsed * 60:,.0f} posts/min)")
+    print(f"Seeded {count} synthetic posts in {time.perf_counter() - start:.1f}s.")
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed; same seed and count give the same rows')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
     args = parser.parse_args()
-    seed(args.count)
+    seed(args.count, args.workers, args.seed, args.chunk_size)
@@ -0,0 +1,147 @@
+"""
+Spatial queries on locations (ORM tables locations / disaster_location / disasters) without PostGIS.
+- A viewport (bounding box) is covered by at most GEO_MAX_CELLS geohash cells at the finest precision that fits;
+  cells that are adjacent in geohash order are merged, and each run becomes one range on locations.geohash
+  (ix_locations_geohash, "C" collation), followed by an exact latitude/longitude check
+- `disasters_in_viewport` returns disaster markers (one row per disaster and location) newest first, keyset-paginated
+  on (date_time, disaster_id, location_id). At national zoom the planner can walk ix_disasters_date_time and stop after
+  one page; zoomed in, it starts from the few matching geohash ranges
+- `locations_within_radius` uses the bounding box of the circle, then an exact haversine distance
+
+Run: python -m python.geo 5.9 79.5 9.9 81.9 --limit 20
+"""
+import argparse
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+
+from python import cursors, geohash
+from python.cursors import encode_cursor
+from python.queries import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
+
+GEO_MAX_CELLS = 24
+_MAX_PRECISION = 9  # models.GEOHASH_PRECISION
+
+
+def _cell_value(cell: str) -> int:
+    value = 0
+    for c in cell:
+        value = value * 32 + geohash._DECODE[c]
+    return value
+
+
+def cover(min_lat: float, min_lng: float, max_lat: float, max_lng: float, max_cells: int = GEO_MAX_CELLS) -> List[Tuple[str, str]]:
+    """Geohash ranges [lo, hi) covering the box: strings from `lo` up to, excluding, `hi` (in "C" order)."""
+    precision = 1
+    while precision < _MAX_PRECISION and geohash.count_cells_in_bbox(min_lat, min_lng, max_lat, max_lng, precision + 1) <= max_cells:
+        precision += 1
+    cells = sorted(geohash.cells_in_bbox(min_lat, min_lng, max_lat, max_lng, precision))
+    runs: List[List[str]] = []
+    for cell in cells:
+        if runs and _cell_value(cell) == _cell_value(runs[-1][-1]) + 1:
+            runs[-1].append(cell)
+        else:
+            runs.append([cell])
+    # '~' sorts after every geohash character, so "<last>~" bounds all cells with the prefix <last>
+    return [(run[0], run[-1] + "~") for run in runs]
+
+
+def _viewport_conditions(ranges: Sequence[Tuple[str, str]], params: Dict) -> List[str]:
+    clauses = []
+    for i, (lo, hi) in enumerate(ranges):
+        params[f"gh_lo{i}"], params[f"gh_hi{i}"] = lo, hi
+        clauses.append(f"(l.geohash >= :gh_lo{i} AND l.geohash < :gh_hi{i})")
+    return [
+        f"({' OR '.join(clauses)})",
+        "l.latitude BETWEEN :min_lat AND :max_lat",
+        "l.longitude BETWEEN :min_lng AND :max_lng",
+    ]
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID, uuid.UUID]:
+    """(date_time, disaster_id, location_id) of a marker page cursor (`encode_cursor(ts, disaster_id, location_id)`)."""
+    return cursors.decode_cursor(cursor, keys=2)
+
+
+def build_viewport_sql(ranges: Sequence[Tuple[str, str]], params: Dict, since: bool, disaster_type: bool, after: bool):
+    conditions = _viewport_conditions(ranges, params)
+    if since:
+        conditions.append("d.date_time >= :since")
+    if disaster_type:
+        conditions.append("d.disaster_type = :disaster_type")
+    if after:
+        conditions.append(
+            "d.date_time <= :cursor_ts AND (d.date_time, d.disaster_id, l.location_id) < (:cursor_ts, :cursor_disaster, :cursor_location)"
+        )
+    return text(
+        f"""
+        SELECT d.disaster_id, d.disaster_type, d.severity, d.confidence_score, d.date_time, d.status,
+               l.location_id, l.name, l.district, l.latitude, l.longitude
+        FROM disasters d
+        JOIN disaster_location dl ON dl.disaster_id = d.disaster_id
+        JOIN locations l ON l.location_id = dl.location_id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY d.date_time DESC, d.disaster_id DESC, l.location_id DESC
+        LIMIT :limit
+        """
+    )
+
+
+def disasters_in_viewport(session, min_lat: float, min_lng: float, max_lat: float, max_lng: float, since: Optional[datetime] = None,
+                          disaster_type: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+    """Disaster markers inside the box, newest first. Boxes crossing the antimeridian are not supported."""
+    if min_lat > max_lat or min_lng > max_lng:
+        raise ValueError("Viewport minimums must not exceed maximums")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    params = {"min_lat": min_lat, "max_lat": max_lat, "min_lng": min_lng, "max_lng": max_lng, "limit": limit + 1}
+    if since is not None:
+        params["since"] = since
+    if disaster_type:
+        params["disaster_type"] = disaster_type
+    if cursor:
+        params["cursor_ts"], params["cursor_disaster"], params["cursor_location"] = decode_cursor(cursor)
+    sql = build_viewport_sql(cover(min_lat, min_lng, max_lat, max_lng), params, since is not None, bool(disaster_type), bool(cursor))
+    rows = [dict(r) for r in session.execute(sql, params).mappings()]
+    if len(rows) <= limit:
+        return Page(rows, None)
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(rows, encode_cursor(last["date_time"], last["disaster_id"], last["location_id"]))
+
+
+def locations_within_radius(session, lat: float, lng: float, radius_km: float, limit: int = MAX_PAGE_SIZE) -> List[dict]:
+    """Locations within `radius_km` of a point, nearest first, with `distance_km`."""
+    min_lat, min_lng, max_lat, max_lng = geohash.radius_bbox(lat, lng, radius_km)
+    params = {"min_lat": min_lat, "max_lat": max_lat, "min_lng": min_lng, "max_lng": max_lng}
+    conditions = _viewport_conditions(cover(min_lat, min_lng, max_lat, max_lng), params)
+    rows = session.execute(
+        text(f"SELECT l.location_id, l.name, l.district, l.latitude, l.longitude FROM locations l WHERE {' AND '.join(conditions)}"),
+        params,
+    ).mappings()
+    found = []
+    for row in rows:
+        distance = geohash.haversine_km(lat, lng, row["latitude"], row["longitude"])
+        if distance <= radius_km:
+            found.append(dict(row, distance_km=round(distance, 3)))
+    return sorted(found, key=lambda r: r["distance_km"])[:limit]
+
+
+if __name__ == "__main__":
+    from python.db import get_session
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bbox", nargs=4, type=float, metavar=("MIN_LAT", "MIN_LNG", "MAX_LAT", "MAX_LNG"))
+    parser.add_argument("--limit", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--type", dest="disaster_type")
+    parser.add_argument("--cursor")
+    args = parser.parse_args()
+    session = get_session(readonly=True)
+    try:
+        page = disasters_in_viewport(session, *args.bbox, disaster_type=args.disaster_type, limit=args.limit, cursor=args.cursor)
+        for row in page.rows:
+            print(f"{row['date_time']:%Y-%m-%d %H:%M} {row['disaster_type']:<12} {row['name']} ({row['latitude']:.4f}, {row['longitude']:.4f})")
+        print("next cursor:", page.next_cursor)
+    finally:
+        session.close()
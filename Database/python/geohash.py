@@ -0,0 +1,132 @@
+"""Geohash helpers (pure Python, no PostGIS needed).
+
+Used by the dispatcher's subscriber geofence index and for bounding-box/radius lookups on coordinates.
+"""
+import math
+from typing import Iterable, List, Optional, Set, Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(_BASE32)}
+
+EARTH_RADIUS_KM = 6371.0088
+
+Bounds = Tuple[float, float, float, float]
+
+
+def encode(lat: float, lng: float, precision: int = 6) -> str:
+    """Geohash of a point at `precision` characters."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits, lng_lo = (bits << 1) | 1, mid
+            else:
+                bits, lng_hi = bits << 1, mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits, lat_lo = (bits << 1) | 1, mid
+            else:
+                bits, lat_hi = bits << 1, mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def bounds(cell: str) -> Bounds:
+    """(min_lat, min_lng, max_lat, max_lng) of a geohash cell."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    even = True
+    for c in cell:
+        value = _DECODE[c]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                lng_lo, lng_hi = (mid, lng_hi) if bit else (lng_lo, mid)
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+            even = not even
+    return lat_lo, lng_lo, lat_hi, lng_hi
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(degrees latitude, degrees longitude) spanned by one cell at `precision`."""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def children(cell: str, cell_bounds: Optional[Bounds] = None) -> List[Tuple[str, Bounds]]:
+    """The 32 cells one precision level below `cell`, each with its bounds.
+
+    Child bounds are refined from the parent's (5 bits each) instead of decoding every child from scratch.
+    """
+    lat_lo, lng_lo, lat_hi, lng_hi = cell_bounds or bounds(cell)
+    lng_first = (5 * len(cell)) % 2 == 0
+    out = []
+    for value, c in enumerate(_BASE32):
+        b_lat_lo, b_lng_lo, b_lat_hi, b_lng_hi = lat_lo, lng_lo, lat_hi, lng_hi
+        even = lng_first
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (b_lng_lo + b_lng_hi) / 2
+                b_lng_lo, b_lng_hi = (mid, b_lng_hi) if bit else (b_lng_lo, mid)
+            else:
+                mid = (b_lat_lo + b_lat_hi) / 2
+                b_lat_lo, b_lat_hi = (mid, b_lat_hi) if bit else (b_lat_lo, mid)
+            even = not even
+        out.append((cell + c, (b_lat_lo, b_lng_lo, b_lat_hi, b_lng_hi)))
+    return out
+
+
+def _steps(lo: float, hi: float, step: float) -> Iterable[float]:
+    value = lo
+    while value < hi:
+        yield value
+        value += step
+    yield hi
+
+
+def cells_in_bbox(min_lat: float, min_lng: float, max_lat: float, max_lng: float, precision: int) -> Set[str]:
+    """All cells at `precision` that intersect the bounding box."""
+    dlat, dlng = cell_size(precision)
+    return {
+        encode(lat, lng, precision)
+        for lat in _steps(max(min_lat, -90.0), min(max_lat, 90.0), dlat)
+        for lng in _steps(max(min_lng, -180.0), min(max_lng, 180.0), dlng)
+    }
+
+
+def count_cells_in_bbox(min_lat: float, min_lng: float, max_lat: float, max_lng: float, precision: int) -> int:
+    """Upper bound on len(cells_in_bbox(...)) without enumerating them."""
+    dlat, dlng = cell_size(precision)
+    return (int((max_lat - min_lat) / dlat) + 2) * (int((max_lng - min_lng) / dlng) + 2)
+
+
+def radius_bbox(lat: float, lng: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """Bounding box enclosing a circle of `radius_km` around a point."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    dlng = min(180.0, dlat / cos_lat)
+    return lat - dlat, lng - dlng, lat + dlat, lng + dlng
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
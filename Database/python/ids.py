@@ -0,0 +1,50 @@
+"""Time-ordered UUIDv7 keys (RFC 9562).
+
+48-bit Unix milliseconds, then 74 random bits, with the version/variant bits set. Keys generated later sort
+later, so inserts append at the right edge of the primary key B-tree instead of landing on random leaves.
+Within one millisecond the 12-bit rand_a field is used as a counter, so keys from this process are strictly
+increasing. The SQL counterpart is uuid_generate_v7() in schema.sql.
+"""
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7_from_parts(unix_ms: int, rand_a: int, rand_b: int) -> uuid.UUID:
+    """Assemble a UUIDv7 from a millisecond timestamp, 12 bits of rand_a and 62 bits of rand_b."""
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76
+    value |= (rand_a & 0xFFF) << 64
+    value |= 0b10 << 62
+    value |= rand_b & 0x3FFF_FFFF_FFFF_FFFF
+    return uuid.UUID(int=value)
+
+
+def uuid7(unix_ms: Optional[int] = None) -> uuid.UUID:
+    """A new UUIDv7; monotonic per process when `unix_ms` is not given."""
+    global _last_ms, _counter
+    # 80 random bits: the low 62 for rand_b, the top 12 for rand_a (no bit is used twice)
+    rand = int.from_bytes(os.urandom(10), "big")
+    rand_a, rand_b = rand >> 68, rand & 0x3FFF_FFFF_FFFF_FFFF
+    if unix_ms is not None:
+        return uuid7_from_parts(unix_ms, rand_a, rand_b)
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms, _counter = now_ms, rand_a >> 1  # random start, half the range left for counting
+        else:
+            _counter += 1
+            if _counter > 0xFFF:  # counter exhausted: borrow the next millisecond
+                _last_ms, _counter = _last_ms + 1, 0
+        return uuid7_from_parts(_last_ms, _counter, rand_b)
+
+
+def uuid7_time(key: uuid.UUID) -> float:
+    """Creation time (Unix seconds) encoded in a UUIDv7."""
+    return (key.int >> 80) / 1000.0
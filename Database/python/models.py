@@ -1,12 +1,22 @@
 """SQLAlchemy ORM models for RTMD project.
 
 Defines tables and relationships for:
-- SocialMediaPost, Disaster, User, Result, Location, Credibility, DataStream
+- SocialMediaPost, Disaster, User, Result, Location, Credibility, DataStream, Subscription
 - Association tables: disaster_location, user_result
 
+Locations carry coordinates and a geohash cell id for viewport/radius queries without PostGIS (python/geo.py).
+
+Insert-heavy tables (posts, results, credibility, disasters) get time-ordered UUIDv7 keys (python/ids.py).
+
+Also maps the time-partitioned tables of schema.sql (social_posts, credibility_assessment, disaster_detection,
+alerts) used by the real-time services: Post, CredibilityAssessment, DisasterDetection, Alert. Their keys are
+(id, partition timestamp) and their foreign keys are composite, so a lookup or join on the full key touches one
+partition. They have their own metadata (PartitionedBase): the tables and their partitions are created by the SQL
+migrations (migrations/V*.sql), not by create_all or Alembic.
+
 Run: used by create_db.py and seed_data.py
 """
-from datetime import datetime
+from datetime import datetime, timezone
 import enum
 import uuid
 
@@ -18,15 +28,30 @@ from sqlalchemy import (
     Float,
     Boolean,
     ForeignKey,
+    ForeignKeyConstraint,
     Table,
     CheckConstraint,
     Index,
     UniqueConstraint,
+    Computed,
+    event,
+    func,
+    FetchedValue,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import declarative_base, relationship
 
+try:
+    from python.geohash import encode as geohash_encode
+    from python.ids import uuid7
+except ImportError:  # run as a script from python/ (create_db.py, seed_data.py)
+    from geohash import encode as geohash_encode
+    from ids import uuid7
+
+GEOHASH_PRECISION = 9  # ~5 m cells; coarser cells are prefixes
+
 Base = declarative_base()
+PartitionedBase = declarative_base()
 
 
 class DisasterStatus(enum.Enum):
@@ -83,7 +108,8 @@ class DataStream(Base):
     # Optional pointer to last processed post
     last_post_id = Column(UUID(as_uuid=True), ForeignKey("social_media_posts.post_id", ondelete="SET NULL"), nullable=True)
 
-    posts = relationship("SocialMediaPost", back_populates="data_stream")
+    # posts.data_stream_id, not last_post_id (the second foreign key between the two tables)
+    posts = relationship("SocialMediaPost", back_populates="data_stream", foreign_keys="SocialMediaPost.data_stream_id")
 
     def __repr__(self):
         return f"<DataStream(id={self.stream_id} platform={self.source_platform})>"
@@ -92,8 +118,10 @@ class DataStream(Base):
 class SocialMediaPost(Base):
     __tablename__ = "social_media_posts"
 
-    post_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    post_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     post_text = Column(Text, nullable=True)
+    # Full-text search (python/search.py); maintained by Postgres
+    post_text_search = Column(TSVECTOR, Computed("to_tsvector('english', coalesce(post_text, ''))", persisted=True))
     post_image = Column(String(512), nullable=True)
     language = Column(String(8), nullable=True, index=True)
     platform = Column(String(64), nullable=False, index=True)
@@ -110,7 +138,7 @@ class SocialMediaPost(Base):
 
     # Data stream relationship (1:N: DataStream -> SocialMediaPost)
     data_stream_id = Column(UUID(as_uuid=True), ForeignKey("data_streams.stream_id", ondelete="SET NULL"), nullable=True, index=True)
-    data_stream = relationship("DataStream", back_populates="posts")
+    data_stream = relationship("DataStream", back_populates="posts", foreign_keys=[data_stream_id])
 
     def __repr__(self):
         return f"<Post(id={self.post_id} platform={self.platform} ts={self.timestamp})>"
@@ -119,7 +147,7 @@ class SocialMediaPost(Base):
 class Disaster(Base):
     __tablename__ = "disasters"
 
-    disaster_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    disaster_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     disaster_type = Column(String(64), nullable=False, index=True)
     severity = Column(String(32), nullable=True)
     confidence_score = Column(Float, nullable=False)
@@ -150,6 +178,7 @@ class User(Base):
     role = Column(String(64), nullable=False, default="analyst")
 
     results = relationship("Result", secondary=user_result, back_populates="users")
+    subscriptions = relationship("Subscription", back_populates="user", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<User(id={self.user_id} email={self.email})>"
@@ -158,7 +187,7 @@ class User(Base):
 class Result(Base):
     __tablename__ = "results"
 
-    result_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    result_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
 
     # Foreign key to the originating post
     post_id = Column(UUID(as_uuid=True), ForeignKey("social_media_posts.post_id", ondelete="CASCADE"), nullable=False, index=True)
@@ -187,9 +216,19 @@ class Location(Base):
     name = Column(String(128), nullable=False)
     district = Column(String(128), nullable=True)
     province = Column(String(128), nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    # Geohash of (latitude, longitude), set on insert/update; "C" collation so a B-tree serves prefix ranges (python/geo.py)
+    geohash = Column(String(GEOHASH_PRECISION, collation="C"), nullable=True)
 
     disasters = relationship("Disaster", secondary=disaster_location, back_populates="locations")
 
+    __table_args__ = (
+        CheckConstraint("latitude IS NULL OR latitude BETWEEN -90 AND 90", name="ck_location_latitude_range"),
+        CheckConstraint("longitude IS NULL OR longitude BETWEEN -180 AND 180", name="ck_location_longitude_range"),
+        CheckConstraint("(latitude IS NULL) = (longitude IS NULL)", name="ck_location_coordinates_pair"),
+    )
+
     def __repr__(self):
         return f"<Location(id={self.location_id} name={self.name})>"
 
@@ -197,7 +236,7 @@ class Location(Base):
 class Credibility(Base):
     __tablename__ = "credibility"
 
-    credibility_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    credibility_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     post_id = Column(UUID(as_uuid=True), ForeignKey("social_media_posts.post_id", ondelete="CASCADE"), nullable=False, index=True)
     post = relationship("SocialMediaPost", back_populates="credibility")
 
@@ -213,7 +252,186 @@ class Credibility(Base):
         return f"<Credibility(id={self.credibility_id} score={self.score})>"
 
 
+class Subscription(Base):
+    """Alert routing rule for a user: which disasters/severities, where, and how to notify.
+
+    The geofence is either a circle (center_lat/center_lng/radius_km) or a polygon given as
+    [[lat, lng], ...]; with neither the subscription matches alerts anywhere. NULL disaster_types or
+    severities match all values. Deactivate instead of deleting so the dispatcher's incremental
+    index sync (keyed on updated_at) sees the change. updated_at is set by the database on every insert and
+    update, including raw SQL (trigger trg_subscriptions_touch, Alembic 0008), not by the client clock.
+    """
+    __tablename__ = "subscriptions"
+
+    subscription_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False, index=True)
+    user = relationship("User", back_populates="subscriptions")
+
+    channel = Column(String(32), nullable=False)  # matches a dispatcher channel name: 'webhook' (incl. SMS gateways) or 'email'
+    target = Column(String(512), nullable=False)  # URL or email address
+    disaster_types = Column(ARRAY(String(64)), nullable=True)
+    severities = Column(ARRAY(String(16)), nullable=True)
+
+    center_lat = Column(Float, nullable=True)
+    center_lng = Column(Float, nullable=True)
+    radius_km = Column(Float, nullable=True)
+    polygon = Column(JSONB, nullable=True)
+
+    active = Column(Boolean, nullable=False, default=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue(), index=True)
+
+    __table_args__ = (
+        CheckConstraint("radius_km IS NULL OR radius_km > 0", name="ck_subscription_radius_positive"),
+    )
+
+    def __repr__(self):
+        return f"<Subscription(id={self.subscription_id} user={self.user_id} channel={self.channel})>"
+
+
+# Partitioned tables (schema.sql). Timestamps that are part of a key are set client-side, so the full key is known
+# before the INSERT and the row is written straight to its partition.
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+class Post(PartitionedBase):
+    __tablename__ = "social_posts"
+
+    post_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    ingestion_timestamp = Column(DateTime(timezone=True), primary_key=True, default=_utcnow)
+    source_platform = Column(Text, nullable=False)
+    source_post_id = Column(Text, nullable=True)
+    posted_at = Column(DateTime(timezone=True), nullable=True)
+    language = Column(Text, nullable=True)
+    text_content = Column(Text, nullable=True)
+    image_reference = Column(Text, nullable=True)
+    processing_status = Column(Text, nullable=False, default="queued")
+    text_search = Column(TSVECTOR, Computed("to_tsvector('english', coalesce(text_content, ''))", persisted=True))
+
+    assessments = relationship("CredibilityAssessment", back_populates="post", passive_deletes=True)
+    detections = relationship("DisasterDetection", back_populates="post", passive_deletes=True)
+
+    __table_args__ = (
+        CheckConstraint(
+            "processing_status IN ('raw','queued','processing','processed','failed')", name="social_posts_processing_status_check"
+        ),
+        {"postgresql_partition_by": "RANGE (ingestion_timestamp)"},
+    )
+
+    def __repr__(self):
+        return f"<Post(id={self.post_id} platform={self.source_platform} ts={self.ingestion_timestamp})>"
+
+
+class CredibilityAssessment(PartitionedBase):
+    __tablename__ = "credibility_assessment"
+
+    assessment_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    assessment_timestamp = Column(DateTime(timezone=True), primary_key=True, default=_utcnow)
+    post_id = Column(UUID(as_uuid=True), nullable=False)
+    post_ingested_at = Column(DateTime(timezone=True), nullable=False)  # the post's partition key
+    credibility_score = Column(Float, nullable=False)
+    credibility_label = Column(Text, nullable=False)
+    threshold_value = Column(Float, nullable=False)
+
+    post = relationship("Post", back_populates="assessments")
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["post_id", "post_ingested_at"], ["social_posts.post_id", "social_posts.ingestion_timestamp"],
+            ondelete="CASCADE", name="credibility_assessment_post_fkey",
+        ),
+        CheckConstraint("credibility_score >= 0 AND credibility_score <= 1", name="credibility_assessment_credibility_score_check"),
+        CheckConstraint(
+            "credibility_label IN ('credible','questionable','misinformation')", name="credibility_assessment_credibility_label_check"
+        ),
+        {"postgresql_partition_by": "RANGE (assessment_timestamp)"},
+    )
+
+    def __repr__(self):
+        return f"<CredibilityAssessment(id={self.assessment_id} post={self.post_id} score={self.credibility_score})>"
+
+
+class DisasterDetection(PartitionedBase):
+    __tablename__ = "disaster_detection"
+
+    detection_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    detection_timestamp = Column(DateTime(timezone=True), primary_key=True, default=_utcnow)
+    post_id = Column(UUID(as_uuid=True), nullable=False)
+    post_ingested_at = Column(DateTime(timezone=True), nullable=False)
+    disaster_type = Column(Text, nullable=False)
+    text_confidence = Column(Float, nullable=False)
+    image_confidence = Column(Float, nullable=False)
+    fused_confidence = Column(Float, nullable=False)
+
+    post = relationship("Post", back_populates="detections")
+    alerts = relationship("Alert", back_populates="detection", passive_deletes=True)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["post_id", "post_ingested_at"], ["social_posts.post_id", "social_posts.ingestion_timestamp"],
+            ondelete="CASCADE", name="disaster_detection_post_fkey",
+        ),
+        CheckConstraint("fused_confidence >= 0 AND fused_confidence <= 1", name="disaster_detection_fused_confidence_check"),
+        {"postgresql_partition_by": "RANGE (detection_timestamp)"},
+    )
+
+    def __repr__(self):
+        return f"<DisasterDetection(id={self.detection_id} type={self.disaster_type} conf={self.fused_confidence})>"
+
+
+class Alert(PartitionedBase):
+    """An alert row. Rows are never updated: later states go to alert_state_log, and a trigger files new
+    'pending' alerts in alert_pending for the dispatcher (real_time/alert_dispatcher.py)."""
+    __tablename__ = "alerts"
+
+    alert_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    alert_timestamp = Column(DateTime(timezone=True), primary_key=True, default=_utcnow)
+    detection_id = Column(UUID(as_uuid=True), nullable=False)
+    detection_timestamp = Column(DateTime(timezone=True), nullable=False)  # the detection's partition key
+    alert_severity = Column(Text, nullable=False)
+    alert_status = Column(Text, nullable=False, default="pending")
+    region = Column(Text, nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    # pipeline timestamps for real_time/latency_exporter.py
+    ingested_at = Column(DateTime(timezone=True), nullable=True)
+    dequeued_at = Column(DateTime(timezone=True), nullable=True)
+    inferred_at = Column(DateTime(timezone=True), nullable=True)
+
+    detection = relationship("DisasterDetection", back_populates="alerts")
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["detection_id", "detection_timestamp"], ["disaster_detection.detection_id", "disaster_detection.detection_timestamp"],
+            ondelete="CASCADE", name="alerts_detection_fkey",
+        ),
+        CheckConstraint("alert_severity IN ('low','medium','high')", name="alerts_alert_severity_check"),
+        {"postgresql_partition_by": "RANGE (alert_timestamp)"},
+    )
+
+    def __repr__(self):
+        return f"<Alert(id={self.alert_id} severity={self.alert_severity} ts={self.alert_timestamp})>"
+
+
 # Additional indexes for common queries
 Index("ix_results_post_confidence", Result.post_id, Result.confidence_score)
 Index("ix_disasters_date_time", Disaster.date_time)
 Index("ix_social_posts_ts_platform", SocialMediaPost.timestamp, SocialMediaPost.platform)
+Index("ix_locations_geohash", Location.geohash)
+Index("ix_disaster_location_location", disaster_location.c.location_id)
+Index("ix_social_posts_text_search", SocialMediaPost.post_text_search, postgresql_using="gin")
+Index("ix_social_posts_text_trgm", SocialMediaPost.post_text, postgresql_using="gin", postgresql_ops={"post_text": "gin_trgm_ops"})
+# Referencing side of the composite foreign keys (schema.sql names)
+Index("idx_cred_post", CredibilityAssessment.post_id, CredibilityAssessment.post_ingested_at)
+Index("idx_detect_post", DisasterDetection.post_id, DisasterDetection.post_ingested_at)
+Index("idx_alert_detection", Alert.detection_id, Alert.detection_timestamp)
+
+
+@event.listens_for(Location, "before_insert")
+@event.listens_for(Location, "before_update")
+def _set_location_geohash(mapper, connection, target):
+    if target.latitude is None or target.longitude is None:
+        target.geohash = None
+    else:
+        target.geohash = geohash_encode(target.latitude, target.longitude, GEOHASH_PRECISION)
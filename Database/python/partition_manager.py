@@ -0,0 +1,313 @@
+"""
+Partition lifecycle manager for the time-partitioned tables (social_posts, credibility_assessment,
+disaster_detection, alerts, alert_state_log).
+- ensure: keeps the current and N future partitions created, monthly or daily per table, so inserts never
+  hit a missing partition at rollover; ranges already covered by an existing partition are skipped
+- retain: detaches partitions that ended before the retention cut-off, then drops them or moves them into
+  an archive schema. A table referenced by another keeps one more period than the table referencing it (see
+  fk_safe_cutoffs), so a detach never hits rows still referenced from the referencing table's next partition
+- report: partition bounds, sizes and estimated rows per table
+- loop: ensure + retain on a schedule
+
+Configuration (env): DB_HOST/DB_PORT/DB_NAME/DB_USER/DB_PASS, PARTITION_DAILY_TABLES (comma-separated tables
+partitioned per day), PARTITION_MONTHS_AHEAD, PARTITION_DAYS_AHEAD, PARTITION_RETENTION_DAYS (0 keeps
+everything), PARTITION_ARCHIVE_SCHEMA (archive instead of drop when set).
+
+Run: python python/partition_manager.py ensure|retain|report|loop [--interval 3600]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import psycopg2
+
+DB_HOST = os.getenv('DB_HOST', 'localhost')
+DB_PORT = int(os.getenv('DB_PORT', 5432))
+DB_NAME = os.getenv('DB_NAME', 'rtmd')
+DB_USER = os.getenv('DB_USER', 'rtmd_user')
+DB_PASS = os.getenv('DB_PASS', 'change_me')
+
+PARTITION_DAILY_TABLES = {t.strip() for t in os.getenv('PARTITION_DAILY_TABLES', '').split(',') if t.strip()}
+PARTITION_MONTHS_AHEAD = int(os.getenv('PARTITION_MONTHS_AHEAD', 3))
+PARTITION_DAYS_AHEAD = int(os.getenv('PARTITION_DAYS_AHEAD', 14))
+PARTITION_RETENTION_DAYS = int(os.getenv('PARTITION_RETENTION_DAYS', 0))
+PARTITION_ARCHIVE_SCHEMA = os.getenv('PARTITION_ARCHIVE_SCHEMA') or None
+
+# Referencing tables first so retention never drops a parent partition before its dependents
+PARTITIONED_TABLES = ('alert_state_log', 'alerts', 'disaster_detection', 'credibility_assessment', 'social_posts')
+# Composite foreign keys (V13): referencing table -> referenced table
+REFERENCES = {'alerts': 'disaster_detection', 'disaster_detection': 'social_posts', 'credibility_assessment': 'social_posts'}
+
+Range = Tuple[datetime, datetime]
+
+_BOUND_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+@dataclass
+class TablePolicy:
+    table: str
+    granularity: str = 'month'  # 'month' or 'day'
+    ahead: int = PARTITION_MONTHS_AHEAD
+    retention_days: int = PARTITION_RETENTION_DAYS
+    archive_schema: Optional[str] = PARTITION_ARCHIVE_SCHEMA
+
+
+def default_policies() -> List[TablePolicy]:
+    policies = []
+    for table in PARTITIONED_TABLES:
+        if table in PARTITION_DAILY_TABLES:
+            policies.append(TablePolicy(table, granularity='day', ahead=PARTITION_DAYS_AHEAD))
+        else:
+            policies.append(TablePolicy(table))
+    return policies
+
+
+def get_conn():
+    conn = psycopg2.connect(host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASS)
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        # Partition bounds are read back and written in UTC
+        cur.execute("SET TIME ZONE 'UTC';")
+    return conn
+
+
+# --- period arithmetic (pure; unit-tested) ---
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """First instant of the month `months` after dt's month."""
+    index = dt.year * 12 + dt.month - 1 + months
+    return dt.replace(year=index // 12, month=index % 12 + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def period_start(dt: datetime, granularity: str) -> datetime:
+    if granularity == 'month':
+        return add_months(dt, 0)
+    if granularity == 'day':
+        return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f'Unknown granularity: {granularity}')
+
+
+def next_period(start: datetime, granularity: str) -> datetime:
+    return add_months(start, 1) if granularity == 'month' else start + timedelta(days=1)
+
+
+def previous_period(dt: datetime, granularity: str) -> datetime:
+    """Start of the period before the one containing dt."""
+    start = period_start(dt, granularity)
+    return add_months(start, -1) if granularity == 'month' else start - timedelta(days=1)
+
+
+def partition_name(table: str, start: datetime, granularity: str) -> str:
+    return f"{table}_{start:%Y_%m}" if granularity == 'month' else f"{table}_{start:%Y_%m_%d}"
+
+
+def desired_ranges(now: datetime, granularity: str, ahead: int) -> Iterator[Range]:
+    """The current period plus `ahead` future periods, as [start, end) ranges."""
+    start = period_start(now, granularity)
+    for _ in range(ahead + 1):
+        end = next_period(start, granularity)
+        yield start, end
+        start = end
+
+
+def overlaps(a: Range, b: Range) -> bool:
+    return a[0] < b[1] and b[0] < a[1]
+
+
+def parse_bound(expr: str) -> Optional[Range]:
+    """[start, end) from pg_get_expr(relpartbound); None for a DEFAULT partition."""
+    match = _BOUND_RE.search(expr or '')
+    if not match:
+        return None
+    return tuple(_parse_ts(v) for v in match.groups())
+
+
+def _parse_ts(value: str) -> datetime:
+    # '2026-01-01 00:00:00+00' -> aware datetime
+    value = re.sub(r'([+-]\d\d)$', r'\1:00', value)
+    return datetime.fromisoformat(value).astimezone(timezone.utc)
+
+
+# --- database operations ---
+
+def list_partitions(conn, table: str) -> List[dict]:
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT n.nspname, c.relname, pg_get_expr(c.relpartbound, c.oid), pg_total_relation_size(c.oid), c.reltuples::bigint
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE i.inhparent = %s::regclass
+            ORDER BY c.relname;
+            """,
+            (table,),
+        )
+        return [
+            {'schema': schema, 'name': name, 'bound': bound, 'range': parse_bound(bound), 'bytes': size, 'rows': rows}
+            for schema, name, bound, size, rows in cur.fetchall()
+        ]
+
+
+def ensure_partitions(conn, policy: TablePolicy, now: Optional[datetime] = None) -> List[str]:
+    """Create the missing current/future partitions for one table. Returns the names created."""
+    now = now or datetime.now(timezone.utc)
+    existing = [p['range'] for p in list_partitions(conn, policy.table) if p['range']]
+    created = []
+    with conn.cursor() as cur:
+        for start, end in desired_ranges(now, policy.granularity, policy.ahead):
+            if any(overlaps((start, end), r) for r in existing):
+                continue
+            name = partition_name(policy.table, start, policy.granularity)
+            cur.execute(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{policy.table}" FOR VALUES FROM (%s) TO (%s);',
+                (start.isoformat(), end.isoformat()),
+            )
+            existing.append((start, end))
+            created.append(name)
+    return created
+
+
+def expired_partitions(partitions: List[dict], cutoff: datetime) -> List[dict]:
+    """Partitions whose whole range ends at or before `cutoff` (DEFAULT partitions are never expired)."""
+    return [p for p in partitions if p['range'] and p['range'][1] <= cutoff]
+
+
+def fk_safe_cutoffs(cutoffs: Dict[str, Optional[datetime]], granularities: Dict[str, str]) -> Dict[str, Optional[datetime]]:
+    """
+    Hold each referenced table's cut-off back to the start of the period before its referencing table's cut-off.
+    A child row is written shortly after the row it references, so the oldest child partition still kept can
+    reference the tail of the parent's previous period; detaching that parent partition would fail the FK.
+    Applied children first, so the margin compounds up alerts -> disaster_detection -> social_posts.
+    None keeps everything, and a parent whose children are kept (or not in `cutoffs`) is kept too.
+    """
+    safe = dict(cutoffs)
+    for child in PARTITIONED_TABLES:
+        parent = REFERENCES.get(child)
+        if parent not in safe:
+            continue
+        if safe.get(child) is None:
+            safe[parent] = None
+        elif safe[parent] is not None:
+            safe[parent] = min(safe[parent], previous_period(safe[child], granularities.get(child, 'month')))
+    return safe
+
+
+def retention_cutoffs(policies: List[TablePolicy], now: Optional[datetime] = None) -> Dict[str, Optional[datetime]]:
+    """Per-table retention cut-off (None keeps everything), FK-safe across the policies."""
+    now = now or datetime.now(timezone.utc)
+    cutoffs = {p.table: now - timedelta(days=p.retention_days) if p.retention_days > 0 else None for p in policies}
+    return fk_safe_cutoffs(cutoffs, {p.table: p.granularity for p in policies})
+
+
+def apply_retention(conn, policy: TablePolicy, cutoff: Optional[datetime]) -> List[str]:
+    """
+    Detach partitions that ended before `cutoff` (from retention_cutoffs), then drop or archive them. Stops at the
+    first partition still referenced from another table; newer ones would be too. Returns the names processed.
+    """
+    if cutoff is None:
+        return []
+    concurrently = ' CONCURRENTLY' if conn.server_version >= 140000 else ''
+    done = []
+    with conn.cursor() as cur:
+        if policy.archive_schema:
+            cur.execute(f'CREATE SCHEMA IF NOT EXISTS "{policy.archive_schema}";')
+        for p in expired_partitions(list_partitions(conn, policy.table), cutoff):
+            qualified = f'"{p["schema"]}"."{p["name"]}"'
+            # autocommit: DETACH ... CONCURRENTLY cannot run inside a transaction block
+            try:
+                cur.execute(f'ALTER TABLE "{policy.table}" DETACH PARTITION {qualified}{concurrently};')
+            except psycopg2.errors.ForeignKeyViolation as e:
+                print(f'Keeping {p["name"]} and newer partitions of {policy.table}, still referenced: {e}')
+                break
+            if policy.archive_schema:
+                cur.execute(f'ALTER TABLE {qualified} SET SCHEMA "{policy.archive_schema}";')
+            else:
+                cur.execute(f'DROP TABLE {qualified};')
+            done.append(p['name'])
+    return done
+
+
+def report(conn, policies: List[TablePolicy]) -> None:
+    now = datetime.now(timezone.utc)
+    for policy in policies:
+        partitions = list_partitions(conn, policy.table)
+        total = sum(p['bytes'] for p in partitions)
+        print(f"{policy.table} ({policy.granularity}, {len(partitions)} partitions, {_pretty(total)})")
+        for p in partitions:
+            print(f"  {p['name']:<40} {p['bound']:<70} {_pretty(p['bytes']):>10} ~{max(p['rows'], 0)} rows")
+        upcoming = next_period(period_start(now, policy.granularity), policy.granularity)
+        if not any(p['range'] and p['range'][0] <= upcoming < p['range'][1] for p in partitions):
+            print(f"  WARNING: no partition for the next {policy.granularity} starting {upcoming:%Y-%m-%d}")
+
+
+def _pretty(size: int) -> str:
+    for unit in ('B', 'kB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def retain(conn, policies: List[TablePolicy]) -> None:
+    # one set of cut-offs for all tables, so referenced tables keep their margin over the referencing ones
+    cutoffs = retention_cutoffs(policies)
+    for policy in policies:
+        try:
+            removed = apply_retention(conn, policy, cutoffs[policy.table])
+        except psycopg2.Error as e:
+            print(f'Retention failed for {policy.table}: {e}')
+            continue
+        for name in removed:
+            print(f"{'Archived' if policy.archive_schema else 'Dropped'} partition {name}")
+
+
+def run_once(conn, policies: List[TablePolicy]) -> None:
+    for policy in policies:
+        try:
+            created = ensure_partitions(conn, policy)
+        except psycopg2.Error as e:
+            print(f'Partition maintenance failed for {policy.table}: {e}')
+            continue
+        for name in created:
+            print(f'Created partition {name}')
+    retain(conn, policies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('action', choices=['ensure', 'retain', 'report', 'loop'])
+    parser.add_argument('--interval', type=int, default=3600, help='seconds between runs for `loop`')
+    args = parser.parse_args()
+
+    try:
+        conn = get_conn()
+    except Exception as e:
+        print('Error connecting to DB:', e)
+        sys.exit(1)
+
+    policies = default_policies()
+    try:
+        if args.action == 'ensure':
+            for policy in policies:
+                for name in ensure_partitions(conn, policy):
+                    print(f'Created partition {name}')
+        elif args.action == 'retain':
+            retain(conn, policies)
+        elif args.action == 'report':
+            report(conn, policies)
+        else:
+            while True:
+                run_once(conn, policies)
+                time.sleep(args.interval)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
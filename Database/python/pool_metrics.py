@@ -0,0 +1,97 @@
+"""Connection pool instrumentation for python/db.py.
+
+- `InstrumentedQueuePool` times every checkout, i.e. how long a caller waited for an idle or new connection.
+- Pool events record connection age at checkin. Checked-out and overflow counts are read from the pool at scrape time.
+- Metrics are Prometheus series labelled by role (ingest, worker, ...) and pool (primary/replica). prometheus_client
+  is optional: without it the pool still works, it is just not measured.
+- `start_metrics_server(port)` exposes /metrics for processes that have no HTTP server of their own.
+"""
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram, start_http_server
+except ImportError:  # metrics are optional
+    Counter = Gauge = Histogram = start_http_server = None
+
+_LABELS = ("role", "pool")
+
+if Histogram is not None:
+    CHECKOUT_WAIT = Histogram(
+        "rtmd_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", _LABELS,
+        buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+    )
+    CHECKOUT_TIMEOUTS = Counter("rtmd_db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout", _LABELS)
+    CHECKED_OUT = Gauge("rtmd_db_pool_checked_out", "Connections currently checked out", _LABELS)
+    OVERFLOW = Gauge("rtmd_db_pool_overflow_in_use", "Connections open beyond pool_size", _LABELS)
+    POOL_SIZE = Gauge("rtmd_db_pool_size", "Configured pool_size", _LABELS)
+    CONNECTION_AGE = Histogram(
+        "rtmd_db_pool_connection_age_seconds", "Age of connections when returned to the pool", _LABELS,
+        buckets=(1, 10, 60, 300, 900, 1800, 3600, 7200),
+    )
+
+_server_started = False
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited (set `metric_labels` via `instrument`)."""
+
+    metric_labels = ("default", "primary")
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if Counter is not None:
+                CHECKOUT_TIMEOUTS.labels(*self.metric_labels).inc()
+            raise
+        finally:
+            if Histogram is not None:
+                CHECKOUT_WAIT.labels(*self.metric_labels).observe(time.perf_counter() - start)
+
+
+def instrument(pool, role: str, name: str) -> None:
+    """Label a pool's metrics and attach the event hooks."""
+    labels = (role, name)
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.metric_labels = labels
+    if Gauge is None:
+        return
+    CHECKED_OUT.labels(*labels).set_function(pool.checkedout)
+    OVERFLOW.labels(*labels).set_function(lambda: max(pool.overflow(), 0))
+    POOL_SIZE.labels(*labels).set(pool.size())
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connected_at = connection_record.info.get("connected_at")
+        if connected_at is not None:
+            CONNECTION_AGE.labels(*labels).observe(time.monotonic() - connected_at)
+
+
+def forget(pool) -> None:
+    """Drop the series of a pool that is being disposed (e.g. when python/db.py is reconfigured for a role)."""
+    if Gauge is None or not isinstance(pool, InstrumentedQueuePool):
+        return
+    for metric in (CHECKOUT_WAIT, CHECKOUT_TIMEOUTS, CHECKED_OUT, OVERFLOW, POOL_SIZE, CONNECTION_AGE):
+        try:
+            metric.remove(*pool.metric_labels)
+        except KeyError:
+            pass
+
+
+def start_metrics_server(port: int) -> bool:
+    """Serve /metrics on `port` once per process. Returns False if prometheus_client is missing."""
+    global _server_started
+    if start_http_server is None:
+        return False
+    if not _server_started:
+        start_http_server(port)
+        _server_started = True
+    return True
@@ -0,0 +1,186 @@
+"""
+Paged reads of posts, detections and alerts with keyset (seek) pagination.
+- Pages are newest first, ordered by (timestamp, id). A page's cursor is its last row's (timestamp, id), and the
+  next page seeks past it (`ts <= :ts AND (ts < :ts OR id < :id)`) rather than using OFFSET, so deep pages
+  cost the same as the first one
+- The seek bound `ts <= :ts` fits any B-tree that leads with the timestamp, so the filters ride on existing indexes:
+  posts: idx_posts_ts_id, detections: idx_detect_ts_conf (fused_confidence), alerts: idx_alert_ts_id,
+  pending alerts: idx_alert_pending_claim (severity_rank)
+- `iter_rows` streams every match page by page, each page a short query, so nothing is held open between pages
+- Cursors are opaque url-safe strings that can be handed to API clients (python/cursors.py)
+
+Run: python -m python.queries alerts --severity high --limit 20
+"""
+import argparse
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from python.cursors import decode_cursor, encode_cursor
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+SEVERITY_RANK = {"high": 0, "medium": 1, "low": 2}  # alert_pending.severity_rank
+
+
+@dataclass(frozen=True)
+class Page:
+    rows: List[dict]
+    next_cursor: Optional[str]  # None on the last page
+
+
+@dataclass(frozen=True)
+class PagedQuery:
+    """A newest-first listing: FROM clause, selected columns, and the (timestamp, id) keyset columns."""
+
+    source: str
+    columns: str
+    ts_column: str
+    id_column: str
+    ts_key: str  # names of the keyset columns in the result rows
+    id_key: str
+
+
+POSTS = PagedQuery(
+    source="social_posts p",
+    columns="p.post_id, p.source_platform, p.source_post_id, p.ingestion_timestamp, p.text_content, p.image_reference, p.processing_status",
+    ts_column="p.ingestion_timestamp", id_column="p.post_id", ts_key="ingestion_timestamp", id_key="post_id",
+)
+
+DETECTIONS = PagedQuery(
+    source="disaster_detection d",
+    columns="d.detection_id, d.post_id, d.post_ingested_at, d.disaster_type, d.text_confidence, d.image_confidence, d.fused_confidence, d.detection_timestamp",
+    ts_column="d.detection_timestamp", id_column="d.detection_id", ts_key="detection_timestamp", id_key="detection_id",
+)
+
+ALERTS = PagedQuery(
+    source="alerts a",
+    columns="a.alert_id, a.detection_id, a.detection_timestamp, a.alert_severity, a.alert_timestamp, a.alert_status, a.region, a.latitude, a.longitude",
+    ts_column="a.alert_timestamp", id_column="a.alert_id", ts_key="alert_timestamp", id_key="alert_id",
+)
+
+# Pending alerts page over alert_pending (small), joined back to alerts for the details
+PENDING_ALERTS = PagedQuery(
+    source="alert_pending q JOIN alerts a ON a.alert_id = q.alert_id AND a.alert_timestamp = q.alert_timestamp",
+    columns="a.alert_id, a.detection_id, a.detection_timestamp, a.alert_severity, a.alert_timestamp, a.region, a.latitude, a.longitude",
+    ts_column="q.alert_timestamp", id_column="q.alert_id", ts_key="alert_timestamp", id_key="alert_id",
+)
+
+
+def build_page_sql(query: PagedQuery, conditions: List[str], params: Dict, limit: int, cursor: Optional[str] = None):
+    """SQL text and parameters for one page; `conditions` are extra WHERE clauses using `params`."""
+    conditions, params = list(conditions), dict(params)
+    if cursor:
+        params["cursor_ts"], params["cursor_id"] = decode_cursor(cursor)
+        conditions.append(
+            f"{query.ts_column} <= :cursor_ts AND ({query.ts_column} < :cursor_ts OR {query.id_column} < :cursor_id)"
+        )
+    params["limit"] = limit + 1  # one extra row tells whether there is a next page
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = (
+        f"SELECT {query.columns} FROM {query.source} {where} "
+        f"ORDER BY {query.ts_column} DESC, {query.id_column} DESC LIMIT :limit"
+    )
+    return text(sql), params
+
+
+def _time_window(query: PagedQuery, since: Optional[datetime], until: Optional[datetime]) -> Tuple[List[str], Dict]:
+    # The lower bound also lets the planner prune old partitions
+    conditions, params = [], {}
+    if since is not None:
+        conditions.append(f"{query.ts_column} >= :since")
+        params["since"] = since
+    if until is not None:
+        conditions.append(f"{query.ts_column} < :until")
+        params["until"] = until
+    return conditions, params
+
+
+def fetch_page(session, query: PagedQuery, conditions: List[str], params: Dict, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    sql, bound = build_page_sql(query, conditions, params, limit, cursor)
+    rows = [dict(r) for r in session.execute(sql, bound).mappings()]
+    if len(rows) <= limit:
+        return Page(rows, None)
+    rows = rows[:limit]
+    return Page(rows, encode_cursor(rows[-1][query.ts_key], rows[-1][query.id_key]))
+
+
+def posts_page(session, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, platform: Optional[str] = None,
+               since: Optional[datetime] = None, until: Optional[datetime] = None) -> Page:
+    conditions, params = _time_window(POSTS, since, until)
+    if platform:
+        conditions.append("p.source_platform = :platform")
+        params["platform"] = platform
+    return fetch_page(session, POSTS, conditions, params, limit, cursor)
+
+
+def detections_page(session, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, min_confidence: Optional[float] = None,
+                    disaster_type: Optional[str] = None, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Page:
+    conditions, params = _time_window(DETECTIONS, since, until)
+    if min_confidence is not None:
+        # second column of idx_detect_ts_conf: checked in the index, before the heap is visited
+        conditions.append("d.fused_confidence >= :min_confidence")
+        params["min_confidence"] = min_confidence
+    if disaster_type:
+        conditions.append("d.disaster_type = :disaster_type")
+        params["disaster_type"] = disaster_type
+    return fetch_page(session, DETECTIONS, conditions, params, limit, cursor)
+
+
+def alerts_page(session, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, severity: Optional[str] = None,
+                pending: bool = False, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Page:
+    """Alerts newest first; `pending=True` lists only alerts waiting for dispatch (alert_pending).
+    Raises ValueError for a severity outside SEVERITY_RANK."""
+    if severity and severity not in SEVERITY_RANK:
+        raise ValueError(f"Unknown severity: {severity!r}")
+    query = PENDING_ALERTS if pending else ALERTS
+    conditions, params = _time_window(query, since, until)
+    if severity and pending:
+        conditions.append("q.severity_rank = :severity_rank")
+        params["severity_rank"] = SEVERITY_RANK[severity]
+    elif severity:
+        conditions.append("a.alert_severity = :severity")
+        params["severity"] = severity
+    return fetch_page(session, query, conditions, params, limit, cursor)
+
+
+def iter_rows(session, page_fn: Callable[..., Page], page_size: int = MAX_PAGE_SIZE, cursor: Optional[str] = None, **filters) -> Iterator[dict]:
+    """Stream all matching rows by following cursors, e.g. `iter_rows(session, detections_page, min_confidence=0.8)`."""
+    while True:
+        page = page_fn(session, limit=page_size, cursor=cursor, **filters)
+        yield from page.rows
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
+
+
+if __name__ == "__main__":
+    from python.db import get_session
+
+    pagers = {"posts": posts_page, "detections": detections_page, "alerts": alerts_page}
+    parser = argparse.ArgumentParser()
+    parser.add_argument("table", choices=sorted(pagers))
+    parser.add_argument("--limit", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--cursor")
+    parser.add_argument("--platform")
+    parser.add_argument("--min-confidence", type=float)
+    parser.add_argument("--severity", choices=sorted(SEVERITY_RANK))
+    parser.add_argument("--pending", action="store_true")
+    args = parser.parse_args()
+    filters = {
+        "posts": {"platform": args.platform},
+        "detections": {"min_confidence": args.min_confidence},
+        "alerts": {"severity": args.severity, "pending": args.pending},
+    }[args.table]
+    session = get_session(readonly=True)
+    try:
+        page = pagers[args.table](session, limit=args.limit, cursor=args.cursor, **filters)
+        for row in page.rows:
+            print(row)
+        print("next cursor:", page.next_cursor)
+    finally:
+        session.close()
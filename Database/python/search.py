@@ -0,0 +1,167 @@
+"""
+Ranked full-text search over post text, with a fuzzy fallback for misspellings.
+- Full-text: websearch_to_tsquery('english', q) against the generated text_search column (GIN index per partition),
+  ranked with ts_rank_cd. Accepts web-search syntax: "quoted phrase", OR, -excluded
+- Fuzzy: the query's trigram word similarity to the post text (pg_trgm `<%`, trigram GIN index), used when full-text
+  finds nothing on the first page, e.g. a misspelt place name
+- Every search is time-bounded (default: the last SEARCH_DEFAULT_DAYS days), so only the matching partitions are
+  searched, and ranks at most the SEARCH_MAX_CANDIDATES newest matches, so common terms cannot turn a search into a
+  scan of every match. Snippets (ts_headline) are only built for the rows of the returned page
+- Pages are keyset-paginated on (rank, timestamp, id); the cursor pins the mode and time window of the first page,
+  so later pages are consistent while new posts arrive
+- Searches social_posts by default; ORM_POSTS targets the ORM table social_media_posts
+
+Run: python -m python.search "flood colombo" --days 7
+"""
+import argparse
+import base64
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from python.queries import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
+
+SEARCH_DEFAULT_DAYS = float(os.getenv("SEARCH_DEFAULT_DAYS", "30"))
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "5000"))
+
+MODES = ("fts", "fuzzy")
+
+
+@dataclass(frozen=True)
+class SearchTarget:
+    table: str
+    id_column: str
+    ts_column: str
+    platform_column: str
+    text_column: str
+    vector_column: str
+
+
+POSTS = SearchTarget("social_posts", "post_id", "ingestion_timestamp", "source_platform", "text_content", "text_search")
+ORM_POSTS = SearchTarget("social_media_posts", "post_id", '"timestamp"', "platform", "post_text", "post_text_search")
+
+# mode -> (match condition, rank expression, snippet expression); :q is the raw query, q.query the tsquery
+_MATCH = {
+    "fts": (
+        "p.{vector} @@ q.query",
+        "ts_rank_cd(p.{vector}, q.query)",
+        "ts_headline('english', page.body, q.query, 'MaxFragments=2, MinWords=5, MaxWords=20')",
+    ),
+    "fuzzy": (
+        ":q <% p.{text}",
+        "word_similarity(:q, p.{text})",
+        "left(page.body, 200)",
+    ),
+}
+
+
+def encode_cursor(mode: str, rank: float, ts: datetime, key, since: datetime, until: datetime) -> str:
+    raw = json.dumps([mode, rank, ts.isoformat(), str(key), since.isoformat(), until.isoformat()])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict:
+    """Inverse of `encode_cursor`; raises ValueError for a malformed cursor."""
+    try:
+        mode, rank, ts, key, since, until = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if mode not in MODES:
+            raise ValueError(mode)
+        return {
+            "mode": mode, "rank": float(rank), "ts": datetime.fromisoformat(ts), "id": uuid.UUID(key),
+            "since": datetime.fromisoformat(since), "until": datetime.fromisoformat(until),
+        }
+    except (ValueError, TypeError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Invalid search cursor: {cursor!r}") from exc
+
+
+def build_search_sql(target: SearchTarget, mode: str, platform: bool, after: bool):
+    """SQL for one page: newest matches (capped) -> ranked page -> snippets."""
+    match, rank, snippet = (part.format(vector=target.vector_column, text=target.text_column) for part in _MATCH[mode])
+    conditions = [match, f"p.{target.ts_column} >= :since", f"p.{target.ts_column} < :until"]
+    if platform:
+        conditions.append(f"p.{target.platform_column} = :platform")
+    seek = "WHERE (rank, ts, id) < (CAST(:cursor_rank AS real), :cursor_ts, :cursor_id)" if after else ""
+    return text(
+        f"""
+        WITH q AS (SELECT websearch_to_tsquery('english', :q) AS query),
+        candidates AS (
+          SELECT p.{target.id_column} AS id, p.{target.ts_column} AS ts, p.{target.platform_column} AS platform,
+                 p.{target.text_column} AS body, {rank} AS rank
+          FROM {target.table} p, q
+          WHERE {' AND '.join(conditions)}
+          ORDER BY p.{target.ts_column} DESC
+          LIMIT :max_candidates
+        ),
+        page AS (
+          SELECT * FROM candidates {seek}
+          ORDER BY rank DESC, ts DESC, id DESC
+          LIMIT :limit
+        )
+        SELECT page.id AS post_id, page.ts AS timestamp, page.platform, page.rank, {snippet} AS snippet
+        FROM page, q
+        ORDER BY page.rank DESC, page.ts DESC, page.id DESC
+        """
+    )
+
+
+def _page(session, target: SearchTarget, mode: str, query: str, since: datetime, until: datetime, limit: int,
+          platform: Optional[str], after: Optional[Dict]) -> Page:
+    params = {"q": query, "since": since, "until": until, "limit": limit + 1, "max_candidates": SEARCH_MAX_CANDIDATES}
+    if platform:
+        params["platform"] = platform
+    if after:
+        params.update(cursor_rank=after["rank"], cursor_ts=after["ts"], cursor_id=after["id"])
+    sql = build_search_sql(target, mode, bool(platform), bool(after))
+    rows = [dict(r, match=mode) for r in session.execute(sql, params).mappings()]
+    if len(rows) <= limit:
+        return Page(rows, None)
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(rows, encode_cursor(mode, last["rank"], last["timestamp"], last["post_id"], since, until))
+
+
+def search_posts(session, query: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                 limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, platform: Optional[str] = None,
+                 target: SearchTarget = POSTS, fuzzy_fallback: bool = True) -> Page:
+    """One page of posts matching `query`, best match first. Rows: post_id, timestamp, platform, rank, snippet, match."""
+    query = (query or "").strip()
+    if not query:
+        raise ValueError("Empty search query")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        after = decode_cursor(cursor)
+        return _page(session, target, after["mode"], query, after["since"], after["until"], limit, platform, after)
+
+    until = until or datetime.now(timezone.utc)
+    since = since or until - timedelta(days=SEARCH_DEFAULT_DAYS)
+    page = _page(session, target, "fts", query, since, until, limit, platform, None)
+    if not page.rows and fuzzy_fallback:
+        page = _page(session, target, "fuzzy", query, since, until, limit, platform, None)
+    return page
+
+
+if __name__ == "__main__":
+    from python.db import get_session
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("query")
+    parser.add_argument("--days", type=float, default=SEARCH_DEFAULT_DAYS)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--platform")
+    parser.add_argument("--cursor")
+    args = parser.parse_args()
+    session = get_session(readonly=True)
+    try:
+        now = datetime.now(timezone.utc)
+        page = search_posts(session, args.query, since=now - timedelta(days=args.days), until=now, limit=args.limit,
+                            cursor=args.cursor, platform=args.platform)
+        for row in page.rows:
+            print(f"{row['rank']:.3f} [{row['match']}] {row['timestamp']:%Y-%m-%d %H:%M} {row['platform']}: {row['snippet']}")
+        print("next cursor:", page.next_cursor)
+    finally:
+        session.close()
@@ -31,8 +31,8 @@ def seed():
         session.flush()
 
         # create locations
-        loc1 = Location(name="Riverbank", district="Central", province="ProvinceA")
-        loc2 = Location(name="Uptown", district="North", province="ProvinceB")
+        loc1 = Location(name="Riverbank", district="Central", province="ProvinceA", latitude=7.2906, longitude=80.6337)
+        loc2 = Location(name="Uptown", district="North", province="ProvinceB", latitude=9.6615, longitude=80.0255)
         session.add_all([loc1, loc2])
 
         # create a disaster
@@ -0,0 +1,128 @@
+"""
+Shared session and one-time token store in Redis, for every UI and API process.
+- A session id is 256 random bits handed to the client (cookie or bearer token). Redis holds the session under
+  rtmd:session:<sha256(id)>, so a dump of Redis does not contain usable ids. Validation is one GETEX: it returns
+  the session and slides its idle expiry (SESSION_TTL_SECONDS) in the same O(1) command, with no database
+  round trip. A session older than SESSION_MAX_AGE_SECONDS is dropped however active it is
+- rtmd:user-sessions:<user_id> is a set of the user's session keys, so a password reset or an admin can end every
+  session of one user (revoke_user)
+- One-time tokens (email verification, password reset) live under rtmd:token:<purpose>:<sha256(token)> with their
+  own TTL and are consumed with GETDEL: expiry and single use are enforced by Redis, and the lookup does not scan
+  users / password_reset_tokens by token hash
+
+Configuration (env): REDIS_URL, SESSION_TTL_SECONDS (default 8 h), SESSION_MAX_AGE_SECONDS (default 7 days)
+Requires: redis (server 6.2+ for GETEX / GETDEL)
+"""
+import hashlib
+import json
+import os
+import secrets
+import time
+from typing import Optional
+
+import redis
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", 8 * 3600))
+SESSION_MAX_AGE_SECONDS = int(os.getenv("SESSION_MAX_AGE_SECONDS", 7 * 86400))
+
+SESSION_PREFIX = "rtmd:session:"
+USER_SESSIONS_PREFIX = "rtmd:user-sessions:"
+TOKEN_PREFIX = "rtmd:token:"
+TOKEN_TTL_SECONDS = {"verify_email": 86400, "password_reset": 3600}
+
+_client: Optional[redis.Redis] = None
+
+
+def get_client() -> redis.Redis:
+    """One connection pool per process, shared by the stores."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(REDIS_URL)
+    return _client
+
+
+def _digest(raw: str) -> str:
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def session_key(session_id: str) -> str:
+    return SESSION_PREFIX + _digest(session_id)
+
+
+def token_key(purpose: str, token: str) -> str:
+    return f"{TOKEN_PREFIX}{purpose}:{_digest(token)}"
+
+
+def _too_old(record: dict, max_age: int, now: float) -> bool:
+    return now - record.get("created", now) > max_age
+
+
+class SessionStore:
+    def __init__(self, client: Optional[redis.Redis] = None, ttl: int = SESSION_TTL_SECONDS, max_age: int = SESSION_MAX_AGE_SECONDS):
+        self._redis = client or get_client()
+        self._ttl = ttl
+        self._max_age = max_age
+
+    def create(self, data: dict, user_id: Optional[str] = None) -> str:
+        """Store a new session; returns the id to hand to the client."""
+        session_id = secrets.token_urlsafe(32)
+        key = session_key(session_id)
+        record = {"created": time.time(), "user_id": user_id, "data": data}
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.set(key, json.dumps(record), ex=self._ttl)
+        if user_id:
+            pipe.sadd(USER_SESSIONS_PREFIX + user_id, key)
+            pipe.expire(USER_SESSIONS_PREFIX + user_id, self._max_age)
+        pipe.execute()
+        return session_id
+
+    def get(self, session_id: str) -> Optional[dict]:
+        """The session data, or None if unknown, expired or revoked. Refreshes the idle expiry."""
+        key = session_key(session_id)
+        raw = self._redis.getex(key, ex=self._ttl)
+        if raw is None:
+            return None
+        record = json.loads(raw)
+        if _too_old(record, self._max_age, time.time()):
+            self._redis.delete(key)
+            return None
+        return record["data"]
+
+    def save(self, session_id: str, data: dict) -> bool:
+        """Replace the data of an existing session. False if it has expired or been revoked (it is not recreated)."""
+        key = session_key(session_id)
+        raw = self._redis.get(key)
+        if raw is None:
+            return False
+        record = json.loads(raw)
+        record["data"] = data
+        return bool(self._redis.set(key, json.dumps(record), ex=self._ttl, xx=True))
+
+    def delete(self, session_id: str) -> None:
+        self._redis.delete(session_key(session_id))
+
+    def revoke_user(self, user_id: str) -> int:
+        """End every session of a user; returns how many were still live."""
+        keys = self._redis.smembers(USER_SESSIONS_PREFIX + user_id)
+        pipe = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.delete(key)
+        pipe.delete(USER_SESSIONS_PREFIX + user_id)
+        return sum(pipe.execute()[:-1])
+
+
+class TokenStore:
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self._redis = client or get_client()
+
+    def issue(self, purpose: str, user_id: str, ttl: Optional[int] = None) -> str:
+        """A new raw token for `purpose` (send it to the user); only its hash is stored."""
+        token = secrets.token_urlsafe(32)
+        self._redis.set(token_key(purpose, token), user_id, ex=ttl or TOKEN_TTL_SECONDS[purpose])
+        return token
+
+    def consume(self, purpose: str, token: str) -> Optional[str]:
+        """The user id the token was issued for, once; None if unknown, expired or already used."""
+        user_id = self._redis.getdel(token_key(purpose, token))
+        return user_id.decode("utf-8") if user_id is not None else None
@@ -1,41 +1,264 @@
 """
-Simple alert dispatcher: polls `alerts` table for pending alerts and marks them sent after dispatching.
-Replace the `dispatch_alert` function with real notification integration (email, SMS, webhook).
+Alert dispatcher: claims pending alerts from `alert_pending` in batches and records them sent after dispatching.
+Delivery is handled by the async fan-out engine in real_time/notifier.py (webhook/SMS, email; stdout when unconfigured).
+
+Claiming uses `SELECT ... FOR UPDATE SKIP LOCKED`, so any number of dispatcher replicas can run
+against the same database: each replica locks a disjoint batch and the others skip over it.
+
+`alerts` rows are never updated: dispatched alerts are deleted from the small `alert_pending` table and
+their transition is appended to the time-partitioned `alert_state_log` (migrations/V07__alert_state_log.sql),
+so claim cost stays flat however large the alert history grows.
+
+A digest that no channel accepted stays pending with exponential backoff (alert_pending.attempts / next_attempt_at,
+migrations/V16__alert_retry.sql) rather than heading every later batch; after ALERT_MAX_ATTEMPTS failed
+deliveries its alerts are dead-lettered with a 'failed' transition. A digest with no recipient at all (no static
+target and no matching subscriber) is not retried: its alerts are recorded 'suppressed'.
+
+Each claimed batch is coalesced per (disaster type, region, severity) and time window (real_time/coalescing.py):
+one digest is delivered per group and the other alerts in it are marked 'coalesced'. Groups whose leader was
+already sent by an earlier batch (same key and window) are coalesced into that leader without a new delivery.
+Each digest is routed to the subscribers whose geofence and filters match it (real_time/geofence.py),
+in addition to any static channel targets.
+
+With ALERT_CDC_WAKE=1 the dispatcher sleeps on the alerts CDC stream (real_time/cdc_relay.py) instead of a fixed
+interval: a new alert wakes it at once, and ALERT_POLL_INTERVAL only bounds the wait.
 
 Run: python real_time/alert_dispatcher.py
 """
+import asyncio
 import os
 import time
-from typing import List
+from typing import List, Optional
 
-from python.db import get_session
+from sqlalchemy import text
+
+from python.db import configure, get_session
+from real_time.cdc_relay import StreamWaiter
+from real_time.coalescing import ALERT_COALESCE_WINDOW, Digest, coalesce, fold_into_sent, window_start
+from real_time.geofence import GeofenceIndex
+from real_time.notifier import NotificationEngine, channels_from_env
 
 ALERT_POLL_INTERVAL = float(os.getenv("ALERT_POLL_INTERVAL", "15"))
+ALERT_BATCH_SIZE = int(os.getenv("ALERT_BATCH_SIZE", "200"))
+ALERT_CDC_WAKE = os.getenv("ALERT_CDC_WAKE", "0").lower() in ("1", "true", "yes")
+ALERT_MAX_ATTEMPTS = int(os.getenv("ALERT_MAX_ATTEMPTS", "8"))
+ALERT_RETRY_BASE_SECONDS = float(os.getenv("ALERT_RETRY_BASE_SECONDS", "30"))
+ALERT_RETRY_MAX_SECONDS = float(os.getenv("ALERT_RETRY_MAX_SECONDS", "3600"))
+
+# Highest severity first, then oldest first within a severity; alerts backing off after a failure are skipped
+CLAIM_PENDING_SQL = text(
+    """
+    SELECT a.alert_id, a.alert_severity, a.alert_timestamp, a.region, a.latitude, a.longitude,
+           d.disaster_type, d.fused_confidence
+    FROM alert_pending p
+    JOIN alerts a ON a.alert_id = p.alert_id AND a.alert_timestamp = p.alert_timestamp
+    LEFT JOIN disaster_detection d ON d.detection_id = a.detection_id AND d.detection_timestamp = a.detection_timestamp
+    WHERE p.next_attempt_at <= now()
+    ORDER BY p.severity_rank, p.alert_timestamp ASC
+    LIMIT :batch_size
+    FOR UPDATE OF p SKIP LOCKED
+    """
+)
+
+# Leaders already delivered in the windows of a claimed batch (a leader is sent after it was created, so both
+# time filters prune to the recent partitions)
+SENT_LEADERS_SQL = text(
+    """
+    SELECT a.alert_id, a.alert_severity, a.alert_timestamp, a.region, a.latitude, a.longitude, d.disaster_type
+    FROM alerts a
+    JOIN alert_state_log s ON s.alert_id = a.alert_id AND s.alert_timestamp = a.alert_timestamp AND s.state = 'sent' AND s.ts >= :since
+    LEFT JOIN disaster_detection d ON d.detection_id = a.detection_id AND d.detection_timestamp = a.detection_timestamp
+    WHERE a.alert_timestamp >= :since
+    """
+)
+
+# alert_state_log.ts defaults to clock_timestamp(), i.e. the time of delivery rather than of the claim; every
+# transition carries the alert's alert_timestamp from alert_pending, so it joins back to alerts on the full key
+MARK_SENT_SQL = text(
+    """
+    WITH done AS (
+      DELETE FROM alert_pending WHERE alert_id = ANY(CAST(:alert_ids AS uuid[])) RETURNING alert_id, alert_timestamp
+    )
+    INSERT INTO alert_state_log (alert_id, alert_timestamp, state) SELECT alert_id, alert_timestamp, 'sent' FROM done
+    """
+)
+
+# Nobody to deliver to: dequeue as 'suppressed' instead of re-claiming the alerts on every poll
+MARK_UNROUTED_SQL = text(
+    """
+    WITH done AS (
+      DELETE FROM alert_pending WHERE alert_id = ANY(CAST(:alert_ids AS uuid[])) RETURNING alert_id, alert_timestamp
+    )
+    INSERT INTO alert_state_log (alert_id, alert_timestamp, state) SELECT alert_id, alert_timestamp, 'suppressed' FROM done
+    """
+)
+
+MARK_COALESCED_SQL = text(
+    """
+    WITH done AS (
+      DELETE FROM alert_pending p
+      USING unnest(CAST(:alert_ids AS uuid[]), CAST(:leader_ids AS uuid[])) AS c(alert_id, leader_id)
+      WHERE p.alert_id = c.alert_id
+      RETURNING p.alert_id, p.alert_timestamp, c.leader_id
+    )
+    INSERT INTO alert_state_log (alert_id, alert_timestamp, state, coalesced_into)
+    SELECT alert_id, alert_timestamp, 'coalesced', leader_id FROM done
+    """
+)
+
+# Failed deliveries: dead-letter the alerts on their last attempt, back the others off (two statements: a row
+# cannot be both updated and deleted by one statement's CTEs)
+DEAD_LETTER_SQL = text(
+    """
+    WITH dead AS (
+      DELETE FROM alert_pending
+      WHERE alert_id = ANY(CAST(:alert_ids AS uuid[])) AND attempts + 1 >= :max_attempts
+      RETURNING alert_id, alert_timestamp
+    )
+    INSERT INTO alert_state_log (alert_id, alert_timestamp, state) SELECT alert_id, alert_timestamp, 'failed' FROM dead
+    """
+)
+
+BACK_OFF_SQL = text(
+    """
+    UPDATE alert_pending
+    SET attempts = attempts + 1,
+        next_attempt_at = now() + make_interval(secs => LEAST(:max_delay, :base_delay * power(2, attempts)))
+    WHERE alert_id = ANY(CAST(:alert_ids AS uuid[]))
+    """
+)
+
+
+def claim_pending_alerts(session, batch_size: int = ALERT_BATCH_SIZE) -> List[dict]:
+    """Lock up to `batch_size` pending alerts for this session's transaction.
+
+    Rows locked by another dispatcher are skipped rather than waited on. The locks are
+    held until the session commits or rolls back.
+    """
+    return session.execute(CLAIM_PENDING_SQL, {"batch_size": batch_size}).mappings().all()
+
+
+def mark_sent(session, alert_ids: List) -> None:
+    """Record a batch of claimed alerts as sent (dequeue + log append) in a single statement."""
+    if alert_ids:
+        session.execute(MARK_SENT_SQL, {"alert_ids": list(alert_ids)})
+
+
+def mark_coalesced(session, pairs: List[tuple]) -> None:
+    """Record (alert_id, leader_id) pairs as coalesced into their leader in a single statement."""
+    if pairs:
+        alert_ids, leader_ids = zip(*pairs)
+        session.execute(MARK_COALESCED_SQL, {"alert_ids": list(alert_ids), "leader_ids": list(leader_ids)})
+
+
+def sent_leaders(session, rows: List[dict], window_seconds: float = ALERT_COALESCE_WINDOW) -> List[dict]:
+    """Sent alerts from the coalescing windows of `rows` (none when coalescing is disabled)."""
+    if window_seconds <= 0 or not rows:
+        return []
+    since = min(window_start(row, window_seconds) for row in rows)
+    return session.execute(SENT_LEADERS_SQL, {"since": since}).mappings().all()
+
+
+def mark_unrouted(session, alert_ids: List) -> None:
+    """Record claimed alerts that had no recipient as suppressed."""
+    if alert_ids:
+        session.execute(MARK_UNROUTED_SQL, {"alert_ids": list(alert_ids)})
+
+
+def mark_failed(session, alert_ids: List) -> None:
+    """Count a failed delivery for claimed alerts: retry later with backoff, or dead-letter after ALERT_MAX_ATTEMPTS."""
+    if alert_ids:
+        session.execute(DEAD_LETTER_SQL, {"alert_ids": list(alert_ids), "max_attempts": ALERT_MAX_ATTEMPTS})
+        session.execute(BACK_OFF_SQL, {"alert_ids": list(alert_ids), "base_delay": ALERT_RETRY_BASE_SECONDS, "max_delay": ALERT_RETRY_MAX_SECONDS})
+
+
+def route(digest: Digest, index: GeofenceIndex) -> dict:
+    """The digest payload with the subscribers matching any of its members' points attached."""
+    payload = digest.payload()
+    recipients = {}
+    for lat, lng in digest.points:
+        for recipient in index.match(lat, lng, payload.get("disaster_type"), payload.get("alert_severity")):
+            recipients.setdefault(recipient.subscription_id, recipient)
+    payload["recipients"] = list(recipients.values())
+    return payload
+
+
+def dispatch_batch(session, loop, engine: NotificationEngine, index: GeofenceIndex, batch_size: int = ALERT_BATCH_SIZE, window_seconds: float = ALERT_COALESCE_WINDOW) -> int:
+    """Claim, coalesce, deliver and mark one batch. Returns the number of alerts claimed.
+
+    A digest counts as sent once at least one recipient accepted it; its leader is marked sent and
+    the rest of its group coalesced. Digests with no successful delivery stay pending as a whole,
+    backing off before they can be claimed again (dead-lettered after ALERT_MAX_ATTEMPTS). Digests
+    with no recipient at all are suppressed as a whole. A group whose leader an earlier batch already
+    sent in the same window is coalesced into that leader without another delivery.
+    """
+    rows = claim_pending_alerts(session, batch_size)
+    if not rows:
+        session.commit()
+        return 0
+    pending, coalesced = fold_into_sent(coalesce(rows, window_seconds), sent_leaders(session, rows, window_seconds), window_seconds)
+    digests = {d.leader["alert_id"]: d for d in pending}
+    results = loop.run_until_complete(engine.deliver_batch(route(d, index) for d in digests.values()))
+    sent_ids, failed, unrouted = [], [], []
+    for leader_id, deliveries in results.items():
+        if not deliveries:
+            unrouted.extend(m["alert_id"] for m in digests[leader_id].members)
+            continue
+        for d in deliveries:
+            if not d.ok:
+                print(f"Failed to deliver alert {leader_id} via {d.channel} to {d.target} after {d.attempts} attempts: {d.error}")
+        if any(d.ok for d in deliveries):
+            sent_ids.append(leader_id)
+            coalesced.extend((m["alert_id"], leader_id) for m in digests[leader_id].coalesced)
+        else:
+            failed.extend(m["alert_id"] for m in digests[leader_id].members)
+    mark_sent(session, sent_ids)
+    mark_coalesced(session, coalesced)
+    mark_failed(session, failed)
+    mark_unrouted(session, unrouted)
+    session.commit()
+    return len(rows)
+
+
+def poll_and_dispatch(batch_size: int = ALERT_BATCH_SIZE):
+    # One event loop for the life of the process so channel connection pools stay warm between batches
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    engine = loop.run_until_complete(_build_engine())
+    try:
+        waiter = StreamWaiter("alerts") if ALERT_CDC_WAKE else None
+        _poll_forever(loop, engine, GeofenceIndex(), batch_size, waiter)
+    finally:
+        loop.run_until_complete(engine.aclose())
+        loop.close()
 
 
-def dispatch_alert(alert_row: dict):
-    # Placeholder: replace with integration to email/SMS/webhook
-    print(f"Dispatching alert {alert_row['alert_id']} severity={alert_row['alert_severity']} timestamp={alert_row['alert_timestamp']}")
+async def _build_engine() -> NotificationEngine:
+    # Channels create their pools/semaphores inside the running loop
+    return NotificationEngine(channels_from_env())
 
 
-def poll_and_dispatch():
+def _poll_forever(loop, engine: NotificationEngine, index: GeofenceIndex, batch_size: int, waiter: Optional[StreamWaiter] = None):
     while True:
         session = get_session()
         try:
-            rows = session.execute("SELECT alert_id, alert_severity, alert_timestamp FROM alerts WHERE alert_status = 'pending' ORDER BY alert_timestamp ASC LIMIT 20").mappings().all()
-            if rows:
-                for r in rows:
-                    dispatch_alert(r)
-                    session.execute("UPDATE alerts SET alert_status = 'sent' WHERE alert_id = %s", (r['alert_id'],))
-                session.commit()
-            else:
-                session.close()
-                time.sleep(ALERT_POLL_INTERVAL)
+            # Incremental: only subscriptions changed since the previous poll are re-indexed
+            index.sync(session)
+            claimed = dispatch_batch(session, loop, engine, index, batch_size)
+            # A full batch means there is likely more work waiting; poll again immediately
+            if claimed < batch_size:
+                if waiter is not None:
+                    waiter.wait(ALERT_POLL_INTERVAL)
+                else:
+                    time.sleep(ALERT_POLL_INTERVAL)
         except Exception as exc:
             session.rollback()
             print('Alert dispatcher error:', exc)
             time.sleep(5)
+        finally:
+            session.close()
 
 
 if __name__ == "__main__":
+    configure("dispatcher")
     poll_and_dispatch()
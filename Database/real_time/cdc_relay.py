@@ -0,0 +1,175 @@
+"""
+CDC relay: publishes the change events captured in `cdc_outbox` (migrations/V15__cdc_outbox.sql, V18) to the Redis
+streams rtmd:cdc:<table> (disaster_detection, alerts, credibility_assessment), one push source in place of readers
+polling those tables.
+- Triggers write each inserted row to the outbox in the inserting transaction, so an event is published exactly
+  when its row committed, and never for a rolled-back insert
+- Each entry carries the whole row as JSON (`row`; alerts also have their detection's type, confidence and post),
+  so consumers never re-query it
+- The relay claims a batch (FOR UPDATE SKIP LOCKED), XADDs it in one pipeline, deletes it and commits. A crash
+  between XADD and COMMIT publishes the batch again: delivery is at-least-once, consumers dedupe on `event_id`.
+  Run one relay per database; a second one is safe but may publish a stream slightly out of event_id order
+- It sleeps on LISTEN rtmd_cdc (a statement trigger on the outbox notifies at commit); CDC_POLL_INTERVAL only
+  bounds the wait if a notification is missed. If the LISTEN connection drops (e.g. a Postgres restart) the relay
+  polls every CDC_POLL_INTERVAL and opens a new listener on each wait until one succeeds
+- Streams are trimmed to about CDC_STREAM_MAXLEN entries
+
+Consumers read with XREAD / XREADGROUP; `StreamWaiter` wakes a loop that used to sleep between polls
+(real_time/alert_dispatcher.py with ALERT_CDC_WAKE=1).
+
+Run: python real_time/cdc_relay.py
+"""
+import json
+import os
+import select
+import time
+from typing import List, Optional
+
+import psycopg2
+import redis
+from sqlalchemy import text
+
+from python import db
+from python.db import configure, get_session
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+redis_client = redis.Redis.from_url(REDIS_URL)
+
+CDC_BATCH_SIZE = int(os.getenv("CDC_BATCH_SIZE", "500"))
+CDC_POLL_INTERVAL = float(os.getenv("CDC_POLL_INTERVAL", "5"))
+CDC_STREAM_MAXLEN = int(os.getenv("CDC_STREAM_MAXLEN", "100000"))
+CDC_CHANNEL = "rtmd_cdc"
+STREAM_PREFIX = "rtmd:cdc:"
+
+CLAIM_EVENTS_SQL = text(
+    """
+    SELECT event_id, table_name, op, payload, captured_at
+    FROM cdc_outbox
+    ORDER BY event_id
+    LIMIT :batch_size
+    FOR UPDATE SKIP LOCKED
+    """
+)
+
+DELETE_EVENTS_SQL = text("DELETE FROM cdc_outbox WHERE event_id = ANY(CAST(:event_ids AS bigint[]))")
+
+
+def stream_key(table: str) -> str:
+    return STREAM_PREFIX + table
+
+
+def to_entry(event) -> dict:
+    """Stream fields of one outbox row."""
+    return {
+        "event_id": str(event["event_id"]),
+        "op": event["op"],
+        "row": json.dumps(event["payload"], separators=(",", ":")),
+        "captured_at": event["captured_at"].isoformat(),
+    }
+
+
+def relay_batch(session, client: redis.Redis = redis_client, batch_size: int = CDC_BATCH_SIZE) -> int:
+    """Publish and delete one batch of outbox events. Returns the number published."""
+    events = session.execute(CLAIM_EVENTS_SQL, {"batch_size": batch_size}).mappings().all()
+    if not events:
+        session.commit()
+        return 0
+    pipe = client.pipeline(transaction=False)
+    for event in events:
+        pipe.xadd(stream_key(event["table_name"]), to_entry(event), maxlen=CDC_STREAM_MAXLEN, approximate=True)
+    pipe.execute()
+    session.execute(DELETE_EVENTS_SQL, {"event_ids": [e["event_id"] for e in events]})
+    session.commit()
+    return len(events)
+
+
+def read_events(table: str, last_id: str = "0-0", count: int = 100, block_ms: Optional[int] = None,
+                client: redis.Redis = redis_client) -> List[tuple]:
+    """(entry id, event) pairs after `last_id` on a table's stream; event["row"] is the decoded row."""
+    items = client.xread({stream_key(table): last_id}, count=count, block=block_ms)
+    events = []
+    for _, entries in items or []:
+        for entry_id, fields in entries:
+            event = {k.decode(): v.decode() for k, v in fields.items()}
+            event["event_id"] = int(event["event_id"])
+            event["row"] = json.loads(event["row"])
+            events.append((entry_id.decode(), event))
+    return events
+
+
+class StreamWaiter:
+    """Blocks until a table's stream has new entries or the timeout passes: a wake-up for polling loops."""
+
+    def __init__(self, table: str, client: redis.Redis = redis_client):
+        self._redis = client
+        self._stream = stream_key(table)
+        self._last_id = self._latest_id()
+
+    def _latest_id(self) -> bytes:
+        latest = self._redis.xrevrange(self._stream, count=1)
+        return latest[0][0] if latest else b"0-0"
+
+    def wait(self, timeout: float) -> bool:
+        """True if something was published since the previous wait."""
+        if not self._redis.xread({self._stream: self._last_id}, count=1, block=max(1, int(timeout * 1000))):
+            return False
+        self._last_id = self._latest_id()
+        return True
+
+
+def _listen():
+    # a pooled connection kept for the life of the process, outside any transaction
+    conn = db.engine.raw_connection()
+    conn.dbapi_connection.autocommit = True
+    with conn.dbapi_connection.cursor() as cur:
+        cur.execute(f"LISTEN {CDC_CHANNEL}")
+    return conn
+
+
+def _wait_for_notify(conn, timeout: float) -> None:
+    dbapi = conn.dbapi_connection
+    if select.select([dbapi], [], [], timeout)[0]:
+        dbapi.poll()
+        dbapi.notifies.clear()
+
+
+def _wait_or_reconnect(listener, timeout: float):
+    """Wait for a notification on `listener`, or sleep `timeout` while there is none. Returns the listener for the
+    next wait: a new one if the old connection failed, None while the database cannot be reached."""
+    if listener is None:
+        time.sleep(timeout)
+    else:
+        try:
+            _wait_for_notify(listener, timeout)
+            return listener
+        except (psycopg2.Error, OSError, ValueError) as exc:
+            print("CDC relay lost its LISTEN connection:", exc)
+            listener.invalidate()
+    try:
+        return _listen()
+    except Exception as exc:
+        print("CDC relay cannot LISTEN, polling every", timeout, "s:", exc)
+        return None
+
+
+def relay_forever(batch_size: int = CDC_BATCH_SIZE):
+    listener = _wait_or_reconnect(None, 0)
+    while True:
+        session = get_session()
+        try:
+            published = relay_batch(session, redis_client, batch_size)
+        except Exception as exc:
+            session.rollback()
+            print("CDC relay error:", exc)
+            time.sleep(5)
+            continue
+        finally:
+            session.close()
+        # A full batch means more events are waiting; otherwise sleep until the next commit notifies
+        if published < batch_size:
+            listener = _wait_or_reconnect(listener, CDC_POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    configure("cdc_relay")
+    relay_forever()
@@ -0,0 +1,110 @@
+"""
+Alert coalescing for the dispatcher.
+Pending alerts that share (disaster type, region, severity) and fall in the same time window are folded
+into one digest: the highest-confidence alert leads and carries the group count and top examples, the
+rest are marked 'coalesced' against it. Alerts without a region group by the ALERT_COALESCE_CELL_PRECISION
+geohash cell of their point instead (about 40 km at the default 4), so they never group country-wide.
+A digest is routed on every member's point (`Digest.points`), not just the leader's.
+
+The window is held open across polls: once a group's leader has been sent, alerts of the same group and window
+claimed in later batches are coalesced into that leader instead of producing another digest (`fold_into_sent`).
+
+Used by real_time/alert_dispatcher.py.
+"""
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from python import geohash
+
+ALERT_COALESCE_WINDOW = float(os.getenv("ALERT_COALESCE_WINDOW", "300"))
+ALERT_DIGEST_EXAMPLES = int(os.getenv("ALERT_DIGEST_EXAMPLES", "3"))
+ALERT_COALESCE_CELL_PRECISION = int(os.getenv("ALERT_COALESCE_CELL_PRECISION", "4"))
+
+
+@dataclass
+class Digest:
+    leader: dict
+    members: List[dict] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.members)
+
+    @property
+    def coalesced(self) -> List[dict]:
+        """Members other than the leader."""
+        return [m for m in self.members if m["alert_id"] != self.leader["alert_id"]]
+
+    @property
+    def points(self) -> List[Tuple[Optional[float], Optional[float]]]:
+        """Distinct member coordinates to route on; (None, None) when no member has any."""
+        points = [(m["latitude"], m["longitude"]) for m in self.members
+                  if m.get("latitude") is not None and m.get("longitude") is not None]
+        return list(dict.fromkeys(points)) or [(None, None)]
+
+    def payload(self, top_n: int = ALERT_DIGEST_EXAMPLES) -> dict:
+        """The leader row plus the group size and its `top_n` highest-confidence examples."""
+        examples = sorted(self.members, key=_rank)[:top_n]
+        payload = dict(self.leader)
+        payload["coalesced_count"] = self.count
+        payload["examples"] = [
+            {"alert_id": m["alert_id"], "alert_timestamp": m["alert_timestamp"], "fused_confidence": m.get("fused_confidence")}
+            for m in examples
+        ]
+        return payload
+
+
+def _rank(row) -> Tuple[float, datetime]:
+    # Highest confidence first, earliest first on ties
+    return (-(row.get("fused_confidence") or 0.0), row["alert_timestamp"])
+
+
+def _area(row):
+    # the region, or for alerts without one a coarse geohash cell of the point (None if there is no point either)
+    if row.get("region") is not None:
+        return row["region"]
+    if row.get("latitude") is None or row.get("longitude") is None:
+        return None
+    return ("cell", geohash.encode(row["latitude"], row["longitude"], ALERT_COALESCE_CELL_PRECISION))
+
+
+def coalesce_key(row, window_seconds: float = ALERT_COALESCE_WINDOW) -> tuple:
+    """Group key: (disaster type, region or cell, severity, window bucket). A window of 0 disables coalescing."""
+    if window_seconds <= 0:
+        return (row["alert_id"],)
+    bucket = int(row["alert_timestamp"].timestamp() // window_seconds)
+    return (row.get("disaster_type"), _area(row), row["alert_severity"], bucket)
+
+
+def window_start(row, window_seconds: float = ALERT_COALESCE_WINDOW) -> datetime:
+    """Start of the coalescing window an alert falls in."""
+    bucket = int(row["alert_timestamp"].timestamp() // window_seconds)
+    return datetime.fromtimestamp(bucket * window_seconds, tz=timezone.utc)
+
+
+def coalesce(rows: Iterable, window_seconds: float = ALERT_COALESCE_WINDOW) -> List[Digest]:
+    """Group claimed alert rows into digests, preserving the claim order of each group's first row."""
+    groups: Dict[tuple, List[dict]] = {}
+    for row in rows:
+        groups.setdefault(coalesce_key(row, window_seconds), []).append(dict(row))
+    return [Digest(leader=min(members, key=_rank), members=members) for members in groups.values()]
+
+
+def fold_into_sent(digests: List[Digest], sent_leaders: Iterable, window_seconds: float = ALERT_COALESCE_WINDOW) -> Tuple[List[Digest], List[tuple]]:
+    """Split off digests whose group already had a leader sent (by an earlier batch) in the same window.
+
+    Returns (digests still to deliver, (alert_id, leader_id) pairs to mark coalesced into the sent leaders).
+    """
+    leaders: Dict[tuple, object] = {}
+    for row in sent_leaders:
+        leaders.setdefault(coalesce_key(row, window_seconds), row["alert_id"])
+    remaining, folded = [], []
+    for digest in digests:
+        leader_id = leaders.get(coalesce_key(digest.leader, window_seconds))
+        if leader_id is None:
+            remaining.append(digest)
+        else:
+            folded.extend((m["alert_id"], leader_id) for m in digest.members)
+    return remaining, folded
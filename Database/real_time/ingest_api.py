@@ -1,12 +1,19 @@
 """
 FastAPI ingestion endpoint for RTMD.
 - Accepts POST requests with social post data
-- Inserts into `social_media_posts` with status 'queued'
-- Pushes `post_id` to Redis stream 'rtmd:posts' for workers to process
+- Inserts into `social_posts` (python/models.py Post) with status 'queued'
+- Pushes `post_id` and the ingest time to Redis stream 'rtmd:posts' for workers to process. The ingest time is the
+  post's ingestion_timestamp, so the worker looks the post up by its full key (one partition); it is also carried
+  through to the alert for end-to-end latency tracking
+- An optional `region` and `latitude`/`longitude` (e.g. the platform's geotag) travel on the stream event; the
+  worker puts them on the alert, which is what subscription routing (real_time/geofence.py) and coalescing match on.
+  Posts without them can only reach global subscriptions
+- `language` and the client `timestamp` (the platform's post time, stored as posted_at; UTC if it has no offset)
+  are kept on the post
 
 Run: `uvicorn real_time.ingest_api:app --reload --host 0.0.0.0 --port 8000`
 """
-from datetime import datetime
+from datetime import datetime, timezone
 import os
 import json
 from typing import Optional
@@ -15,8 +22,10 @@ import redis
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 
-from python.db import get_session
-from python.models import SocialMediaPost
+from python.db import configure, get_session
+from python.models import Post
+
+configure("ingest")
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 redis_client = redis.Redis.from_url(REDIS_URL)
@@ -29,33 +38,46 @@ class IngestPost(BaseModel):
     post_text: Optional[str] = Field(None, example="Smoke seen near riverbank")
     post_image: Optional[str] = Field(None, example="https://example.org/image.jpg")
     language: Optional[str] = Field(None, example="en")
+    source_post_id: Optional[str] = Field(None, example="1780000000000000000")
     timestamp: Optional[datetime] = None
+    region: Optional[str] = Field(None, max_length=128, example="Colombo")
+    latitude: Optional[float] = Field(None, ge=-90, le=90, example=6.9271)
+    longitude: Optional[float] = Field(None, ge=-180, le=180, example=79.8612)
 
 
 @app.post("/ingest", status_code=201)
 def ingest(post: IngestPost):
-    payload = post.dict()
-    payload["timestamp"] = payload.get("timestamp") or datetime.utcnow().isoformat()
+    ingested_at = datetime.now(timezone.utc)
+    if (post.latitude is None) != (post.longitude is None):
+        raise HTTPException(status_code=422, detail="latitude and longitude must be given together")
+    posted_at = post.timestamp
+    if posted_at is not None and posted_at.tzinfo is None:
+        posted_at = posted_at.replace(tzinfo=timezone.utc)
 
     # Insert into DB
     session = get_session()
     try:
-        smp = SocialMediaPost(
-            post_text=payload.get("post_text"),
-            post_image=payload.get("post_image"),
-            language=payload.get("language"),
-            platform=payload.get("platform"),
-            timestamp=payload.get("timestamp"),
+        row = Post(
+            source_platform=post.platform,
+            source_post_id=post.source_post_id,
+            posted_at=posted_at,
+            language=post.language,
+            text_content=post.post_text,
+            image_reference=post.post_image,
+            processing_status="queued",
+            ingestion_timestamp=ingested_at,
         )
-        session.add(smp)
+        session.add(row)
         session.commit()
-        session.refresh(smp)
 
         # Push to Redis stream for processing
-        event = {"post_id": str(smp.post_id), "platform": smp.platform}
+        event = {"post_id": str(row.post_id), "platform": row.source_platform, "ingested_at": ingested_at.isoformat()}
+        for key in ("region", "latitude", "longitude"):
+            if getattr(post, key) is not None:
+                event[key] = str(getattr(post, key))
         redis_client.xadd("rtmd:posts", event)
 
-        return {"post_id": str(smp.post_id)}
+        return {"post_id": str(row.post_id)}
     except Exception as exc:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(exc))
@@ -0,0 +1,96 @@
+"""
+Prometheus exporter for end-to-end alert latency.
+- Reads the pipeline timestamps stamped on `alerts` (ingested_at, dequeued_at, inferred_at, alert_timestamp)
+  and the sent time from the 'sent'/'coalesced' row in `alert_state_log`
+- Publishes p50/p95/p99 latency per hop over alerts sent in the last LATENCY_WINDOW seconds, so a regression
+  can be attributed to the API/queue, inference, alert creation or dispatch
+- Percentiles are computed in Postgres (percentile_cont) with one query per refresh
+
+Run: python real_time/latency_exporter.py --port 9108
+"""
+import argparse
+import os
+import time
+from typing import Dict, Tuple
+
+from prometheus_client import Gauge, start_http_server
+from sqlalchemy import text
+
+from python.db import get_session
+
+LATENCY_WINDOW = float(os.getenv("LATENCY_WINDOW", "300"))
+LATENCY_REFRESH_INTERVAL = float(os.getenv("LATENCY_REFRESH_INTERVAL", "15"))
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# hop -> (start column, end column); l.ts is when the alert was sent (or folded into a sent digest)
+HOPS: Dict[str, Tuple[str, str]] = {
+    "ingest_to_dequeue": ("a.ingested_at", "a.dequeued_at"),
+    "dequeue_to_inference": ("a.dequeued_at", "a.inferred_at"),
+    "inference_to_alert": ("a.inferred_at", "a.alert_timestamp"),
+    "alert_to_sent": ("a.alert_timestamp", "l.ts"),
+    "end_to_end": ("a.ingested_at", "l.ts"),
+}
+
+HOP_LATENCY = Gauge("rtmd_alert_hop_latency_seconds", "Alert pipeline latency per hop over the exporter window", ["hop", "quantile"])
+HOP_SAMPLES = Gauge("rtmd_alert_hop_samples", "Alerts with both timestamps of the hop in the exporter window", ["hop"])
+
+
+def _latency_sql() -> str:
+    columns = []
+    for hop, (start, end) in HOPS.items():
+        seconds = f"EXTRACT(EPOCH FROM ({end} - {start}))"
+        quantiles = ", ".join(str(q) for q in QUANTILES)
+        columns.append(f"percentile_cont(ARRAY[{quantiles}]) WITHIN GROUP (ORDER BY {seconds}) AS {hop}")
+        columns.append(f"count({seconds}) AS {hop}_n")
+    # The ts filter prunes alert_state_log to its newest partition(s); the join on the full alert key, bounded below
+    # by the oldest alert sent in the window, prunes alerts to the partitions those alerts were created in
+    return (
+        "WITH sent AS (\n  SELECT alert_id, alert_timestamp, ts FROM alert_state_log"
+        + "\n  WHERE state IN ('sent', 'coalesced') AND ts >= now() - make_interval(secs => :window)\n)"
+        + "\nSELECT " + ",\n       ".join(columns)
+        + "\nFROM sent l\nJOIN alerts a ON a.alert_id = l.alert_id AND a.alert_timestamp = l.alert_timestamp"
+        + "\nWHERE a.alert_timestamp >= (SELECT min(alert_timestamp) FROM sent)"
+    )
+
+
+LATENCY_SQL = text(_latency_sql())
+
+
+def collect(session, window_seconds: float = LATENCY_WINDOW) -> Dict[str, dict]:
+    """{hop: {"samples": n, "quantiles": {q: seconds}}} for alerts sent within the window."""
+    row = session.execute(LATENCY_SQL, {"window": window_seconds}).mappings().one()
+    stats = {}
+    for hop in HOPS:
+        values = row[hop] or []
+        stats[hop] = {"samples": row[f"{hop}_n"], "quantiles": dict(zip(QUANTILES, values))}
+    return stats
+
+
+def publish(stats: Dict[str, dict]) -> None:
+    for hop, hop_stats in stats.items():
+        HOP_SAMPLES.labels(hop=hop).set(hop_stats["samples"])
+        for q in QUANTILES:
+            value = hop_stats["quantiles"].get(q)
+            HOP_LATENCY.labels(hop=hop, quantile=str(q)).set(value if value is not None else float("nan"))
+
+
+def run(port: int) -> None:
+    start_http_server(port)
+    print(f"Latency exporter listening on :{port} (window={LATENCY_WINDOW}s)")
+    while True:
+        session = get_session(readonly=True)
+        try:
+            publish(collect(session))
+        except Exception as exc:
+            print("Latency exporter error:", exc)
+        finally:
+            session.close()
+        time.sleep(LATENCY_REFRESH_INTERVAL)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=int(os.getenv("LATENCY_EXPORTER_PORT", "9108")))
+    args = parser.parse_args()
+    run(args.port)
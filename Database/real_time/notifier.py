@@ -0,0 +1,242 @@
+"""
+Async fan-out delivery engine for claimed alerts.
+- Each channel adapter (webhook, email) owns a keep-alive connection pool and a concurrency limit
+- Every (alert, recipient) delivery is its own task with a timeout and exponential-backoff retries,
+  so one slow recipient never holds back the rest of the batch
+- SMS gateways are HTTP APIs and are configured as webhook targets
+
+Used by real_time/alert_dispatcher.py. Channels are configured from environment variables (see `channels_from_env`).
+For local testing run the stub receivers: python real_time/stub_receivers.py
+"""
+import asyncio
+import json
+import os
+import random
+import smtplib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import ClassVar, Dict, Iterable, List, Optional
+
+import httpx
+
+ALERT_DELIVERY_TIMEOUT = float(os.getenv("ALERT_DELIVERY_TIMEOUT", "5"))
+ALERT_DELIVERY_RETRIES = int(os.getenv("ALERT_DELIVERY_RETRIES", "3"))
+ALERT_BACKOFF_BASE = float(os.getenv("ALERT_BACKOFF_BASE", "0.5"))
+ALERT_BACKOFF_MAX = float(os.getenv("ALERT_BACKOFF_MAX", "10"))
+
+
+@dataclass
+class Delivery:
+    alert_id: object
+    channel: str
+    target: str
+    ok: bool
+    attempts: int
+    error: Optional[str] = None
+
+
+def alert_payload(alert) -> dict:
+    """JSON-safe copy of an alert row (UUIDs and timestamps become strings), without its routing list."""
+    body = {k: v for k, v in dict(alert).items() if k != "recipients"}
+    return json.loads(json.dumps(body, default=str))
+
+
+@dataclass
+class Channel(ABC):
+    """Base channel adapter: bounded concurrency, per-attempt timeout, exponential backoff with jitter."""
+    targets: List[str]
+    concurrency: int = 10
+    timeout: float = ALERT_DELIVERY_TIMEOUT
+    max_retries: int = ALERT_DELIVERY_RETRIES
+    backoff_base: float = ALERT_BACKOFF_BASE
+    backoff_max: float = ALERT_BACKOFF_MAX
+    name: ClassVar[str] = "base"
+
+    def __post_init__(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    def targets_for(self, alert) -> List[str]:
+        """Static targets plus any subscribers routed to this channel for the alert (see real_time/geofence.py)."""
+        routed = [r.target for r in alert.get("recipients", ()) if r.channel == self.name]
+        return list(dict.fromkeys(self.targets + routed))
+
+    @abstractmethod
+    async def send(self, alert, target: str) -> None:
+        """Deliver one alert to one target; raise on failure."""
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def deliver(self, alert, target: str) -> Delivery:
+        error = None
+        attempts = 0
+        for attempt in range(self.max_retries + 1):
+            attempts = attempt + 1
+            # Hold a concurrency slot only while sending, not while backing off
+            async with self._semaphore:
+                try:
+                    await asyncio.wait_for(self.send(alert, target), self.timeout)
+                    return Delivery(alert["alert_id"], self.name, target, True, attempts)
+                except asyncio.TimeoutError:
+                    error = f"timed out after {self.timeout}s"
+                except Exception as exc:
+                    error = str(exc) or exc.__class__.__name__
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.backoff(attempt))
+        return Delivery(alert["alert_id"], self.name, target, False, attempts, error)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class LogChannel(Channel):
+    """Prints alerts to stdout; used when no real channel is configured."""
+    name = "log"
+
+    async def send(self, alert, target: str) -> None:
+        print(f"Dispatching alert {alert['alert_id']} severity={alert['alert_severity']} timestamp={alert['alert_timestamp']} count={alert.get('coalesced_count', 1)}")
+
+
+class WebhookChannel(Channel):
+    """POSTs the alert as JSON to each target URL over a shared keep-alive connection pool."""
+    name = "webhook"
+
+    def __post_init__(self):
+        super().__post_init__()
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        self._client = httpx.AsyncClient(limits=limits, timeout=self.timeout)
+
+    async def send(self, alert, target: str) -> None:
+        body = json.dumps(alert_payload(alert))
+        resp = await self._client.post(target, content=body, headers={"Content-Type": "application/json"})
+        resp.raise_for_status()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _dropped(exc: BaseException) -> bool:
+    """The server closed the connection (idle timeout, restart, or a 421 reply to the next command)."""
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code == 421
+    return isinstance(exc, (smtplib.SMTPServerDisconnected, ConnectionError))
+
+
+@dataclass
+class SmtpChannel(Channel):
+    """Emails each target address, reusing open SMTP connections across deliveries.
+
+    smtplib is blocking, so each send runs start to finish in one worker thread, which also returns
+    the connection to the idle list or closes it: a timed-out send is abandoned, but its connection
+    is never touched from two threads. The concurrency limit also caps the number of open SMTP
+    connections (briefly exceeded while abandoned sends finish). A pooled connection the server
+    dropped while idle is replaced once within the same attempt.
+    """
+    host: str = "localhost"
+    port: int = 25
+    sender: str = "alerts@rtmd.local"
+    username: Optional[str] = None
+    password: Optional[str] = None
+    name: ClassVar[str] = "email"
+
+    def __post_init__(self):
+        super().__post_init__()
+        self._idle: List[smtplib.SMTP] = []
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.username:
+            conn.starttls()
+            conn.login(self.username, self.password or "")
+        return conn
+
+    def _message(self, alert, target: str) -> EmailMessage:
+        msg = EmailMessage()
+        msg["From"] = self.sender
+        msg["To"] = target
+        msg["Subject"] = f"[RTMD] {alert['alert_severity']} alert {alert['alert_id']}"
+        msg.set_content(json.dumps(alert_payload(alert), indent=2))
+        return msg
+
+    def _send_blocking(self, msg: EmailMessage) -> None:
+        pooled = bool(self._idle)
+        conn = self._idle.pop() if pooled else self._connect()
+        while True:
+            try:
+                conn.send_message(msg)
+                break
+            except BaseException as exc:
+                # Broken connection: never hand it to another delivery
+                conn.close()
+                if not (pooled and _dropped(exc)):
+                    raise
+            pooled = False
+            conn = self._connect()
+        self._idle.append(conn)
+
+    async def send(self, alert, target: str) -> None:
+        await asyncio.to_thread(self._send_blocking, self._message(alert, target))
+
+    async def aclose(self) -> None:
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            try:
+                await asyncio.to_thread(conn.quit)
+            except smtplib.SMTPException:
+                conn.close()
+
+
+class NotificationEngine:
+    """Fans a batch of alerts out to every channel/target concurrently."""
+
+    def __init__(self, channels: Iterable[Channel]):
+        self.channels = list(channels)
+
+    async def deliver_batch(self, alerts: Iterable) -> Dict[object, List[Delivery]]:
+        alerts = list(alerts)
+        tasks = [
+            channel.deliver(alert, target)
+            for alert in alerts
+            for channel in self.channels
+            for target in channel.targets_for(alert)
+        ]
+        results: Dict[object, List[Delivery]] = {alert["alert_id"]: [] for alert in alerts}
+        for delivery in await asyncio.gather(*tasks):
+            results[delivery.alert_id].append(delivery)
+        return results
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(channel.aclose() for channel in self.channels))
+
+
+def _split(value: str) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def channels_from_env() -> List[Channel]:
+    """Build channels from ALERT_WEBHOOK_URLS / ALERT_EMAIL_TO (+ ALERT_SMTP_*); falls back to stdout logging.
+
+    ALERT_CHANNELS (e.g. "webhook,email") enables a channel without static targets, so it only
+    delivers to subscribers routed to it.
+    """
+    enabled = set(_split(os.getenv("ALERT_CHANNELS", "")))
+    channels: List[Channel] = []
+    webhook_urls = _split(os.getenv("ALERT_WEBHOOK_URLS", ""))
+    if webhook_urls or WebhookChannel.name in enabled:
+        channels.append(WebhookChannel(webhook_urls, concurrency=int(os.getenv("ALERT_WEBHOOK_CONCURRENCY", "50"))))
+    email_to = _split(os.getenv("ALERT_EMAIL_TO", ""))
+    if email_to or SmtpChannel.name in enabled:
+        channels.append(SmtpChannel(
+            email_to,
+            concurrency=int(os.getenv("ALERT_SMTP_CONCURRENCY", "5")),
+            host=os.getenv("ALERT_SMTP_HOST", "localhost"),
+            port=int(os.getenv("ALERT_SMTP_PORT", "25")),
+            sender=os.getenv("ALERT_EMAIL_FROM", "alerts@rtmd.local"),
+            username=os.getenv("ALERT_SMTP_USER"),
+            password=os.getenv("ALERT_SMTP_PASSWORD"),
+        ))
+    if not channels:
+        channels.append(LogChannel(["stdout"]))
+    return channels
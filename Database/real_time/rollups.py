@@ -0,0 +1,197 @@
+"""
+Incremental refresher and query helpers for the dashboard rollups (dashboard_rollup_1m / dashboard_rollup_1h).
+- Each source table (disaster_detection, alerts, credibility_assessment) is folded in commit order: every row
+  records the transaction that wrote it (rollup_xid, migrations/V17__rollup_commit_order.sql), and a refresh takes
+  the rows from the watermark (rollup_watermarks.processed_xid) up to the xmin of its snapshot. Every transaction
+  below that xmin has finished, so a row is counted exactly once however late it commits or however old its
+  timestamp is; an open transaction only delays the rows written after it. The BRIN rollup_xid indexes keep the
+  cost tracking new rows, not history. Joins to parent rows use their full composite key (id, partition
+  timestamp), so each probe reads one partition
+- One statement per refresh aggregates the delta once and upserts it into both grains; the watermark advances in
+  the same transaction, so a delta is applied exactly once even with several refreshers running
+- Dashboard queries read only the rollups, so their cost depends on the time window, not on history size
+
+Run: python real_time/rollups.py --loop --interval 60
+"""
+import argparse
+import os
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+from python.db import get_session
+
+ROLLUP_MINUTE_RETENTION_DAYS = float(os.getenv("ROLLUP_MINUTE_RETENTION_DAYS", "7"))
+
+KEYS = ("bucket", "disaster_type", "platform", "severity")
+METRICS = ("detections", "fused_confidence_sum", "high_confidence_detections", "alerts", "credibility_assessments", "credibility_score_sum")
+
+
+def _minute(column: str) -> str:
+    # Buckets are aligned in UTC regardless of the session time zone (Asia/Colombo is UTC+05:30)
+    return f"date_trunc('minute', {column} AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+
+
+# source -> delta query returning KEYS + METRICS at minute grain for the rows written by transactions [lo, hi)
+SOURCES: Dict[str, str] = {
+    "disaster_detection": f"""
+        SELECT {_minute('d.detection_timestamp')} AS bucket, d.disaster_type, COALESCE(p.source_platform, '') AS platform, '' AS severity,
+               count(*) AS detections, sum(d.fused_confidence) AS fused_confidence_sum,
+               count(*) FILTER (WHERE d.fused_confidence >= 0.8) AS high_confidence_detections,
+               0 AS alerts, 0 AS credibility_assessments, 0 AS credibility_score_sum
+        FROM disaster_detection d
+        LEFT JOIN social_posts p ON p.post_id = d.post_id AND p.ingestion_timestamp = d.post_ingested_at
+        WHERE d.rollup_xid >= :lo AND d.rollup_xid < :hi
+        GROUP BY 1, 2, 3
+        """,
+    "alerts": f"""
+        SELECT {_minute('a.alert_timestamp')} AS bucket, COALESCE(d.disaster_type, '') AS disaster_type,
+               COALESCE(p.source_platform, '') AS platform, a.alert_severity AS severity,
+               0 AS detections, 0 AS fused_confidence_sum, 0 AS high_confidence_detections,
+               count(*) AS alerts, 0 AS credibility_assessments, 0 AS credibility_score_sum
+        FROM alerts a
+        LEFT JOIN disaster_detection d ON d.detection_id = a.detection_id AND d.detection_timestamp = a.detection_timestamp
+        LEFT JOIN social_posts p ON p.post_id = d.post_id AND p.ingestion_timestamp = d.post_ingested_at
+        WHERE a.rollup_xid >= :lo AND a.rollup_xid < :hi
+        GROUP BY 1, 2, 3, 4
+        """,
+    "credibility_assessment": f"""
+        SELECT {_minute('c.assessment_timestamp')} AS bucket, '' AS disaster_type, COALESCE(p.source_platform, '') AS platform, '' AS severity,
+               0 AS detections, 0 AS fused_confidence_sum, 0 AS high_confidence_detections, 0 AS alerts,
+               count(*) AS credibility_assessments, sum(c.credibility_score) AS credibility_score_sum
+        FROM credibility_assessment c
+        LEFT JOIN social_posts p ON p.post_id = c.post_id AND p.ingestion_timestamp = c.post_ingested_at
+        WHERE c.rollup_xid >= :lo AND c.rollup_xid < :hi
+        GROUP BY 1, 3
+        """,
+}
+
+
+def _upsert_sql(delta: str) -> str:
+    """Fold one minute-grain delta into both rollup tables with a single scan of the source."""
+    columns = ", ".join(KEYS + METRICS)
+    conflict = ", ".join(KEYS)
+    increments = ", ".join(f"{m} = r.{m} + EXCLUDED.{m}" for m in METRICS)
+    sums = ", ".join(f"sum({m})" for m in METRICS)
+    return f"""
+    WITH delta AS ({delta}),
+    minute AS (
+      INSERT INTO dashboard_rollup_1m AS r ({columns})
+      SELECT {columns} FROM delta
+      ON CONFLICT ({conflict}) DO UPDATE SET {increments}
+    )
+    INSERT INTO dashboard_rollup_1h AS r ({columns})
+    SELECT date_trunc('hour', bucket AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', disaster_type, platform, severity, {sums}
+    FROM delta
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT ({conflict}) DO UPDATE SET {increments}
+    """
+
+
+UPSERT_SQL = {source: text(_upsert_sql(delta)) for source, delta in SOURCES.items()}
+
+CLAIM_WATERMARK_SQL = text("SELECT COALESCE(processed_xid, 0) FROM rollup_watermarks WHERE source = :source FOR UPDATE")
+# A first run folds in every row (from transaction 0)
+INIT_WATERMARK_SQL = text(
+    "INSERT INTO rollup_watermarks (source, processed_until, processed_xid) VALUES (:source, now(), 0) ON CONFLICT (source) DO NOTHING"
+)
+# Every transaction below this id has committed or aborted
+SNAPSHOT_XMIN_SQL = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+ADVANCE_WATERMARK_SQL = text("UPDATE rollup_watermarks SET processed_xid = :hi, processed_until = now() WHERE source = :source")
+PRUNE_MINUTES_SQL = text("DELETE FROM dashboard_rollup_1m WHERE bucket < now() - make_interval(secs => :seconds)")
+
+
+def refresh_source(session, source: str) -> int:
+    """Fold the rows of one source committed since the previous refresh into the rollups. Returns 1 if there was
+    anything new to fold, else 0."""
+    lo = session.execute(CLAIM_WATERMARK_SQL, {"source": source}).scalar()
+    if lo is None:
+        session.execute(INIT_WATERMARK_SQL, {"source": source})
+        session.commit()
+        lo = session.execute(CLAIM_WATERMARK_SQL, {"source": source}).scalar()
+    hi = session.execute(SNAPSHOT_XMIN_SQL).scalar()
+    if hi <= lo:
+        session.commit()
+        return 0
+    session.execute(UPSERT_SQL[source], {"lo": lo, "hi": hi})
+    session.execute(ADVANCE_WATERMARK_SQL, {"source": source, "hi": hi})
+    session.commit()
+    return 1
+
+
+def refresh_all(session) -> Dict[str, int]:
+    return {source: refresh_source(session, source) for source in SOURCES}
+
+
+def prune_minutes(session, retention_days: float = ROLLUP_MINUTE_RETENTION_DAYS) -> int:
+    """Drop 1-minute buckets older than the retention; the 1-hour rollup keeps the long history."""
+    deleted = session.execute(PRUNE_MINUTES_SQL, {"seconds": retention_days * 86400}).rowcount
+    session.commit()
+    return deleted
+
+
+# --- dashboard queries (rollups only) ---
+
+def detections_per_hour(session, hours: int = 24, disaster_type: Optional[str] = None) -> List[dict]:
+    sql = """
+        SELECT bucket, disaster_type, sum(detections) AS detections, sum(high_confidence_detections) AS high_confidence
+        FROM dashboard_rollup_1h
+        WHERE bucket >= now() - make_interval(hours => :hours) AND detections > 0
+    """
+    params = {"hours": hours}
+    if disaster_type:
+        sql += " AND disaster_type = :disaster_type"
+        params["disaster_type"] = disaster_type
+    sql += " GROUP BY bucket, disaster_type ORDER BY bucket, disaster_type"
+    return [dict(r) for r in session.execute(text(sql), params).mappings()]
+
+
+def alerts_per_severity(session, minutes: int = 60) -> Dict[str, int]:
+    rows = session.execute(
+        text(
+            """
+            SELECT severity, sum(alerts) AS alerts FROM dashboard_rollup_1m
+            WHERE bucket >= now() - make_interval(mins => :minutes) AND alerts > 0
+            GROUP BY severity
+            """
+        ),
+        {"minutes": minutes},
+    )
+    return {severity: int(count) for severity, count in rows}
+
+
+def mean_credibility_by_platform(session, hours: int = 24) -> Dict[str, float]:
+    rows = session.execute(
+        text(
+            """
+            SELECT platform, sum(credibility_score_sum) / sum(credibility_assessments) AS mean_score
+            FROM dashboard_rollup_1h
+            WHERE bucket >= now() - make_interval(hours => :hours) AND credibility_assessments > 0
+            GROUP BY platform
+            """
+        ),
+        {"hours": hours},
+    )
+    return {platform: float(score) for platform, score in rows}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--loop", action="store_true", help="keep refreshing every --interval seconds")
+    parser.add_argument("--interval", type=float, default=60)
+    args = parser.parse_args()
+    while True:
+        session = get_session()
+        try:
+            applied = refresh_all(session)
+            pruned = prune_minutes(session)
+            print(f"Rollups refreshed: {applied}; pruned {pruned} minute buckets")
+        except Exception as exc:
+            session.rollback()
+            print("Rollup refresh error:", exc)
+        finally:
+            session.close()
+        if not args.loop:
+            break
+        time.sleep(args.interval)
@@ -0,0 +1,155 @@
+"""
+Local stub webhook (HTTP/1.1 keep-alive) and SMTP servers for exercising real_time/notifier.py.
+- Both servers record what they receive and count accepted connections (to check pooling)
+- The webhook stub can delay or fail specific paths to simulate slow or flaky recipients
+
+Run: python real_time/stub_receivers.py --http-port 8025 --smtp-port 8026
+"""
+import argparse
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+
+class _StubServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._on_connect, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            await self.handle(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        raise NotImplementedError
+
+
+class StubWebhookServer(_StubServer):
+    """Accepts POSTs on any path; `delays` maps path -> seconds, `failures` maps path -> number of 500s to return first."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delays: Optional[Dict[str, float]] = None, failures: Optional[Dict[str, int]] = None):
+        super().__init__(host, port)
+        self.delays = dict(delays or {})
+        self.failures = dict(failures or {})
+        self.received: List[dict] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def handle(self, reader, writer) -> None:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            _, path, _ = request_line.decode().split(" ", 2)
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode().strip()
+                if not line:
+                    break
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            if self.delays.get(path):
+                await asyncio.sleep(self.delays[path])
+            if self.failures.get(path, 0) > 0:
+                self.failures[path] -= 1
+                status = "500 Internal Server Error"
+            else:
+                status = "200 OK"
+                self.received.append({"path": path, "body": json.loads(body or b"null")})
+
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\nConnection: keep-alive\r\n\r\n".encode())
+            await writer.drain()
+            if headers.get("connection", "").lower() == "close":
+                return
+
+
+class StubSmtpServer(_StubServer):
+    """Minimal SMTP receiver: enough of EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP and QUIT for smtplib."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(host, port)
+        self.messages: List[dict] = []
+
+    async def handle(self, reader, writer) -> None:
+        async def reply(line: str):
+            writer.write((line + "\r\n").encode())
+            await writer.drain()
+
+        await reply("220 rtmd-stub ESMTP")
+        sender, recipients = None, []
+        while True:
+            raw = await reader.readline()
+            if not raw:
+                return
+            command = raw.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                await reply("250 rtmd-stub")
+            elif verb == "MAIL":
+                sender, recipients = command.split(":", 1)[1].strip(), []
+                await reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command.split(":", 1)[1].strip())
+                await reply("250 OK")
+            elif verb == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = await reader.readline()
+                    if line in (b".\r\n", b".\n", b""):
+                        break
+                    lines.append(line.decode())
+                self.messages.append({"from": sender, "to": recipients, "data": "".join(lines)})
+                sender, recipients = None, []
+                await reply("250 OK queued")
+            elif verb in ("RSET", "NOOP"):
+                await reply("250 OK")
+            elif verb == "QUIT":
+                await reply("221 Bye")
+                return
+            else:
+                await reply("502 Command not implemented")
+
+
+async def _serve(http_port: int, smtp_port: int) -> None:
+    webhook = StubWebhookServer(port=http_port)
+    smtp = StubSmtpServer(port=smtp_port)
+    await webhook.start()
+    await smtp.start()
+    print(f"Stub webhook listening on {webhook.url}, stub SMTP on {smtp.host}:{smtp.port}")
+    try:
+        while True:
+            await asyncio.sleep(30)
+            print(f"webhook received={len(webhook.received)} conns={webhook.connections}; smtp messages={len(smtp.messages)} conns={smtp.connections}")
+    finally:
+        await webhook.close()
+        await smtp.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--http-port", type=int, default=8025)
+    parser.add_argument("--smtp-port", type=int, default=8026)
+    args = parser.parse_args()
+    asyncio.run(_serve(args.http_port, args.smtp_port))
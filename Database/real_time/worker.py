@@ -1,7 +1,14 @@
 """
 Worker that consumes Redis Stream 'rtmd:posts', runs mock detection/credibility, and writes results.
 - Uses XREADGROUP to form consumer groups (idempotent processing)
-- Performs DB writes in a transaction for each post
+- Performs DB writes in a transaction for each post, on the partitioned tables (python/models.py Post,
+  CredibilityAssessment, DisasterDetection, Alert)
+- Looks the post up by its full key (post_id, ingested_at from the stream event), so only one partition of
+  social_posts is read; new rows take the parent's timestamp for their composite foreign keys
+- Stamps dequeue and inference times on alerts (with the ingest time from the stream event)
+  so real_time/latency_exporter.py can report per-hop latency
+- Copies the post's region and coordinates from the stream event (real_time/ingest_api.py) onto the alert, and
+  files them as the Disaster's location. Alerts without them are routed only to global subscriptions
 
 Run: python real_time/worker.py --group worker-group --consumer worker-1
 """
@@ -10,15 +17,14 @@ import time
 import json
 import random
 import argparse
-from typing import Tuple
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
 
 import redis
 from sqlalchemy import select
 
-from python.db import get_session
-from python.models import SocialMediaPost, Result, Credibility, Disaster, Alert  # Alert may not exist; we'll create alerts via table insert
-
-# Note: the models currently use `alerts` table in earlier schema; import if present
+from python.db import configure, get_session
+from python.models import Alert, CredibilityAssessment, Disaster, DisasterDetection, Location, Post
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 redis_client = redis.Redis.from_url(REDIS_URL)
@@ -26,6 +32,7 @@ STREAM_KEY = "rtmd:posts"
 
 # Thresholds - tune per your application
 ALERT_CONFIDENCE_THRESHOLD = float(os.getenv("ALERT_CONFIDENCE_THRESHOLD", "0.8"))
+CREDIBILITY_THRESHOLD = float(os.getenv("CREDIBILITY_THRESHOLD", "0.5"))
 
 
 def mock_disaster_detection(post_text: str) -> Tuple[str, float]:
@@ -50,44 +57,89 @@ def ensure_consumer_group():
         pass
 
 
+def _parse_ts(raw: Optional[bytes]) -> Optional[datetime]:
+    return datetime.fromisoformat(raw.decode()) if raw else None
+
+
+def event_location(values: dict) -> Dict[str, object]:
+    """region / latitude / longitude carried on a stream event, only those that are set."""
+    location = {}
+    if values.get(b"region"):
+        location["region"] = values[b"region"].decode()
+    if values.get(b"latitude") and values.get(b"longitude"):
+        location["latitude"] = float(values[b"latitude"])
+        location["longitude"] = float(values[b"longitude"])
+    return location
+
+
+def credibility_label(score: float) -> str:
+    if score >= CREDIBILITY_THRESHOLD:
+        return "credible"
+    return "questionable" if score >= CREDIBILITY_THRESHOLD / 2 else "misinformation"
+
+
+def load_post(session, post_id, ingested_at: Optional[datetime]) -> Optional[Post]:
+    stmt = select(Post).where(Post.post_id == post_id)
+    if ingested_at is not None:
+        # ingested_at is the post's ingestion_timestamp: the full key, one partition
+        stmt = stmt.where(Post.ingestion_timestamp == ingested_at)
+    return session.execute(stmt).scalars().first()
+
+
+def write_results(session, post: Post, disaster_label: Optional[str], conf: float, cred_score: float,
+                  ingested_at: Optional[datetime], dequeued_at: datetime, inferred_at: datetime,
+                  location: Optional[dict] = None) -> None:
+    """Add the assessment, detection and (above ALERT_CONFIDENCE_THRESHOLD) alert for a post; the caller commits.
+    `location` (event_location) is put on the alert and the disaster."""
+    location = location or {}
+    session.add(CredibilityAssessment(
+        post=post, credibility_score=cred_score, credibility_label=credibility_label(cred_score), threshold_value=CREDIBILITY_THRESHOLD,
+    ))
+    if disaster_label:
+        detection = DisasterDetection(
+            post=post, disaster_type=disaster_label, text_confidence=conf, image_confidence=0.0, fused_confidence=conf,
+        )
+        session.add(detection)
+
+        # If high confidence, record the Disaster (map markers, python/geo.py) and insert an alert
+        if conf >= ALERT_CONFIDENCE_THRESHOLD:
+            disaster = Disaster(disaster_type=disaster_label, severity="high", confidence_score=conf, status="active")
+            if location:
+                name = location.get("region") or f"{location['latitude']:.4f},{location['longitude']:.4f}"
+                disaster.locations.append(Location(name=name, latitude=location.get("latitude"), longitude=location.get("longitude")))
+            session.add(disaster)
+            # alert_timestamp (alert created) is set client-side at the INSERT, after inference
+            session.add(Alert(
+                detection=detection, alert_severity="high", alert_status="pending",
+                ingested_at=ingested_at, dequeued_at=dequeued_at, inferred_at=inferred_at, **location,
+            ))
+    post.processing_status = "processed"
+
+
 def process_message(message_id: str, values: dict):
+    dequeued_at = datetime.now(timezone.utc)
     post_id = values.get(b"post_id").decode()
+    ingested_at = _parse_ts(values.get(b"ingested_at"))
+    location = event_location(values)
 
     session = get_session()
     try:
-        stmt = select(SocialMediaPost).where(SocialMediaPost.post_id == post_id)
-        post = session.execute(stmt).scalars().first()
+        post = load_post(session, post_id, ingested_at)
         if not post:
             print(f"Post {post_id} not found; skipping")
             return
+        if post.processing_status == "processed":
+            # redelivered after a crash between commit and XACK
+            print(f"Post {post_id} already processed; skipping")
+            return
 
-        # idempotency: skip if there is already a result from same model (simplified)
-        # Real implementation should check unique job ids or processed flags
         # Run mock detection
-        disaster_label, conf = mock_disaster_detection(post.post_text or "")
-        cred_score = mock_credibility_score(post.post_text or "")
-
-        # Write Result and Credibility in a transaction
-        res = Result(post=post, accuracy=round(random.uniform(0.7, 0.98), 2), disaster_label=disaster_label or "none", model_type="mock", confidence_score=conf)
-        cred = Credibility(post=post, score=cred_score, source_verification_status=(cred_score > 0.8))
-        session.add_all([res, cred])
-
-        # If high confidence, create or update a Disaster and insert an alert
-        if disaster_label and conf >= ALERT_CONFIDENCE_THRESHOLD:
-            d = Disaster(disaster_type=disaster_label, severity="high", confidence_score=conf, status="active")
-            session.add(d)
-            session.flush()  # get d.disaster_id
-            post.disaster = d
-            # Create an alert in alerts table if present
-            try:
-                from python.models import Alert as AlertModel  # local import to avoid circular issues
-
-                alert = AlertModel(detection_id=None, alert_severity="high", alert_status="pending")
-                session.add(alert)
-            except Exception:
-                # Alerts table may not be in ORM; try raw SQL
-                session.execute("INSERT INTO alerts (detection_id, alert_severity, alert_status) VALUES (NULL, 'high', 'pending')")
+        disaster_label, conf = mock_disaster_detection(post.text_content or "")
+        cred_score = mock_credibility_score(post.text_content or "")
+        inferred_at = datetime.now(timezone.utc)
 
+        # Write assessment, detection and alert in one transaction
+        write_results(session, post, disaster_label, conf, cred_score, ingested_at, dequeued_at, inferred_at, location)
         session.commit()
         print(f"Processed post {post_id}: disaster={disaster_label} conf={conf} cred={cred_score}")
     except Exception as exc:
@@ -119,4 +171,5 @@ if __name__ == "__main__":
     parser.add_argument("--group", default="rtmd_group")
     parser.add_argument("--consumer", default="worker-1")
     args = parser.parse_args()
+    configure("worker")
     worker_loop(args.group, args.consumer)
@@ -4,18 +4,42 @@
 
 -- 1) Extensions
 CREATE EXTENSION IF NOT EXISTS pgcrypto;
+CREATE EXTENSION IF NOT EXISTS pg_trgm; -- fuzzy post search (idx_posts_text_trgm)
+
+-- Time-ordered UUIDv7 keys for the insert-heavy tables: new keys append at the right edge of the primary key
+-- B-tree instead of landing on random leaves. Services generate them client-side (python/ids.py); this is the
+-- default for rows inserted without one. PostgreSQL 18 has a built-in uuidv7() that can replace it.
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid
+LANGUAGE plpgsql VOLATILE PARALLEL SAFE AS $$
+DECLARE
+  -- 48-bit Unix milliseconds, then random bits with the version (7) and variant (10) set
+  v bytea := overlay(gen_random_bytes(16)
+                     PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                     FROM 1 FOR 6);
+BEGIN
+  v := set_byte(v, 6, (get_byte(v, 6) & 15) | 112);
+  v := set_byte(v, 8, (get_byte(v, 8) & 63) | 128);
+  RETURN encode(v, 'hex')::uuid;
+END;
+$$;
 
 -- 2) Core tables
--- social_posts is prepared for range partitioning on ingestion_timestamp
+-- The hot tables are range-partitioned on their timestamp. Keys include the partition column (PostgreSQL requires
+-- it), so foreign keys between them are composite: children carry the parent's timestamp, and lookups and joins
+-- on the full key prune to one partition. ORM mappings: python/models.py (Post, CredibilityAssessment, ...).
 CREATE TABLE IF NOT EXISTS social_posts (
-  post_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  post_id UUID NOT NULL DEFAULT uuid_generate_v7(),
   source_platform TEXT NOT NULL,
-  source_post_id TEXT, -- external platform id (optional, helpful for dedup)
+  source_post_id TEXT, -- external platform id (optional, helpful for dedup; idx_posts_source)
   ingestion_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
+  posted_at TIMESTAMPTZ, -- the platform's post time, as sent by the client
+  language TEXT,
   text_content TEXT,
   image_reference TEXT,
   processing_status TEXT NOT NULL CHECK (processing_status IN ('raw','queued','processing','processed','failed')),
-  UNIQUE (source_platform, source_post_id)
+  -- full-text search (python/search.py)
+  text_search tsvector GENERATED ALWAYS AS (to_tsvector('english', coalesce(text_content, ''))) STORED,
+  PRIMARY KEY (post_id, ingestion_timestamp)
 ) PARTITION BY RANGE (ingestion_timestamp);
 
 -- example partition for January 2026 (replace with appropriate months)
@@ -24,13 +48,17 @@ CREATE TABLE IF NOT EXISTS social_posts_2026_01 PARTITION OF social_posts
 
 -- credibility_assessment (linked to posts)
 CREATE TABLE IF NOT EXISTS credibility_assessment (
-  assessment_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  assessment_id UUID NOT NULL DEFAULT uuid_generate_v7(),
   post_id UUID NOT NULL,
+  post_ingested_at TIMESTAMPTZ NOT NULL, -- the post's ingestion_timestamp (its partition key)
   credibility_score DOUBLE PRECISION NOT NULL CHECK (credibility_score >= 0 AND credibility_score <= 1),
   credibility_label TEXT NOT NULL CHECK (credibility_label IN ('credible','questionable','misinformation')),
   threshold_value DOUBLE PRECISION NOT NULL CHECK (threshold_value >= 0 AND threshold_value <= 1),
   assessment_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
-  FOREIGN KEY (post_id) REFERENCES social_posts(post_id) ON DELETE CASCADE
+  rollup_xid BIGINT DEFAULT pg_current_xact_id()::text::bigint,
+  PRIMARY KEY (assessment_id, assessment_timestamp),
+  CONSTRAINT credibility_assessment_post_fkey FOREIGN KEY (post_id, post_ingested_at)
+    REFERENCES social_posts (post_id, ingestion_timestamp) ON DELETE CASCADE
 ) PARTITION BY RANGE (assessment_timestamp);
 
 CREATE TABLE IF NOT EXISTS credibility_assessment_2026_01 PARTITION OF credibility_assessment
@@ -38,43 +66,196 @@ CREATE TABLE IF NOT EXISTS credibility_assessment_2026_01 PARTITION OF credibili
 
 -- disaster_detection
 CREATE TABLE IF NOT EXISTS disaster_detection (
-  detection_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  detection_id UUID NOT NULL DEFAULT uuid_generate_v7(),
   post_id UUID NOT NULL,
+  post_ingested_at TIMESTAMPTZ NOT NULL,
   disaster_type TEXT NOT NULL,
   text_confidence DOUBLE PRECISION NOT NULL CHECK (text_confidence >=0 AND text_confidence <=1),
   image_confidence DOUBLE PRECISION NOT NULL CHECK (image_confidence >=0 AND image_confidence <=1),
   fused_confidence DOUBLE PRECISION NOT NULL CHECK (fused_confidence >=0 AND fused_confidence <=1),
   detection_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
-  FOREIGN KEY (post_id) REFERENCES social_posts(post_id) ON DELETE CASCADE
+  rollup_xid BIGINT DEFAULT pg_current_xact_id()::text::bigint, -- writing transaction; rollups fold in commit order
+  PRIMARY KEY (detection_id, detection_timestamp),
+  CONSTRAINT disaster_detection_post_fkey FOREIGN KEY (post_id, post_ingested_at)
+    REFERENCES social_posts (post_id, ingestion_timestamp) ON DELETE CASCADE
 ) PARTITION BY RANGE (detection_timestamp);
 
 CREATE TABLE IF NOT EXISTS disaster_detection_2026_01 PARTITION OF disaster_detection
   FOR VALUES FROM ('2026-01-01 00:00:00+00') TO ('2026-02-01 00:00:00+00');
 
--- alerts
+-- alerts (range-partitioned like the other hot tables; the key includes the partition column)
 CREATE TABLE IF NOT EXISTS alerts (
-  alert_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  alert_id UUID NOT NULL DEFAULT uuid_generate_v7(),
   detection_id UUID NOT NULL,
+  detection_timestamp TIMESTAMPTZ NOT NULL, -- the detection's partition key
   alert_severity TEXT NOT NULL CHECK (alert_severity IN ('low','medium','high')),
   alert_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
-  alert_status TEXT NOT NULL CHECK (alert_status IN ('pending','sent','acknowledged','suppressed')),
-  FOREIGN KEY (detection_id) REFERENCES disaster_detection(detection_id) ON DELETE CASCADE
+  -- state at insert time; later transitions go to alert_state_log (see v_alert_current_state)
+  alert_status TEXT NOT NULL CHECK (alert_status IN ('pending','sent','acknowledged','suppressed','coalesced')),
+  region TEXT, -- district/province or detection cluster; part of the dispatcher's coalescing key
+  latitude DOUBLE PRECISION CHECK (latitude BETWEEN -90 AND 90), -- used for subscriber geofence routing
+  longitude DOUBLE PRECISION CHECK (longitude BETWEEN -180 AND 180),
+  -- pipeline timestamps for latency tracking (alert_timestamp is when the alert was created,
+  -- the sent time is the 'sent'/'coalesced' row in alert_state_log)
+  ingested_at TIMESTAMPTZ,
+  dequeued_at TIMESTAMPTZ,
+  inferred_at TIMESTAMPTZ,
+  rollup_xid BIGINT DEFAULT pg_current_xact_id()::text::bigint,
+  PRIMARY KEY (alert_id, alert_timestamp),
+  CONSTRAINT alerts_detection_fkey FOREIGN KEY (detection_id, detection_timestamp)
+    REFERENCES disaster_detection (detection_id, detection_timestamp) ON DELETE CASCADE
+) PARTITION BY RANGE (alert_timestamp);
+
+CREATE TABLE IF NOT EXISTS alerts_2026_01 PARTITION OF alerts
+  FOR VALUES FROM ('2026-01-01 00:00:00+00') TO ('2026-02-01 00:00:00+00');
+
+-- alert_pending: alerts waiting for dispatch, maintained by trg_alerts_track_state and drained by the dispatcher.
+-- Kept small so dispatch cost does not grow with alert history.
+CREATE TABLE IF NOT EXISTS alert_pending (
+  alert_id UUID PRIMARY KEY,
+  severity_rank SMALLINT NOT NULL, -- 0 high, 1 medium, 2 low (dispatcher claim order)
+  alert_timestamp TIMESTAMPTZ NOT NULL,
+  attempts SMALLINT NOT NULL DEFAULT 0, -- failed deliveries so far
+  next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT '-infinity' -- not claimable before (retry backoff)
+) WITH (fillfactor = 70, autovacuum_vacuum_scale_factor = 0, autovacuum_vacuum_threshold = 1000);
+
+-- alert_state_log: append-only state transitions after insert (alerts rows are never updated)
+CREATE TABLE IF NOT EXISTS alert_state_log (
+  alert_id UUID NOT NULL,
+  alert_timestamp TIMESTAMPTZ, -- the alert's alert_timestamp (its partition key)
+  state TEXT NOT NULL CONSTRAINT alert_state_log_state_check
+    CHECK (state IN ('sent','acknowledged','suppressed','coalesced','failed')), -- failed: dead-lettered after ALERT_MAX_ATTEMPTS
+  ts TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
+  coalesced_into UUID -- leader alert when state = 'coalesced'
+) PARTITION BY RANGE (ts);
+
+CREATE TABLE IF NOT EXISTS alert_state_log_2026_01 PARTITION OF alert_state_log
+  FOR VALUES FROM ('2026-01-01 00:00:00+00') TO ('2026-02-01 00:00:00+00');
+
+CREATE OR REPLACE FUNCTION alerts_track_state() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF NEW.alert_status = 'pending' THEN
+    INSERT INTO alert_pending (alert_id, severity_rank, alert_timestamp)
+    VALUES (NEW.alert_id, CASE NEW.alert_severity WHEN 'high' THEN 0 WHEN 'medium' THEN 1 ELSE 2 END, NEW.alert_timestamp);
+  ELSE
+    INSERT INTO alert_state_log (alert_id, alert_timestamp, state) VALUES (NEW.alert_id, NEW.alert_timestamp, NEW.alert_status);
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_alerts_track_state ON alerts;
+CREATE TRIGGER trg_alerts_track_state AFTER INSERT ON alerts
+  FOR EACH ROW EXECUTE FUNCTION alerts_track_state();
+
+-- cdc_outbox: change events of disaster_detection / alerts / credibility_assessment inserts, published to Redis
+-- streams rtmd:cdc:<table> by real_time/cdc_relay.py (migrations/V15__cdc_outbox.sql, V18). Payload is the whole row; alerts add their detection's
+-- type, confidence and post. Trigger arguments name the table (TG_TABLE_NAME would be the partition).
+CREATE TABLE IF NOT EXISTS cdc_outbox (
+  event_id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  table_name TEXT NOT NULL,
+  op TEXT NOT NULL,
+  payload JSONB NOT NULL,
+  captured_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+) WITH (fillfactor = 70, autovacuum_vacuum_scale_factor = 0, autovacuum_vacuum_threshold = 1000);
+
+CREATE OR REPLACE FUNCTION cdc_capture() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  INSERT INTO cdc_outbox (table_name, op, payload) VALUES (TG_ARGV[0], TG_OP, to_jsonb(NEW));
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION cdc_capture_alert() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  INSERT INTO cdc_outbox (table_name, op, payload)
+  SELECT 'alerts', TG_OP, to_jsonb(NEW) || coalesce((
+    SELECT jsonb_build_object('disaster_type', d.disaster_type, 'fused_confidence', d.fused_confidence,
+                              'post_id', d.post_id, 'post_ingested_at', d.post_ingested_at)
+    FROM disaster_detection d
+    WHERE d.detection_id = NEW.detection_id AND d.detection_timestamp = NEW.detection_timestamp
+  ), '{}'::jsonb);
+  RETURN NULL;
+END;
+$$;
+
+-- One notification per statement wakes the relay; NOTIFY is delivered at commit and not at all on rollback
+CREATE OR REPLACE FUNCTION cdc_notify() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  PERFORM pg_notify('rtmd_cdc', '');
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_disaster_detection_cdc ON disaster_detection;
+CREATE TRIGGER trg_disaster_detection_cdc AFTER INSERT ON disaster_detection
+  FOR EACH ROW EXECUTE FUNCTION cdc_capture('disaster_detection');
+
+DROP TRIGGER IF EXISTS trg_alerts_cdc ON alerts;
+CREATE TRIGGER trg_alerts_cdc AFTER INSERT ON alerts
+  FOR EACH ROW EXECUTE FUNCTION cdc_capture_alert();
+
+DROP TRIGGER IF EXISTS trg_credibility_assessment_cdc ON credibility_assessment;
+CREATE TRIGGER trg_credibility_assessment_cdc AFTER INSERT ON credibility_assessment
+  FOR EACH ROW EXECUTE FUNCTION cdc_capture('credibility_assessment');
+
+DROP TRIGGER IF EXISTS trg_cdc_outbox_notify ON cdc_outbox;
+CREATE TRIGGER trg_cdc_outbox_notify AFTER INSERT ON cdc_outbox
+  FOR EACH STATEMENT EXECUTE FUNCTION cdc_notify();
+
+-- dashboard rollups (1-minute and 1-hour grain), maintained incrementally by real_time/rollups.py
+-- '' in a key column means "not applicable to this metric"
+CREATE TABLE IF NOT EXISTS dashboard_rollup_1m (
+  bucket TIMESTAMPTZ NOT NULL,
+  disaster_type TEXT NOT NULL DEFAULT '',
+  platform TEXT NOT NULL DEFAULT '',
+  severity TEXT NOT NULL DEFAULT '',
+  detections BIGINT NOT NULL DEFAULT 0,
+  fused_confidence_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+  high_confidence_detections BIGINT NOT NULL DEFAULT 0, -- fused_confidence >= 0.8
+  alerts BIGINT NOT NULL DEFAULT 0,
+  credibility_assessments BIGINT NOT NULL DEFAULT 0,
+  credibility_score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+  PRIMARY KEY (bucket, disaster_type, platform, severity)
+);
+
+CREATE TABLE IF NOT EXISTS dashboard_rollup_1h (LIKE dashboard_rollup_1m INCLUDING ALL);
+
+-- how far each source table has been folded into the rollups: rows with rollup_xid < processed_xid are counted
+-- (processed_until is the time of the last refresh)
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+  source TEXT PRIMARY KEY,
+  processed_until TIMESTAMPTZ NOT NULL,
+  processed_xid BIGINT
 );
 
 -- 3) Index recommendations (create on partitions or parent depending on Postgres version)
-CREATE INDEX IF NOT EXISTS idx_posts_ingestion_ts ON social_posts (ingestion_timestamp DESC);
+-- Time columns are append-mostly, so recent-window scans use BRIN (small, cheap to maintain);
+-- composite B-trees remain where ordered top-N reads need them. See benchmarks/bench_brin.py.
+CREATE INDEX IF NOT EXISTS idx_posts_ingestion_ts_brin ON social_posts USING BRIN (ingestion_timestamp) WITH (pages_per_range = 32);
 CREATE INDEX IF NOT EXISTS idx_posts_source ON social_posts (source_platform, source_post_id);
+CREATE INDEX IF NOT EXISTS idx_posts_ts_id ON social_posts (ingestion_timestamp DESC, post_id DESC); -- keyset pages (python/queries.py)
+CREATE INDEX IF NOT EXISTS idx_posts_text_search ON social_posts USING GIN (text_search); -- per partition
+CREATE INDEX IF NOT EXISTS idx_posts_text_trgm ON social_posts USING GIN (text_content gin_trgm_ops);
 
-CREATE INDEX IF NOT EXISTS idx_cred_post_id ON credibility_assessment (post_id);
+CREATE INDEX IF NOT EXISTS idx_cred_post ON credibility_assessment (post_id, post_ingested_at);
 CREATE INDEX IF NOT EXISTS idx_cred_assess_ts_score ON credibility_assessment (assessment_timestamp DESC, credibility_score);
+CREATE INDEX IF NOT EXISTS idx_cred_assess_ts_brin ON credibility_assessment USING BRIN (assessment_timestamp) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_cred_rollup_xid_brin ON credibility_assessment USING BRIN (rollup_xid) WITH (pages_per_range = 32);
 
-CREATE INDEX IF NOT EXISTS idx_detect_post_id ON disaster_detection (post_id);
+CREATE INDEX IF NOT EXISTS idx_detect_post ON disaster_detection (post_id, post_ingested_at);
 CREATE INDEX IF NOT EXISTS idx_detect_ts_conf ON disaster_detection (detection_timestamp DESC, fused_confidence DESC);
+CREATE INDEX IF NOT EXISTS idx_detect_ts_brin ON disaster_detection USING BRIN (detection_timestamp) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_detect_rollup_xid_brin ON disaster_detection USING BRIN (rollup_xid) WITH (pages_per_range = 32);
 
-CREATE INDEX IF NOT EXISTS idx_alert_detection_id ON alerts (detection_id);
-CREATE INDEX IF NOT EXISTS idx_alert_status_time ON alerts (alert_status, alert_timestamp DESC);
--- partial index for active/pending alerts
-CREATE INDEX IF NOT EXISTS idx_alert_active ON alerts (alert_timestamp) WHERE alert_status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_alert_detection ON alerts (detection_id, detection_timestamp);
+CREATE INDEX IF NOT EXISTS idx_alert_ts_brin ON alerts USING BRIN (alert_timestamp) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_alert_rollup_xid_brin ON alerts USING BRIN (rollup_xid) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_alert_ts_id ON alerts (alert_timestamp DESC, alert_id DESC); -- keyset pages (python/queries.py)
+-- dispatcher claim order (severity rank, then oldest first); keep in sync with real_time/alert_dispatcher.py
+CREATE INDEX IF NOT EXISTS idx_alert_pending_claim ON alert_pending (severity_rank, alert_timestamp);
+CREATE INDEX IF NOT EXISTS idx_alert_state_log_alert ON alert_state_log (alert_id, ts DESC);
+CREATE INDEX IF NOT EXISTS idx_alert_state_log_ts ON alert_state_log USING BRIN (ts);
 
 -- 4) Helpful views for common queries
 CREATE VIEW IF NOT EXISTS v_recent_high_confidence_detections AS
@@ -83,8 +264,22 @@ FROM disaster_detection d
 WHERE d.fused_confidence >= 0.8
 ORDER BY d.detection_timestamp DESC;
 
+-- current state of each alert: pending, else the latest transition, else the state it was inserted with
+CREATE OR REPLACE VIEW v_alert_current_state AS
+SELECT a.alert_id, a.alert_severity, a.alert_timestamp,
+       CASE WHEN p.alert_id IS NOT NULL THEN 'pending' ELSE COALESCE(l.state, a.alert_status) END AS state,
+       l.ts AS state_timestamp,
+       l.coalesced_into
+FROM alerts a
+LEFT JOIN alert_pending p ON p.alert_id = a.alert_id
+LEFT JOIN LATERAL (
+  SELECT s.state, s.ts, s.coalesced_into FROM alert_state_log s
+  WHERE s.alert_id = a.alert_id ORDER BY s.ts DESC LIMIT 1
+) l ON true;
+
 -- 5) Partition maintenance helper (example function to create monthly partition)
 -- Note: run this periodically (e.g., daily via cron or scheduler) to create partitions ahead of time.
+-- python/partition_manager.py automates pre-creation (monthly or daily), retention and size reports.
 CREATE OR REPLACE FUNCTION create_month_partition(parent_table TEXT, year INT, month INT) RETURNS VOID LANGUAGE plpgsql AS $$
 DECLARE
   start_ts TIMESTAMPTZ := to_timestamp(format('%s-%s-01 00:00:00','"'||year||'"', lpad(month::text,2,'0')), 'YYYY-MM-DD HH24:MI:SS') AT TIME ZONE 'UTC';
@@ -104,14 +299,15 @@ $$;
 -- 6) Example queries
 -- Get pending high severity alerts created in the last 30 minutes
 -- parameterize as needed in application code
--- SELECT a.* FROM alerts a
--- JOIN disaster_detection d USING (detection_id)
--- WHERE a.alert_status = 'pending' AND a.alert_severity = 'high' AND a.alert_timestamp >= now() - interval '30 minutes'
+-- SELECT a.* FROM alert_pending p
+-- JOIN alerts a USING (alert_id, alert_timestamp)
+-- JOIN disaster_detection d USING (detection_id, detection_timestamp)
+-- WHERE p.severity_rank = 0 AND p.alert_timestamp >= now() - interval '30 minutes'
 -- ORDER BY a.alert_timestamp DESC;
 
 -- Get posts with low credibility in the last 24 hours
 -- SELECT p.* FROM social_posts p
--- JOIN credibility_assessment c ON c.post_id = p.post_id
+-- JOIN credibility_assessment c ON c.post_id = p.post_id AND c.post_ingested_at = p.ingestion_timestamp
 -- WHERE c.credibility_label = 'misinformation' AND c.assessment_timestamp >= now() - interval '24 hours'
 -- ORDER BY c.assessment_timestamp DESC;
 
@@ -119,14 +315,14 @@ $$;
 -- INSERT INTO social_posts (source_platform, source_post_id, text_content, image_reference, processing_status)
 -- VALUES ('twitter','12345','Fire near downtown','https://blob/...','processed');
 
--- INSERT INTO credibility_assessment (post_id, credibility_score, credibility_label, threshold_value)
--- VALUES ('<post_uuid>', 0.12, 'misinformation', 0.5);
+-- INSERT INTO credibility_assessment (post_id, post_ingested_at, credibility_score, credibility_label, threshold_value)
+-- VALUES ('<post_uuid>', '<post_ingestion_timestamp>', 0.12, 'misinformation', 0.5);
 
--- INSERT INTO disaster_detection (post_id, disaster_type, text_confidence, image_confidence, fused_confidence)
--- VALUES ('<post_uuid>', 'fire', 0.9, 0.75, 0.85);
+-- INSERT INTO disaster_detection (post_id, post_ingested_at, disaster_type, text_confidence, image_confidence, fused_confidence)
+-- VALUES ('<post_uuid>', '<post_ingestion_timestamp>', 'fire', 0.9, 0.75, 0.85);
 
--- INSERT INTO alerts (detection_id, alert_severity, alert_status)
--- VALUES ('<detection_uuid>', 'high', 'pending');
+-- INSERT INTO alerts (detection_id, detection_timestamp, alert_severity, alert_status)
+-- VALUES ('<detection_uuid>', '<detection_timestamp>', 'high', 'pending');
 
 -- 7) Maintenance notes
 -- - Use connection pooling (pgbouncer) and bulk insert (COPY) for high-throughput ingestion.
@@ -1,31 +1,24 @@
 <#
-PowerShell helper to create monthly partitions ahead of time using the stored function create_month_partition(parent_table, year, month)
+PowerShell wrapper for python/partition_manager.py: pre-creates the current and next partitions
+(and applies retention when PARTITION_RETENTION_DAYS is set).
+Credentials come from the DB_HOST/DB_PORT/DB_NAME/DB_USER/DB_PASS environment variables.
 Usage: .\create_month_partitions.ps1 -MonthsAhead 3
 #>
 param(
   [int]$MonthsAhead = 3,
-  [string]$DbHost = 'localhost',
-  [int]$DbPort = 5432,
-  [string]$DbName = 'rtmd',
-  [string]$DbUser = 'rtmd_user',
-  [string]$DbPassword = 'change_me'
+  [string]$Python = 'python'
 )
 
-$env:PGPASSWORD = $DbPassword
+$env:PARTITION_MONTHS_AHEAD = $MonthsAhead
+$manager = Join-Path $PSScriptRoot '..\python\partition_manager.py'
 
-$start = Get-Date
-for ($i = 0; $i -lt $MonthsAhead; $i++) {
-    $dt = $start.AddMonths($i)
-    $year = $dt.Year
-    $month = $dt.Month
-    $tables = @('social_posts','disaster_detection','credibility_assessment')
+Write-Host "Ensuring partitions for the current and next $MonthsAhead months"
+& $Python $manager ensure
+if ($LASTEXITCODE -ne 0) { Write-Error "Partition creation failed"; exit $LASTEXITCODE }
 
-    foreach ($t in $tables) {
-        $sql = "SELECT create_month_partition('$t', $year, $month);"
-        Write-Host "Creating partition for $t -> $year-$month"
-        & psql -h $DbHost -p $DbPort -U $DbUser -d $DbName -c $sql
-        if ($LASTEXITCODE -ne 0) { Write-Error "Failed to create partition for $t $year-$month" }
-    }
+if ($env:PARTITION_RETENTION_DAYS) {
+    & $Python $manager retain
+    if ($LASTEXITCODE -ne 0) { Write-Error "Partition retention failed"; exit $LASTEXITCODE }
 }
 
 Write-Host "Partition creation complete."
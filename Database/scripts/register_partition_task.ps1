@@ -1,5 +1,6 @@
 <#
-Register a scheduled task to run partition creation monthly using create_month_partitions.ps1
+Register a scheduled task to run partition maintenance daily using create_month_partitions.ps1
+(daily so daily-partitioned tables and retention stay current; creation is idempotent)
 Usage: .\register_partition_task.ps1 -MonthsAhead 3
 #>
 param(
@@ -9,7 +10,7 @@ param(
 )
 
 $action = New-ScheduledTaskAction -Execute 'PowerShell.exe' -Argument "-NoProfile -WindowStyle Hidden -ExecutionPolicy Bypass -File `"$ScriptPath`" -MonthsAhead $MonthsAhead"
-$trigger = New-ScheduledTaskTrigger -Monthly -DaysOfMonth 1 -At 3:00AM
+$trigger = New-ScheduledTaskTrigger -Daily -At 3:00AM
 $principal = New-ScheduledTaskPrincipal -UserId 'SYSTEM' -RunLevel Highest
 
 # Register or update
@@ -17,4 +18,4 @@ if (Get-ScheduledTask -TaskName $TaskName -ErrorAction SilentlyContinue) {
   Unregister-ScheduledTask -TaskName $TaskName -Confirm:$false
 }
 Register-ScheduledTask -TaskName $TaskName -Action $action -Trigger $trigger -Principal $principal
-Write-Host "Scheduled task registered: $TaskName (runs on 1st of month at 03:00)"
+Write-Host "Scheduled task registered: $TaskName (runs daily at 03:00)"
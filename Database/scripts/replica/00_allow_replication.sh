@@ -0,0 +1,5 @@
+#!/bin/bash
+# docker-entrypoint-initdb.d hook: allow streaming replication connections for the local read replica
+# (db-replica in docker-compose.yml). For an existing pgdata, append the same line and reload.
+set -e
+echo "host replication ${POSTGRES_USER} all scram-sha-256" >> "$PGDATA/pg_hba.conf"
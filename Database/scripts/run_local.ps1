@@ -36,7 +36,7 @@ if ($tries -ge 30) { Write-Error "Database did not become available. Check Docke
 if (Get-Command docker -ErrorAction SilentlyContinue) {
     Write-Host "Applying migrations inside container..."
     # copy migrations into container path and execute via psql
-    docker exec -i rtmd_db psql -U rtmd_user -d rtmd -f /docker-entrypoint-initdb.d/migrations/V1__create_schema.sql
+    docker exec -i rtmd_db psql -U rtmd_user -d rtmd -f /docker-entrypoint-initdb.d/V01__create_schema.sql
 } elseif (Get-Command psql -ErrorAction SilentlyContinue) {
     Write-Host "Applying migrations using local psql..."
     .\scripts\apply_migrations.ps1
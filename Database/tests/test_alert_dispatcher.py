@@ -0,0 +1,146 @@
+"""Tests for the dispatcher's batch outcome handling (fake session and delivery engine; no database required)."""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from real_time import alert_dispatcher
+from real_time.geofence import GeofenceIndex, GeofenceSubscription
+from real_time.notifier import Delivery
+
+T0 = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def alert(offset=0, region='Colombo', conf=0.9, point=(None, None)):
+    return {
+        'alert_id': uuid.uuid4(), 'alert_severity': 'high', 'alert_timestamp': T0 + timedelta(seconds=offset),
+        'region': region, 'latitude': point[0], 'longitude': point[1], 'disaster_type': 'flood', 'fused_confidence': conf,
+    }
+
+
+class FakeSession:
+    """Serves `rows` to the claim and records the other statements by the SQL constant they came from."""
+
+    def __init__(self, rows, sent=()):
+        self.rows = rows
+        self.sent = list(sent)
+        self.statements = []
+        self.committed = False
+
+    def execute(self, sql, params=None):
+        if sql is alert_dispatcher.CLAIM_PENDING_SQL:
+            return FakeResult(self.rows)
+        if sql is alert_dispatcher.SENT_LEADERS_SQL:
+            return FakeResult(self.sent)
+        name = next(k for k, v in vars(alert_dispatcher).items() if v is sql)
+        self.statements.append((name, params))
+        return FakeResult([])
+
+    def commit(self):
+        self.committed = True
+
+    def params(self, name):
+        return [p for n, p in self.statements if n == name]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeEngine:
+    """Delivers each digest to one target (none when `ok` is None); `ok` decides the outcome."""
+
+    def __init__(self, ok):
+        self.ok = ok
+        self.delivered = []
+
+    async def deliver_batch(self, alerts):
+        alerts = list(alerts)
+        self.delivered.extend(alerts)
+        if self.ok is None:
+            return {a['alert_id']: [] for a in alerts}
+        return {a['alert_id']: [Delivery(a['alert_id'], 'webhook', 'http://x', self.ok, 1)] for a in alerts}
+
+
+class NoSubscribers:
+    def match(self, *args):
+        return []
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_delivered_digest_is_marked_sent_and_coalesced(loop):
+    rows = [alert(offset=i, conf=0.5 + i / 100) for i in range(3)]
+    session = FakeSession(rows)
+    assert alert_dispatcher.dispatch_batch(session, loop, FakeEngine(True), NoSubscribers(), window_seconds=300) == 3
+    assert session.params('MARK_SENT_SQL') == [{'alert_ids': [rows[2]['alert_id']]}]
+    assert set(session.params('MARK_COALESCED_SQL')[0]['alert_ids']) == {rows[0]['alert_id'], rows[1]['alert_id']}
+    assert not session.params('BACK_OFF_SQL') and session.committed
+
+
+def test_failed_digest_backs_off_the_whole_group(loop):
+    rows = [alert(offset=i) for i in range(3)]
+    session = FakeSession(rows)
+    alert_dispatcher.dispatch_batch(session, loop, FakeEngine(False), NoSubscribers(), window_seconds=300)
+    ids = {r['alert_id'] for r in rows}
+    assert set(session.params('DEAD_LETTER_SQL')[0]['alert_ids']) == ids
+    assert set(session.params('BACK_OFF_SQL')[0]['alert_ids']) == ids
+    assert not session.params('MARK_SENT_SQL')
+
+
+def test_claim_skips_alerts_backing_off():
+    assert 'next_attempt_at <= now()' in str(alert_dispatcher.CLAIM_PENDING_SQL)
+
+
+def test_digest_without_recipients_is_suppressed_not_retried(loop):
+    rows = [alert(offset=i) for i in range(2)] + [alert(region='Kandy')]
+    session = FakeSession(rows)
+    alert_dispatcher.dispatch_batch(session, loop, FakeEngine(None), NoSubscribers(), window_seconds=300)
+    assert set(session.params('MARK_UNROUTED_SQL')[0]['alert_ids']) == {r['alert_id'] for r in rows}
+    assert not session.params('BACK_OFF_SQL') and not session.params('MARK_SENT_SQL')
+    assert session.committed
+
+
+def test_group_already_sent_by_an_earlier_poll_is_coalesced_into_that_leader(loop):
+    earlier = alert(offset=5)
+    rows = [alert(offset=30), alert(offset=60)]
+    engine = FakeEngine(True)
+    session = FakeSession(rows, sent=[earlier])
+    alert_dispatcher.dispatch_batch(session, loop, engine, NoSubscribers(), window_seconds=300)
+    assert engine.delivered == []
+    assert session.params('MARK_COALESCED_SQL') == [
+        {'alert_ids': [r['alert_id'] for r in rows], 'leader_ids': [earlier['alert_id']] * 2}
+    ]
+    assert not session.params('MARK_SENT_SQL')
+
+
+def test_sent_leader_from_another_window_does_not_absorb_the_group(loop):
+    engine = FakeEngine(True)
+    session = FakeSession([alert(offset=330)], sent=[alert(offset=5)])
+    alert_dispatcher.dispatch_batch(session, loop, engine, NoSubscribers(), window_seconds=300)
+    assert len(engine.delivered) == 1 and len(session.params('MARK_SENT_SQL')) == 1
+
+
+def test_digest_reaches_the_subscribers_around_every_member(loop):
+    index = GeofenceIndex()
+    for name, center in (('colombo', (6.9271, 79.8612)), ('negombo', (7.2008, 79.8737))):
+        index.upsert(GeofenceSubscription(name, 'webhook', f'http://{name}', center=center, radius_km=5))
+    rows = [alert(offset=0, region='Western', conf=0.95, point=(6.93, 79.86)), alert(offset=10, region='Western', point=(7.20, 79.87))]
+    engine = FakeEngine(True)
+    alert_dispatcher.dispatch_batch(FakeSession(rows), loop, engine, index, window_seconds=300)
+    (digest,) = engine.delivered
+    assert digest['coalesced_count'] == 2
+    assert sorted(r.subscription_id for r in digest['recipients']) == ['colombo', 'negombo']
@@ -0,0 +1,118 @@
+"""Tests for reading archived partitions back from Parquet (no database required)."""
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip('pyarrow')
+import pyarrow.dataset as ds  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python'))
+
+import archive  # noqa: E402
+import export  # noqa: E402
+
+JAN = datetime(2026, 1, 1, tzinfo=timezone.utc), datetime(2026, 2, 1, tzinfo=timezone.utc)
+FEB = datetime(2026, 2, 1, tzinfo=timezone.utc), datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _archive_month(tmp_path, name, month, platform):
+    rows = [(str(uuid.uuid4()), platform, f'{name}-{i}', month[0] + timedelta(hours=i), f'post {i}', None, 'processed', None, 'en') for i in range(48)]
+    os.makedirs(tmp_path / 'social_posts', exist_ok=True)
+    writer = export._Writer(str(tmp_path / 'social_posts' / f'{name}.parquet'), export.EXPORTS['social_posts'][1], 'parquet')
+    writer.write(export.to_batch(rows, export.EXPORTS['social_posts'][1]))
+    writer.close()
+    return {'partition': name, 'file': f'{name}.parquet', 'range': month, 'rows': len(rows), 'bytes': 0, 'archived_at': ''}
+
+
+def test_range_reads_use_the_manifest_and_push_down_filters(tmp_path):
+    entries = [_archive_month(tmp_path, 'social_posts_2026_01', JAN, 'twitter'), _archive_month(tmp_path, 'social_posts_2026_02', FEB, 'telegram')]
+    archive._save_manifest('social_posts', entries, str(tmp_path))
+    assert [e['range'] for e in archive.load_manifest('social_posts', str(tmp_path))] == [JAN, FEB]
+
+    assert archive._range_files('social_posts', JAN[0], JAN[0] + timedelta(days=1), str(tmp_path)) == [
+        str(tmp_path / 'social_posts' / 'social_posts_2026_01.parquet')
+    ]
+    window = archive.read_range('social_posts', JAN[0] + timedelta(hours=10), FEB[0] + timedelta(hours=5), ['source_post_id'], archive_dir=str(tmp_path))
+    assert window.num_rows == 38 + 5
+    only_telegram = archive.read_range('social_posts', JAN[0], FEB[1], where=ds.field('source_platform') == 'telegram', archive_dir=str(tmp_path))
+    assert set(only_telegram.column('source_platform').to_pylist()) == {'telegram'}
+
+
+def test_referencing_tables_are_archived_first():
+    assert archive._ordered(['social_posts', 'alerts', 'disaster_detection']) == ['alerts', 'disaster_detection', 'social_posts']
+
+
+class FakeCursor:
+    """A named cursor over `rows`, recording each fetchmany size."""
+
+    def __init__(self, conn, name):
+        self.conn = conn
+        conn.cursors.append(name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def execute(self, sql, params):
+        assert not self.conn.autocommit
+
+    def fetchmany(self, size):
+        chunk, self.conn.rows = self.conn.rows[:size], self.conn.rows[size:]
+        self.conn.fetches.append(len(chunk))
+        return chunk
+
+
+class FakeConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.autocommit = True
+        self.cursors = []
+        self.fetches = []
+
+    def cursor(self, name=None):
+        return FakeCursor(self, name)
+
+    def rollback(self):
+        pass
+
+
+def test_query_through_streams_live_partitions_in_chunks(tmp_path, monkeypatch):
+    archive._save_manifest('social_posts', [_archive_month(tmp_path, 'social_posts_2026_01', JAN, 'twitter')], str(tmp_path))
+    live = [(str(uuid.uuid4()), 'reddit', str(i), FEB[0] + timedelta(hours=i), 'post', None, 'processed', None, 'si') for i in range(5)]
+    conn = FakeConn(live)
+    monkeypatch.setattr(archive, 'list_partitions', lambda conn, table: [{'schema': 'public', 'name': 'social_posts_2026_02', 'range': FEB}])
+    batches = list(archive.iter_through(conn, 'social_posts', JAN[0], FEB[1], str(tmp_path), chunk_size=2))
+    assert sum(b.num_rows for b in batches) == 48 + 5
+    assert conn.cursors == ['query_through_social_posts_2026_02'] and conn.fetches == [2, 2, 1, 0]
+    assert conn.autocommit
+
+
+def test_referenced_tables_are_archived_one_period_behind(tmp_path, monkeypatch):
+    months = [(datetime(2026, m, 1, tzinfo=timezone.utc), datetime(2026, m + 1, 1, tzinfo=timezone.utc)) for m in range(1, 6)]
+    archived = []
+    monkeypatch.setattr(archive, 'list_partitions', lambda conn, table: [
+        {'schema': 'public', 'name': f'{table}_2026_{r[0].month:02d}', 'range': r, 'rows': 0} for r in months
+    ])
+    monkeypatch.setattr(archive, 'archive_partition', lambda conn, table, partition, archive_dir: archived.append(partition['name']) or {
+        'partition': partition['name'], 'file': '', 'range': partition['range'], 'rows': 0, 'bytes': 0, 'archived_at': '',
+    })
+    archive.archive(None, ['social_posts', 'alerts', 'disaster_detection', 'credibility_assessment'], after_days=30,
+                    archive_dir=str(tmp_path), now=datetime(2026, 5, 20, tzinfo=timezone.utc))
+    # cut-off Apr 20: alerts and credibility_assessment up to March, detections up to February, posts up to January
+    assert archived == [
+        'alerts_2026_01', 'alerts_2026_02', 'alerts_2026_03',
+        'disaster_detection_2026_01', 'disaster_detection_2026_02',
+        'credibility_assessment_2026_01', 'credibility_assessment_2026_02', 'credibility_assessment_2026_03',
+        'social_posts_2026_01',
+    ]
+
+    archived.clear()
+    archive.archive(None, ['social_posts', 'credibility_assessment'], after_days=30, archive_dir=str(tmp_path),
+                    now=datetime(2026, 5, 20, tzinfo=timezone.utc))
+    # detections still reference posts from any month, so posts stay in Postgres
+    assert archived == ['credibility_assessment_2026_01', 'credibility_assessment_2026_02', 'credibility_assessment_2026_03']
@@ -0,0 +1,95 @@
+"""Tests for the process-pool password hashing of python/auth_service.py (no database required)."""
+import threading
+import time
+
+import pytest
+from argon2 import PasswordHasher
+
+from python import auth_service
+from python.auth_service import AuthBusyError, AuthService
+
+
+@pytest.fixture(scope='module')
+def service():
+    svc = AuthService(workers=1, max_queue=0)
+    yield svc
+    svc.close()
+
+
+def test_hash_and_verify_run_in_the_pool(service):
+    stored = service.hash_password('S3cureP@ss')
+    assert stored.startswith('$argon2id$')
+    assert service.verify_password(stored, 'S3cureP@ss') == (True, None)
+    assert service.verify_password(stored, 'wrong') == (False, None)
+    assert service.verify_password('not-a-hash', 'S3cureP@ss') == (False, None)
+
+
+def test_outdated_parameters_are_rehashed_in_the_same_task(service):
+    weak = PasswordHasher(time_cost=1, memory_cost=8, parallelism=1).hash('S3cureP@ss')
+    ok, new_hash = service.verify_password(weak, 'S3cureP@ss')
+    assert ok and new_hash and new_hash != weak
+    assert service.verify_password(new_hash, 'S3cureP@ss') == (True, None)
+
+
+def test_full_queue_is_rejected_at_once(service):
+    busy = threading.Thread(target=service._run, args=(time.sleep, 1.0))
+    busy.start()
+    time.sleep(0.1)
+    start = time.perf_counter()
+    with pytest.raises(AuthBusyError):
+        service.hash_password('S3cureP@ss')
+    assert time.perf_counter() - start < 0.5
+    busy.join()
+    assert service.hash_password('S3cureP@ss')
+
+
+class FakeEngine:
+    """Serves one user row and counts the connections checked out."""
+
+    def __init__(self, user):
+        self.user = user
+        self.checked_out = 0
+        self.statements = []
+
+    def connect(self):
+        return FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def execution_options(self, **kwargs):
+        return self
+
+    def __enter__(self):
+        self.engine.checked_out += 1
+        return self
+
+    def __exit__(self, *exc):
+        self.engine.checked_out -= 1
+
+    def execute(self, sql, params=None):
+        self.engine.statements.append(sql)
+        return self
+
+    def mappings(self):
+        return self
+
+    def first(self):
+        return self.engine.user
+
+
+def test_login_holds_no_connection_while_verifying(service, monkeypatch):
+    engine = FakeEngine({'user_id': 'u1', 'password_hash': 'stored', 'status': 'active', 'roles': ['analyst']})
+    held = []
+
+    def verify(stored_hash, password):
+        held.append(engine.checked_out)
+        return True, None
+
+    monkeypatch.setattr(auth_service.db, 'engine', engine, raising=False)
+    monkeypatch.setattr(service, 'verify_password', verify)
+    assert service.login('a@example.org', 'S3cureP@ss') == {'user_id': 'u1', 'roles': ['analyst']}
+    assert held == [0]
+    assert engine.statements == [auth_service.SELECT_LOGIN_SQL, auth_service.RECORD_LOGIN_SQL]
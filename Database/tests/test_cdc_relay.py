@@ -0,0 +1,113 @@
+"""Tests for the CDC outbox relay (stream entries and batch handling; no database or Redis server required)."""
+import json
+from datetime import datetime, timezone
+
+import psycopg2
+
+from real_time import cdc_relay
+
+T0 = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def make_event(event_id, table):
+    return {"event_id": event_id, "table_name": table, "op": "INSERT", "payload": {"id": str(event_id), "confidence": 0.9}, "captured_at": T0}
+
+
+class FakeSession:
+    """Serves the outbox rows to the claim and records every statement and the commit."""
+
+    def __init__(self, events):
+        self.events = events
+        self.log = []
+
+    def execute(self, sql, params):
+        self.log.append(("execute", str(sql), params))
+        return FakeResult(self.events if "FOR UPDATE SKIP LOCKED" in str(sql) else [])
+
+    def commit(self):
+        self.log.append(("commit",))
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class RecordingPipeline:
+    def __init__(self, log):
+        self.log = log
+        self.pending = []
+
+    def xadd(self, stream, fields, **kwargs):
+        self.pending.append((stream, fields))
+
+    def execute(self):
+        self.log.append(("xadd", self.pending))
+
+
+class RecordingClient:
+    def __init__(self, log):
+        self.log = log
+
+    def pipeline(self, transaction=True):
+        return RecordingPipeline(self.log)
+
+
+def test_entry_carries_the_whole_row():
+    entry = cdc_relay.to_entry(make_event(7, "alerts"))
+    assert entry["event_id"] == "7" and entry["op"] == "INSERT"
+    assert json.loads(entry["row"]) == {"id": "7", "confidence": 0.9}
+    assert datetime.fromisoformat(entry["captured_at"]) == T0
+
+
+def test_batch_is_published_before_it_is_deleted():
+    session = FakeSession([make_event(1, "disaster_detection"), make_event(2, "alerts"), make_event(3, "credibility_assessment")])
+    published = cdc_relay.relay_batch(session, RecordingClient(session.log), batch_size=10)
+    assert published == 3
+    steps = [step[0] for step in session.log]
+    assert steps == ["execute", "xadd", "execute", "commit"]
+    assert [stream for stream, _ in session.log[1][1]] == ["rtmd:cdc:disaster_detection", "rtmd:cdc:alerts", "rtmd:cdc:credibility_assessment"]
+    assert session.log[2][2] == {"event_ids": [1, 2, 3]}
+
+
+def test_empty_outbox_publishes_nothing():
+    session = FakeSession([])
+    assert cdc_relay.relay_batch(session, RecordingClient(session.log)) == 0
+    assert [step[0] for step in session.log] == ["execute", "commit"]
+
+
+class FakeListener:
+    def __init__(self):
+        self.invalidated = False
+
+    def invalidate(self):
+        self.invalidated = True
+
+
+def test_dropped_listener_is_replaced_and_polling_covers_the_gap(monkeypatch):
+    dead, fresh = FakeListener(), FakeListener()
+    listens = [psycopg2.OperationalError("server closed the connection"), fresh]
+    sleeps = []
+
+    def wait(conn, timeout):
+        raise psycopg2.OperationalError("server closed the connection unexpectedly")
+
+    def listen():
+        result = listens.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(cdc_relay, "_wait_for_notify", wait)
+    monkeypatch.setattr(cdc_relay, "_listen", listen)
+    monkeypatch.setattr(cdc_relay.time, "sleep", sleeps.append)
+    # the reconnect fails: poll on a timer until it works
+    assert cdc_relay._wait_or_reconnect(dead, 5) is None and dead.invalidated
+    assert cdc_relay._wait_or_reconnect(None, 5) is fresh
+    assert sleeps == [5]
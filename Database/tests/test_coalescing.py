@@ -0,0 +1,59 @@
+"""Unit tests for dispatcher alert coalescing (no database required)."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from real_time.coalescing import coalesce
+
+T0 = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def alert(disaster_type='flood', region='Colombo', severity='high', offset=0, conf=0.9):
+    return {
+        'alert_id': uuid.uuid4(),
+        'alert_severity': severity,
+        'alert_timestamp': T0 + timedelta(seconds=offset),
+        'region': region,
+        'disaster_type': disaster_type,
+        'fused_confidence': conf,
+    }
+
+
+def test_flood_of_alerts_becomes_one_digest():
+    rows = [alert(offset=i, conf=0.8 + i / 1000) for i in range(100)]
+    digests = coalesce(rows, window_seconds=300)
+    assert len(digests) == 1
+    digest = digests[0]
+    assert digest.count == 100
+    assert digest.leader['alert_id'] == rows[-1]['alert_id']  # highest confidence
+    assert len(digest.coalesced) == 99
+    payload = digest.payload(top_n=3)
+    assert payload['coalesced_count'] == 100
+    assert [e['alert_id'] for e in payload['examples']] == [r['alert_id'] for r in rows[:-4:-1]]
+
+
+def test_groups_split_by_type_region_severity_and_window():
+    rows = [
+        alert(),
+        alert(disaster_type='fire'),
+        alert(region='Kandy'),
+        alert(severity='medium'),
+        alert(offset=600),
+        alert(offset=10),
+    ]
+    digests = coalesce(rows, window_seconds=300)
+    assert sorted(d.count for d in digests) == [1, 1, 1, 1, 2]
+
+
+def test_zero_window_disables_coalescing():
+    rows = [alert() for _ in range(5)]
+    assert len(coalesce(rows, window_seconds=0)) == 5
+
+
+def test_alerts_without_region_group_by_nearby_cell():
+    colombo = [dict(alert(region=None, offset=i), latitude=6.93 + i / 1000, longitude=79.86) for i in range(3)]
+    jaffna = dict(alert(region=None), latitude=9.66, longitude=80.02)
+    unplaced = alert(region=None)
+    digests = coalesce(colombo + [jaffna, unplaced], window_seconds=300)
+    assert sorted(d.count for d in digests) == [1, 1, 3]
+    assert next(d for d in digests if d.count == 3).points == [(r['latitude'], r['longitude']) for r in colombo]
+    assert next(d for d in digests if d.leader['alert_id'] == unplaced['alert_id']).points == [(None, None)]
@@ -0,0 +1,121 @@
+"""Tests for session routing and pool instrumentation in python/db.py (no Postgres connection is made)."""
+import threading
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc
+
+from python import db
+from python.pool_metrics import InstrumentedQueuePool, instrument
+
+
+def test_readonly_sessions_use_replica_only_within_lag_bound(monkeypatch):
+    replica = object()
+    monkeypatch.setattr(db, "ReplicaSessionLocal", lambda: replica)
+    monkeypatch.setattr(db, "REPLICA_MAX_LAG_SECONDS", 5.0)
+
+    monkeypatch.setattr(db, "replica_lag", lambda: 1.0)
+    assert db.get_session(readonly=True) is replica
+
+    monkeypatch.setattr(db, "replica_lag", lambda: 30.0)
+    fallback = db.get_session(readonly=True)
+    assert fallback is not replica
+    assert fallback.get_bind().get_execution_options()["postgresql_readonly"]
+
+    monkeypatch.setattr(db, "replica_lag", lambda: None)
+    assert db.get_session(readonly=True) is not replica
+
+
+def test_writes_always_use_primary(monkeypatch):
+    monkeypatch.setattr(db, "replica_lag", lambda: 0.0)
+    session = db.get_session()
+    assert session.get_bind() is db.engine
+
+
+def test_role_profiles_size_the_pools(monkeypatch):
+    monkeypatch.delenv("DB_ROLE", raising=False)
+    try:
+        assert db.configure("worker") == "worker"
+        assert db.engine.pool.size() == db.POOL_PROFILES["worker"].pool_size
+        monkeypatch.setenv("DB_ROLE", "ui")
+        assert db.configure("worker") == "ui"
+    finally:
+        monkeypatch.delenv("DB_ROLE", raising=False)
+        db.configure()
+
+
+def test_pool_metrics_record_checkouts_and_timeouts():
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    instrument(engine.pool, "test", "primary")
+    labels = {"role": "test", "pool": "primary"}
+    held = engine.connect()
+    assert REGISTRY.get_sample_value("rtmd_db_pool_checked_out", labels) == 1
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    held.close()
+    assert REGISTRY.get_sample_value("rtmd_db_pool_checkout_timeouts_total", labels) == 1
+    assert REGISTRY.get_sample_value("rtmd_db_pool_checkout_wait_seconds_count", labels) == 2
+    assert REGISTRY.get_sample_value("rtmd_db_pool_connection_age_seconds_count", labels) == 1
+
+
+class LagEngine:
+    """A replica engine whose lag query returns `lag`."""
+
+    def __init__(self, lag):
+        self.lag = lag
+
+    def connect(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def execute(self, sql):
+        return self
+
+    def scalar(self):
+        return self.lag
+
+
+def test_replica_without_a_streaming_receiver_is_unavailable(monkeypatch):
+    monkeypatch.setattr(db, "_lag_checked_at", 0.0)
+    monkeypatch.setattr(db, "_lag_seconds", 0.0)
+    monkeypatch.setattr(db, "replica_engine", LagEngine(None))
+    assert db.replica_lag() is None and not db.replica_available()
+    assert "status = 'streaming'" in str(db.REPLICA_LAG_SQL)
+
+
+class SlowLagEngine(LagEngine):
+    """Blocks in connect until released, like an unreachable replica."""
+
+    def __init__(self, lag):
+        super().__init__(lag)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def connect(self):
+        self.entered.set()
+        self.release.wait(5)
+        return self
+
+
+def test_other_threads_get_the_cached_lag_while_one_probes(monkeypatch):
+    engine = SlowLagEngine(0.5)
+    monkeypatch.setattr(db, "_lag_checked_at", 0.0)
+    monkeypatch.setattr(db, "_lag_seconds", 3.0)
+    monkeypatch.setattr(db, "replica_engine", engine)
+    probe = threading.Thread(target=db.replica_lag)
+    probe.start()
+    assert engine.entered.wait(5)
+    assert db.replica_lag() == 3.0
+    engine.release.set()
+    probe.join()
+    assert db.replica_lag() == 0.5
+
+
+def test_replica_engine_fails_fast():
+    assert db._connect_args("postgresql+psycopg2://u@replica/rtmd", 2) == {"connect_timeout": 2}
+    assert db._connect_args("postgresql+psycopg2://u@primary/rtmd") == {}
@@ -0,0 +1,45 @@
+"""Tests for the partition export's batch building and partition selection (no database required)."""
+import os
+import sys
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python'))
+
+import export  # noqa: E402
+
+JAN = datetime(2026, 1, 1, tzinfo=timezone.utc), datetime(2026, 2, 1, tzinfo=timezone.utc)
+FEB = datetime(2026, 2, 1, tzinfo=timezone.utc), datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def test_rows_become_typed_record_batches():
+    rows = [(str(uuid.uuid4()), str(uuid.uuid4()), JAN[0], 0.7, 'credible', 0.5, JAN[0]),
+            (str(uuid.uuid4()), str(uuid.uuid4()), JAN[0], 0.1, 'misinformation', 0.5, JAN[1])]
+    batch = export.to_batch(rows, export.EXPORTS['credibility_assessment'][1])
+    assert batch.num_rows == 2
+    assert batch.column('credibility_score').to_pylist() == [0.7, 0.1]
+    assert batch.column('assessment_timestamp').to_pylist()[1] == JAN[1]
+    assert export.to_batch([], batch.schema).num_rows == 0
+
+
+def test_only_partitions_overlapping_the_window_are_exported():
+    partitions = [{'name': 'p_jan', 'range': JAN}, {'name': 'p_feb', 'range': FEB}, {'name': 'p_default', 'range': None}]
+    chosen = export.partitions_to_export(partitions, datetime(2026, 2, 10, tzinfo=timezone.utc), None)
+    assert [p['name'] for p in chosen] == ['p_feb', 'p_default']
+    sql, params = export.select_sql({'schema': 'public', 'name': 'p_feb'}, 'disaster_detection', FEB[0], None)
+    assert sql.startswith('SELECT detection_id, post_id,') and sql.endswith('FROM "public"."p_feb" WHERE detection_timestamp >= %s')
+    assert params == [FEB[0]]
+
+
+def test_file_name_records_a_window_that_cuts_into_the_partition():
+    feb = {'name': 'p_feb', 'range': FEB}
+    assert export.export_name(feb, None, None) == 'p_feb'
+    assert export.export_name(feb, JAN[0], datetime(2026, 4, 1, tzinfo=timezone.utc)) == 'p_feb'
+    assert export.export_name(feb, datetime(2026, 2, 10, tzinfo=timezone.utc), None) == 'p_feb__20260210T000000Z_max'
+    assert export.export_name({'name': 'p_default', 'range': None}, None, FEB[1]) == 'p_default__min_20260301T000000Z'
+    assert export.export_name(feb, datetime(2026, 2, 10, tzinfo=timezone.utc), None) != export.export_name(
+        feb, datetime(2026, 2, 11, tzinfo=timezone.utc), None)
@@ -0,0 +1,43 @@
+"""Tests for the COPY-based synthetic data generator's row building (no database required)."""
+import os
+import sys
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python'))
+
+import generate_synthetic as gs  # noqa: E402
+
+JAN = gs._us(datetime(2026, 1, 1, tzinfo=timezone.utc)), gs._us(datetime(2026, 2, 1, tzinfo=timezone.utc))
+MAR = gs._us(datetime(2026, 3, 1, tzinfo=timezone.utc)), gs._us(datetime(2026, 4, 1, tzinfo=timezone.utc))
+
+
+def test_chunks_are_reproducible_and_independent():
+    a = gs.build_chunk(3, 3000, 1000, 42, [JAN, MAR], 8)
+    assert a == gs.build_chunk(3, 3000, 1000, 42, [JAN, MAR], 8)
+    assert a['social_posts'] != gs.build_chunk(3, 3000, 1000, 43, [JAN, MAR], 8)['social_posts']
+    assert a['social_posts'] != gs.build_chunk(4, 4000, 1000, 42, [JAN, MAR], 8)['social_posts']
+
+
+def test_rows_link_up_and_stay_inside_partitions():
+    data = gs.build_chunk(0, 0, 500, 7, [JAN, MAR], 2)
+    posts = [line.split(',') for line in data['social_posts'].splitlines()]
+    detections = [line.split(',') for line in data['disaster_detection'].splitlines()]
+    alerts = [line.split(',') for line in data['alerts'].splitlines()]
+    assert len(posts) == len(detections) == len(alerts) == 500
+    assert all(uuid.UUID(p[0]).version == 7 for p in posts)
+    # composite foreign keys: (post_id, post_ingested_at) and (detection_id, detection_timestamp)
+    assert [(d[1], d[2]) for d in detections] == [(p[0], p[3]) for p in posts]
+    assert [(a[1], a[2]) for a in alerts] == [(d[0], d[7]) for d in detections]
+    for rows, column in ((posts, 3), (detections, 7), (alerts, 4)):
+        stamps = [gs._us(datetime.fromisoformat(r[column].replace('Z', '+00:00'))) for r in rows]
+        assert all(JAN[0] <= s < JAN[1] or MAR[0] <= s < MAR[1] for s in stamps)
+    ingested = [p[3] for p in posts]
+    assert ingested == sorted(ingested)
+    # v7 keys carry the row's millisecond, so they sort with ingestion time
+    assert [int(p[0][:12], 16) for p in posts] == [gs._us(datetime.fromisoformat(t.replace('Z', '+00:00'))) // 1000 for t in ingested]
+
+
+def test_covered_ranges_intersect_and_merge():
+    assert gs._merge(gs._intersect([JAN, MAR], [(JAN[0], MAR[1])])) == [JAN, MAR]
+    assert gs._merge([JAN, (JAN[1], MAR[0])]) == [(JAN[0], MAR[0])]
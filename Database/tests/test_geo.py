@@ -0,0 +1,49 @@
+"""Tests for viewport covering and spatial query building (no database required)."""
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from python import geo, geohash
+from python.models import GEOHASH_PRECISION, Location, _set_location_geohash
+
+SRI_LANKA = (5.9, 79.5, 9.9, 81.9)
+COLOMBO = (6.9271, 79.8612)
+
+
+def _in_ranges(cell, ranges):
+    return any(lo <= cell < hi for lo, hi in ranges)
+
+
+def test_cover_includes_every_point_in_the_box_with_few_ranges():
+    ranges = geo.cover(*SRI_LANKA)
+    assert len(ranges) <= geo.GEO_MAX_CELLS
+    for lat in (5.9, 6.5, 7.2906, 8.0, 9.9):
+        for lng in (79.5, 80.7789, 81.9):
+            assert _in_ranges(geohash.encode(lat, lng, GEOHASH_PRECISION), ranges)
+    small = geo.cover(COLOMBO[0] - 0.01, COLOMBO[1] - 0.01, COLOMBO[0] + 0.01, COLOMBO[1] + 0.01)
+    assert min(len(lo) for lo, _ in small) > max(len(lo) for lo, _ in ranges)  # zoomed in: finer cells
+
+
+def test_viewport_sql_seeks_by_time_and_checks_exact_bounds():
+    params = {}
+    sql = str(geo.build_viewport_sql(geo.cover(*SRI_LANKA), params, since=False, disaster_type=True, after=True))
+    assert "l.geohash >= :gh_lo0 AND l.geohash < :gh_hi0" in sql
+    assert "l.latitude BETWEEN :min_lat AND :max_lat" in sql
+    assert "(d.date_time, d.disaster_id, l.location_id) < (:cursor_ts, :cursor_disaster, :cursor_location)" in sql
+    assert sql.strip().endswith("ORDER BY d.date_time DESC, d.disaster_id DESC, l.location_id DESC\n        LIMIT :limit")
+    ts, d, loc = datetime(2026, 1, 30, tzinfo=timezone.utc), uuid.uuid4(), uuid.uuid4()
+    assert geo.decode_cursor(geo.encode_cursor(ts, d, loc)) == (ts, d, loc)
+    with pytest.raises(ValueError):
+        geo.decode_cursor(geo.encode_cursor(ts, d))
+    with pytest.raises(ValueError):
+        geo.disasters_in_viewport(None, 9.9, 79.5, 5.9, 81.9)
+
+
+def test_location_geohash_follows_coordinates():
+    location = Location(name="Colombo", latitude=COLOMBO[0], longitude=COLOMBO[1])
+    _set_location_geohash(None, None, location)
+    assert location.geohash == geohash.encode(*COLOMBO, GEOHASH_PRECISION)
+    location.latitude = location.longitude = None
+    _set_location_geohash(None, None, location)
+    assert location.geohash is None
@@ -0,0 +1,125 @@
+"""Unit tests for the subscriber geofence index and geohash helpers (no database required)."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from python import geohash
+from python.models import Subscription
+from real_time.geofence import GeofenceIndex, GeofenceSubscription
+
+COLOMBO = (6.9271, 79.8612)
+KANDY = (7.2906, 80.6337)
+
+
+def sub(**kwargs):
+    kwargs.setdefault('channel', 'email')
+    kwargs.setdefault('target', 'ops@example.org')
+    return GeofenceSubscription(subscription_id=uuid.uuid4(), **kwargs)
+
+
+def test_geohash_roundtrip():
+    cell = geohash.encode(*COLOMBO, precision=7)
+    min_lat, min_lng, max_lat, max_lng = geohash.bounds(cell)
+    assert min_lat <= COLOMBO[0] <= max_lat
+    assert min_lng <= COLOMBO[1] <= max_lng
+    assert geohash.encode(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+
+
+def test_radius_and_polygon_matching():
+    index = GeofenceIndex()
+    near = sub(center=COLOMBO, radius_km=10)
+    wide = sub(center=KANDY, radius_km=200)
+    square = sub(polygon=[(7.0, 80.5), (7.0, 80.8), (7.5, 80.8), (7.5, 80.5)])
+    everywhere = sub()
+    for s in (near, wide, square, everywhere):
+        index.upsert(s)
+
+    at_colombo = {r.subscription_id for r in index.match(*COLOMBO)}
+    assert at_colombo == {near.subscription_id, wide.subscription_id, everywhere.subscription_id}
+
+    at_kandy = {r.subscription_id for r in index.match(*KANDY)}
+    assert at_kandy == {wide.subscription_id, square.subscription_id, everywhere.subscription_id}
+
+    # No coordinates: only subscriptions without a geofence
+    assert {r.subscription_id for r in index.match(None, None)} == {everywhere.subscription_id}
+
+
+def test_type_and_severity_filters():
+    index = GeofenceIndex()
+    floods = sub(center=COLOMBO, radius_km=5, disaster_types=frozenset({'flood'}), severities=frozenset({'high'}))
+    index.upsert(floods)
+    assert index.match(*COLOMBO, disaster_type='flood', severity='high')
+    assert not index.match(*COLOMBO, disaster_type='fire', severity='high')
+    assert not index.match(*COLOMBO, disaster_type='flood', severity='low')
+
+
+def test_incremental_update_and_remove():
+    index = GeofenceIndex()
+    s = sub(center=COLOMBO, radius_km=5)
+    index.upsert(s)
+    assert index.match(*COLOMBO)
+
+    moved = GeofenceSubscription(subscription_id=s.subscription_id, channel='email', target='ops@example.org', center=KANDY, radius_km=5)
+    index.upsert(moved)
+    assert not index.match(*COLOMBO)
+    assert index.match(*KANDY)
+
+    index.remove(s.subscription_id)
+    assert len(index) == 0
+    assert not index.match(*KANDY)
+
+
+class FakeSession:
+    """Returns the current subscription rows to every sync query, like the look-back window would."""
+
+    def __init__(self):
+        self.rows = []
+
+    def execute(self, stmt):
+        return self
+
+    def scalars(self):
+        return sorted(self.rows, key=lambda s: s.updated_at)
+
+
+def test_sync_picks_up_late_commits_and_skips_applied_versions():
+    t0 = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+    def row(updated_at, **kwargs):
+        return Subscription(subscription_id=uuid.uuid4(), channel='email', target='ops@example.org', active=True, updated_at=updated_at, **kwargs)
+
+    session = FakeSession()
+    index = GeofenceIndex(settle_seconds=60)
+    session.rows = [row(t0), row(t0 + timedelta(seconds=10))]
+    assert index.sync(session) == 2
+    # stamped before the last synced change but committed after the previous sync
+    late = row(t0 + timedelta(seconds=5), center_lat=COLOMBO[0], center_lng=COLOMBO[1], radius_km=5)
+    session.rows.append(late)
+    assert index.sync(session) == 1
+    assert late.subscription_id in {r.subscription_id for r in index.match(*COLOMBO)}
+    assert index.sync(session) == 0
+    assert index.synced_until == t0 + timedelta(seconds=10)
+
+
+class IdsSession:
+    """Answers the reconcile query with the ids of the subscriptions that still exist."""
+
+    def __init__(self, ids):
+        self.ids = ids
+
+    def execute(self, stmt):
+        return self
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return list(self.ids)
+
+
+def test_reconcile_drops_deleted_subscriptions():
+    index = GeofenceIndex(reconcile_seconds=0)
+    kept, deleted = sub(center=COLOMBO, radius_km=5), sub(center=COLOMBO, radius_km=5)
+    index.upsert(kept)
+    index.upsert(deleted)
+    assert index.reconcile(IdsSession([kept.subscription_id])) == 1
+    assert [r.subscription_id for r in index.match(*COLOMBO)] == [kept.subscription_id]
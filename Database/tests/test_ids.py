@@ -0,0 +1,29 @@
+"""Tests for the UUIDv7 key generator."""
+import time
+import uuid
+
+from python.ids import uuid7, uuid7_time
+
+
+def test_uuid7_layout_and_time():
+    before = time.time()
+    key = uuid7()
+    assert key.version == 7
+    assert key.variant == uuid.RFC_4122
+    assert before - 0.001 <= uuid7_time(key) <= time.time() + 0.001
+    assert uuid7_time(uuid7(unix_ms=1_767_225_600_000)) == 1_767_225_600.0
+
+
+def test_uuid7_is_monotonic_within_a_millisecond():
+    keys = [uuid7() for _ in range(20_000)]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+
+
+def test_uuid7_explicit_time_uses_independent_random_fields():
+    keys = [uuid7(unix_ms=1_767_225_600_000) for _ in range(64)]
+    rand_a = [(k.int >> 64) & 0xFFF for k in keys]
+    rand_b = [k.int & 0x3FFF_FFFF_FFFF_FFFF for k in keys]
+    # rand_a used to repeat the top bits of rand_b
+    assert any((a & 0x3FF) != (b >> 52) for a, b in zip(rand_a, rand_b))
+    assert len(set(keys)) == len(keys)
@@ -0,0 +1,11 @@
+"""The Postgres image's /docker-entrypoint-initdb.d and scripts/*apply_migrations* run migrations in lexical order."""
+import os
+import re
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+def test_lexical_order_is_version_order():
+    files = sorted(f for f in os.listdir(MIGRATIONS) if re.match(r'V\d+__.*\.sql$', f))
+    versions = [int(re.match(r'V(\d+)__', f).group(1)) for f in files]
+    assert versions == sorted(versions) == list(range(1, len(files) + 1))
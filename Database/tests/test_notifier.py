@@ -0,0 +1,162 @@
+"""Tests for the async alert delivery engine against the local stub receivers (no database required)."""
+import asyncio
+import smtplib
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from real_time.notifier import Channel, NotificationEngine, SmtpChannel, WebhookChannel
+from real_time.stub_receivers import StubSmtpServer, StubWebhookServer
+
+
+def make_alerts(n):
+    now = datetime.now(timezone.utc)
+    return [{"alert_id": uuid.uuid4(), "alert_severity": "high", "alert_timestamp": now} for _ in range(n)]
+
+
+def test_slow_recipient_does_not_block_batch():
+    async def scenario():
+        server = StubWebhookServer(delays={"/slow": 2.0})
+        await server.start()
+        channel = WebhookChannel([server.url + "/fast", server.url + "/slow"], concurrency=20, timeout=0.3, max_retries=0)
+        engine = NotificationEngine([channel])
+        alerts = make_alerts(10)
+        start = time.perf_counter()
+        results = await engine.deliver_batch(alerts)
+        elapsed = time.perf_counter() - start
+        await engine.aclose()
+        await server.close()
+        return results, elapsed, server
+
+    results, elapsed, server = asyncio.run(scenario())
+    assert elapsed < 1.5
+    for deliveries in results.values():
+        by_target = {d.target.rsplit("/", 1)[1]: d for d in deliveries}
+        assert by_target["fast"].ok
+        assert not by_target["slow"].ok
+    assert len([r for r in server.received if r["path"] == "/fast"]) == 10
+
+
+def test_retries_with_backoff_then_succeeds():
+    async def scenario():
+        server = StubWebhookServer(failures={"/flaky": 2})
+        await server.start()
+        channel = WebhookChannel([server.url + "/flaky"], max_retries=3, backoff_base=0.01)
+        engine = NotificationEngine([channel])
+        results = await engine.deliver_batch(make_alerts(1))
+        await engine.aclose()
+        await server.close()
+        return results
+
+    (deliveries,) = asyncio.run(scenario()).values()
+    assert deliveries[0].ok
+    assert deliveries[0].attempts == 3
+
+
+def test_webhook_connections_are_reused():
+    async def scenario():
+        server = StubWebhookServer()
+        await server.start()
+        channel = WebhookChannel([server.url + "/hook"], concurrency=2)
+        engine = NotificationEngine([channel])
+        await engine.deliver_batch(make_alerts(20))
+        await engine.aclose()
+        await server.close()
+        return server
+
+    server = asyncio.run(scenario())
+    assert len(server.received) == 20
+    assert server.connections <= 2
+
+
+def test_smtp_delivery_reuses_connections():
+    async def scenario():
+        server = StubSmtpServer()
+        await server.start()
+        channel = SmtpChannel(["ops@example.org", "duty@example.org"], concurrency=2, host=server.host, port=server.port)
+        engine = NotificationEngine([channel])
+        results = await engine.deliver_batch(make_alerts(5))
+        await engine.aclose()
+        await server.close()
+        return results, server
+
+    results, server = asyncio.run(scenario())
+    assert all(d.ok for deliveries in results.values() for d in deliveries)
+    assert len(server.messages) == 10
+    assert server.connections <= 2
+
+
+class SlowFailingSmtp:
+    """Fails a send after `delay` seconds and records which thread closed it."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.sending = False
+        self.closed_while_sending = False
+        self.closed = False
+
+    def send_message(self, msg):
+        self.sending = True
+        time.sleep(self.delay)
+        self.sending = False
+        raise OSError("connection reset")
+
+    def close(self):
+        self.closed_while_sending = self.sending
+        self.closed = True
+
+
+def test_smtp_timeout_leaves_the_connection_to_its_thread():
+    conn = SlowFailingSmtp(0.2)
+    channel = SmtpChannel(["ops@example.org"], timeout=0.05, max_retries=0)
+    channel._connect = lambda: conn
+
+    async def scenario():
+        delivery = await channel.deliver(make_alerts(1)[0], "ops@example.org")
+        await asyncio.sleep(0.4)
+        return delivery
+
+    delivery = asyncio.run(scenario())
+    assert not delivery.ok and "timed out" in delivery.error
+    assert conn.closed and not conn.closed_while_sending
+    assert channel._idle == []
+
+
+class FakeSmtp:
+    """Sends, or raises `error` on every send."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.sent = 0
+        self.closed = False
+
+    def send_message(self, msg):
+        if self.error:
+            raise self.error
+        self.sent += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_smtp_replaces_a_pooled_connection_the_server_dropped():
+    stale, fresh = FakeSmtp(smtplib.SMTPServerDisconnected("Connection unexpectedly closed")), FakeSmtp()
+    channel = SmtpChannel(["ops@example.org"], max_retries=0)
+    channel._idle = [stale]
+    channel._connect = lambda: fresh
+    delivery = asyncio.run(channel.deliver(make_alerts(1)[0], "ops@example.org"))
+    assert delivery.ok and delivery.attempts == 1
+    assert stale.closed and fresh.sent == 1 and channel._idle == [fresh]
+
+    # a fresh connection failing the same way is not retried within the attempt
+    broken = FakeSmtp(smtplib.SMTPServerDisconnected("Connection unexpectedly closed"))
+    channel._idle, channel._connect = [], lambda: broken
+    delivery = asyncio.run(channel.deliver(make_alerts(1)[0], "ops@example.org"))
+    assert not delivery.ok and broken.closed and channel._idle == []
+
+
+def test_channel_requires_send():
+    with pytest.raises(TypeError):
+        Channel(["x"])
@@ -0,0 +1,68 @@
+"""Tests for the partition manager's period arithmetic (no database required)."""
+from datetime import datetime, timezone
+
+from python.partition_manager import (
+    TablePolicy, add_months, desired_ranges, expired_partitions, fk_safe_cutoffs, parse_bound, partition_name, retention_cutoffs,
+)
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_monthly_ranges_are_contiguous_across_month_ends_and_years():
+    # now + 30*i days from Jan 31 skipped February; every month must appear exactly once
+    ranges = list(desired_ranges(utc(2026, 1, 31, 23, 59), 'month', ahead=12))
+    starts = [start for start, _ in ranges]
+    assert starts[0] == utc(2026, 1, 1)
+    assert starts[1] == utc(2026, 2, 1)
+    assert starts[-1] == utc(2027, 1, 1)
+    assert all(prev_end == start for (_, prev_end), (start, _) in zip(ranges, ranges[1:]))
+    assert add_months(utc(2026, 12, 15), 1) == utc(2027, 1, 1)
+
+
+def test_daily_ranges_and_names():
+    ranges = list(desired_ranges(utc(2026, 2, 27, 12), 'day', ahead=2))
+    assert ranges == [(utc(2026, 2, 27), utc(2026, 2, 28)), (utc(2026, 2, 28), utc(2026, 3, 1)), (utc(2026, 3, 1), utc(2026, 3, 2))]
+    assert partition_name('social_posts', utc(2026, 3, 1), 'day') == 'social_posts_2026_03_01'
+    assert partition_name('social_posts', utc(2026, 3, 1), 'month') == 'social_posts_2026_03'
+
+
+def test_parse_bound_and_retention_cutoff():
+    bound = "FOR VALUES FROM ('2026-01-01 00:00:00+00') TO ('2026-02-01 00:00:00+00')"
+    assert parse_bound(bound) == (utc(2026, 1, 1), utc(2026, 2, 1))
+    assert parse_bound('DEFAULT') is None
+    partitions = [
+        {'name': 'jan', 'range': parse_bound(bound)},
+        {'name': 'feb', 'range': (utc(2026, 2, 1), utc(2026, 3, 1))},
+        {'name': 'default', 'range': None},
+    ]
+    assert [p['name'] for p in expired_partitions(partitions, utc(2026, 2, 15))] == ['jan']
+
+
+def test_referenced_tables_keep_one_period_past_the_referencing_cutoff():
+    policies = [TablePolicy(t, retention_days=90) for t in ('alert_state_log', 'alerts', 'disaster_detection', 'credibility_assessment', 'social_posts')]
+    cutoffs = retention_cutoffs(policies, now=utc(2026, 6, 15))
+    assert cutoffs['alerts'] == cutoffs['alert_state_log'] == utc(2026, 3, 17)
+    # alerts keeps March, which may reference detections from late February
+    assert cutoffs['disaster_detection'] == utc(2026, 2, 1)
+    # ... and those reference posts from late January; credibility_assessment alone would only hold it to Feb 1
+    assert cutoffs['credibility_assessment'] == utc(2026, 3, 17)
+    assert cutoffs['social_posts'] == utc(2026, 1, 1)
+
+    months = [{'name': f'2026_{m:02d}', 'range': (utc(2026, m, 1), add_months(utc(2026, m, 1), 1))} for m in range(1, 5)]
+    assert [p['name'] for p in expired_partitions(months, cutoffs['alerts'])] == ['2026_01', '2026_02']
+    assert [p['name'] for p in expired_partitions(months, cutoffs['disaster_detection'])] == ['2026_01']
+    assert expired_partitions(months, cutoffs['social_posts']) == []
+
+
+def test_referenced_tables_are_kept_while_referencing_rows_are():
+    cutoffs = fk_safe_cutoffs(
+        {'alerts': None, 'disaster_detection': utc(2026, 3, 1), 'credibility_assessment': utc(2026, 3, 1), 'social_posts': utc(2026, 3, 1)},
+        {'credibility_assessment': 'day'},
+    )
+    assert cutoffs['disaster_detection'] is None and cutoffs['social_posts'] is None
+    # daily children hold the parent back one day per level, not one month
+    daily = fk_safe_cutoffs(dict.fromkeys(('alerts', 'disaster_detection', 'credibility_assessment', 'social_posts'), utc(2026, 3, 10, 6)),
+                            dict.fromkeys(('alerts', 'disaster_detection', 'credibility_assessment'), 'day'))
+    assert (daily['disaster_detection'], daily['social_posts']) == (utc(2026, 3, 9), utc(2026, 3, 8))
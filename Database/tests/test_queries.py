@@ -0,0 +1,73 @@
+"""Tests for the keyset-paginated query layer (SQL building and page handling; no database required)."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from python import queries
+
+T0 = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeSession:
+    """Serves rows from a list, applying the seek predicate and LIMIT the way Postgres would."""
+
+    def __init__(self, rows):
+        self.rows = sorted(rows, key=lambda r: (r["alert_timestamp"], r["alert_id"]), reverse=True)
+        self.statements = []
+
+    def execute(self, sql, params):
+        self.statements.append(str(sql))
+        rows = self.rows
+        if "cursor_ts" in params:
+            rows = [r for r in rows if (r["alert_timestamp"], r["alert_id"]) < (params["cursor_ts"], params["cursor_id"])]
+        return FakeResult(rows[: params["limit"]])
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self.rows
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    key = uuid.uuid4()
+    assert queries.decode_cursor(queries.encode_cursor(T0, key)) == (T0, key)
+    with pytest.raises(ValueError):
+        queries.decode_cursor("not-a-cursor")
+
+
+def test_cursor_with_integer_keys():
+    cursor = queries.encode_cursor(T0, 42)
+    assert queries.decode_cursor(cursor, key_type=int) == (T0, 42)
+    with pytest.raises(ValueError):
+        queries.decode_cursor(cursor)
+
+
+def test_unknown_severity_is_rejected():
+    with pytest.raises(ValueError):
+        queries.alerts_page(FakeSession([]), severity="extreme", pending=True)
+
+
+def test_seek_predicate_leads_with_the_timestamp():
+    sql, params = queries.build_page_sql(
+        queries.DETECTIONS, ["d.fused_confidence >= :min_confidence"], {"min_confidence": 0.8}, 10,
+        queries.encode_cursor(T0, uuid.uuid4()),
+    )
+    sql = str(sql)
+    assert "d.detection_timestamp <= :cursor_ts AND (d.detection_timestamp < :cursor_ts OR d.detection_id < :cursor_id)" in sql
+    assert sql.endswith("ORDER BY d.detection_timestamp DESC, d.detection_id DESC LIMIT :limit")
+    assert "OFFSET" not in sql
+    assert params["limit"] == 11 and params["cursor_ts"] == T0
+
+
+def test_iter_rows_visits_every_row_once_across_pages():
+    # ties on the timestamp must not lose or repeat rows at page boundaries
+    rows = [{"alert_id": uuid.uuid4(), "alert_timestamp": T0 - timedelta(seconds=i // 3)} for i in range(25)]
+    session = FakeSession(rows)
+    seen = list(queries.iter_rows(session, queries.alerts_page, page_size=4, severity="high"))
+    assert [r["alert_id"] for r in seen] == [r["alert_id"] for r in session.rows]
+    assert len(session.statements) == 7
+    assert all("a.alert_severity = :severity" in s for s in session.statements)
@@ -0,0 +1,62 @@
+"""Tests for the dashboard rollup refresher's SQL and watermark handling (fake session; no database required)."""
+from real_time import rollups
+
+
+class FakeSession:
+    """Keeps one watermark per source and a fixed snapshot xmin; records the upserted ranges."""
+
+    def __init__(self, xmin, watermark=None):
+        self.xmin = xmin
+        self.watermark = watermark
+        self.upserts = []
+        self.commits = 0
+
+    def execute(self, sql, params=None):
+        if sql is rollups.CLAIM_WATERMARK_SQL:
+            return FakeResult(self.watermark)
+        if sql is rollups.INIT_WATERMARK_SQL:
+            self.watermark = 0
+        elif sql is rollups.SNAPSHOT_XMIN_SQL:
+            return FakeResult(self.xmin)
+        elif sql is rollups.ADVANCE_WATERMARK_SQL:
+            self.watermark = params["hi"]
+        else:
+            self.upserts.append((params["lo"], params["hi"]))
+        return FakeResult(None)
+
+    def commit(self):
+        self.commits += 1
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+def test_upsert_folds_one_delta_into_both_grains():
+    sql = rollups._upsert_sql("SELECT 1")
+    assert sql.count("WITH delta AS (SELECT 1)") == 1
+    assert "INSERT INTO dashboard_rollup_1m AS r" in sql and "INSERT INTO dashboard_rollup_1h AS r" in sql
+    assert "ON CONFLICT (bucket, disaster_type, platform, severity) DO UPDATE SET detections = r.detections + EXCLUDED.detections" in sql
+    assert "date_trunc('hour', bucket AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'" in sql
+
+
+def test_deltas_select_by_writing_transaction_not_event_time():
+    for delta in rollups.SOURCES.values():
+        assert "rollup_xid >= :lo AND" in delta and "rollup_xid < :hi" in delta
+
+
+def test_watermark_steps_through_commit_order():
+    session = FakeSession(xmin=100)
+    assert rollups.refresh_source(session, "alerts") == 1
+    assert session.upserts == [(0, 100)] and session.watermark == 100
+    # nothing finished since: no delta
+    assert rollups.refresh_source(session, "alerts") == 0
+    # a transaction still open at the last refresh (xid >= 100) has since committed, whatever its rows' timestamps:
+    # its rows fall in the next range
+    session.xmin = 130
+    assert rollups.refresh_source(session, "alerts") == 1
+    assert session.upserts == [(0, 100), (100, 130)] and session.watermark == 130
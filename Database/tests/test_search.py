@@ -0,0 +1,63 @@
+"""Tests for the post search query building and fallback logic (no database required)."""
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from python import search
+
+T0 = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeSession:
+    def __init__(self, results_by_mode):
+        self.results_by_mode = results_by_mode
+        self.calls = []
+
+    def execute(self, sql, params):
+        mode = "fuzzy" if "<%" in str(sql) else "fts"
+        self.calls.append((mode, str(sql), params))
+        return FakeResult(self.results_by_mode.get(mode, []))
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self.rows
+
+
+def _row(rank):
+    return {"post_id": uuid.uuid4(), "timestamp": T0, "platform": "twitter", "rank": rank, "snippet": "..."}
+
+
+def test_cursor_round_trip_pins_mode_and_window():
+    key = uuid.uuid4()
+    cursor = search.encode_cursor("fuzzy", 0.4375, T0, key, T0.replace(day=1), T0)
+    assert search.decode_cursor(cursor) == {"mode": "fuzzy", "rank": 0.4375, "ts": T0, "id": key, "since": T0.replace(day=1), "until": T0}
+    with pytest.raises(ValueError):
+        search.decode_cursor("garbage")
+
+
+def test_search_is_time_bounded_capped_and_seeks_past_the_cursor():
+    sql = str(search.build_search_sql(search.POSTS, "fts", platform=True, after=True))
+    assert "p.text_search @@ q.query" in sql
+    assert "p.ingestion_timestamp >= :since AND p.ingestion_timestamp < :until AND p.source_platform = :platform" in sql
+    assert "LIMIT :max_candidates" in sql
+    assert "(rank, ts, id) < (CAST(:cursor_rank AS real), :cursor_ts, :cursor_id)" in sql
+    assert "ILIKE" not in sql
+
+
+def test_fuzzy_fallback_only_when_full_text_finds_nothing():
+    session = FakeSession({"fuzzy": [_row(0.8), _row(0.6), _row(0.5)]})
+    page = search.search_posts(session, "colmbo", limit=2)
+    assert [mode for mode, _, _ in session.calls] == ["fts", "fuzzy"]
+    assert [r["match"] for r in page.rows] == ["fuzzy", "fuzzy"]
+    assert search.decode_cursor(page.next_cursor)["mode"] == "fuzzy"
+
+    session = FakeSession({"fts": [_row(0.1)]})
+    assert len(search.search_posts(session, "flood").rows) == 1
+    assert len(session.calls) == 1
+    with pytest.raises(ValueError):
+        search.search_posts(session, "   ")
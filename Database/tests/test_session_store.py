@@ -0,0 +1,48 @@
+"""Tests for the Redis session and token store of python/session_store.py (round trips need a Redis server)."""
+import redis
+import pytest
+
+from python.session_store import SESSION_PREFIX, SessionStore, TokenStore, _too_old, session_key, token_key
+
+
+@pytest.fixture
+def client():
+    client = redis.Redis.from_url('redis://localhost:6379/15')
+    try:
+        client.ping()
+    except redis.exceptions.ConnectionError:
+        pytest.skip('no Redis server at localhost:6379')
+    yield client
+    client.flushdb()
+
+
+def test_keys_hold_only_token_hashes():
+    key = session_key('raw-session-id')
+    assert key.startswith(SESSION_PREFIX) and 'raw-session-id' not in key and len(key) == len(SESSION_PREFIX) + 64
+    assert token_key('password_reset', 'raw') != token_key('verify_email', 'raw')
+
+
+def test_absolute_age_limit():
+    assert not _too_old({'created': 1000.0}, max_age=60, now=1060.0)
+    assert _too_old({'created': 1000.0}, max_age=60, now=1061.0)
+
+
+def test_session_round_trip_and_revocation(client):
+    store = SessionStore(client, ttl=60)
+    sid = store.create({'user': 'a@example.com'}, user_id='u1')
+    other = store.create({'user': 'a@example.com'}, user_id='u1')
+    assert store.get(sid) == {'user': 'a@example.com'}
+    assert 0 < client.ttl(session_key(sid)) <= 60
+    assert store.save(sid, {'user': 'a@example.com', 'role': 'user'})
+    assert store.get(sid)['role'] == 'user'
+    assert store.revoke_user('u1') == 2
+    assert store.get(sid) is None and store.get(other) is None
+    assert not store.save(sid, {'user': 'a@example.com'})
+
+
+def test_tokens_are_single_use(client):
+    tokens = TokenStore(client)
+    token = tokens.issue('password_reset', 'u1', ttl=60)
+    assert tokens.consume('verify_email', token) is None
+    assert tokens.consume('password_reset', token) == 'u1'
+    assert tokens.consume('password_reset', token) is None
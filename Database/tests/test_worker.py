@@ -0,0 +1,44 @@
+"""Tests for the worker's result rows and the location carried from the stream event (no database required)."""
+from datetime import datetime, timezone
+
+from python.models import Alert, Disaster, Post
+from real_time import worker
+
+T0 = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeSession:
+    def __init__(self):
+        self.added = []
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def of(self, cls):
+        return [o for o in self.added if isinstance(o, cls)]
+
+
+def test_event_location_keeps_only_set_fields():
+    assert worker.event_location({b'post_id': b'x'}) == {}
+    assert worker.event_location({b'region': b'Colombo', b'latitude': b'6.9271', b'longitude': b'79.8612'}) == {
+        'region': 'Colombo', 'latitude': 6.9271, 'longitude': 79.8612,
+    }
+
+
+def test_alert_and_disaster_carry_the_post_location():
+    session = FakeSession()
+    post = Post(source_platform='twitter', ingestion_timestamp=T0)
+    location = {'region': 'Colombo', 'latitude': 6.9271, 'longitude': 79.8612}
+    worker.write_results(session, post, 'flood', 0.95, 0.9, T0, T0, T0, location)
+    (alert,) = session.of(Alert)
+    assert (alert.region, alert.latitude, alert.longitude) == ('Colombo', 6.9271, 79.8612)
+    (disaster,) = session.of(Disaster)
+    assert [(l.name, l.latitude, l.longitude) for l in disaster.locations] == [('Colombo', 6.9271, 79.8612)]
+
+
+def test_alert_without_location_stays_global():
+    session = FakeSession()
+    worker.write_results(session, Post(source_platform='twitter', ingestion_timestamp=T0), 'flood', 0.95, 0.9, T0, T0, T0)
+    (alert,) = session.of(Alert)
+    assert alert.region is None and alert.latitude is None
+    assert session.of(Disaster)[0].locations == []
@@ -1,10 +1,46 @@
 from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import random
+import os
+import sys
+
+DATABASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Database')
+
+# Alert pages use the same cursors as Database/python/queries.py (python/cursors.py needs nothing beyond the stdlib)
+sys.path.insert(0, DATABASE_DIR)
+from python.cursors import decode_cursor, encode_cursor
+
+# Post search and logins run against the RTMD database when DATABASE_URL is set (Database/python/search.py,
+# Database/python/auth_service.py); otherwise /api/search falls back to matching the mock alerts and logins
+# check VALID_USERS
+search_posts = None
+auth_service = None
+if os.getenv('DATABASE_URL'):
+    sys.path.insert(0, DATABASE_DIR)
+    try:
+        from python import db as rtmd_db
+        from python.search import search_posts
+        rtmd_db.configure('ui')
+    except ImportError as e:
+        print('Post search disabled, Database package not importable:', e)
+    try:
+        from sqlalchemy.exc import IntegrityError
+        from python.auth_service import AuthBusyError, AuthService
+        auth_service = AuthService()
+    except ImportError as e:
+        print('Database logins disabled, auth dependencies not importable:', e)
 
 app = Flask(__name__)
 app.secret_key = 'disasterwatch_secret_2026'  # Secret key for sessions
 
+# With REDIS_URL, sessions live in the shared Redis store (Database/python/session_store.py), so any number of
+# UI workers serve the same logins; otherwise they are signed cookies
+if os.getenv('REDIS_URL'):
+    sys.path.insert(0, DATABASE_DIR)
+    from python.session_store import SessionStore
+    from redis_session import RedisSessionInterface
+    app.session_interface = RedisSessionInterface(SessionStore())
+
 # Mock alerts data - Real-time simulation
 mock_alerts = [
     {
@@ -158,6 +194,18 @@ def login():
         role = request.form.get('role', 'user')
         passkey = request.form.get('passkey', '').strip()
 
+        if auth_service is not None:
+            # RTMD users table: the username field takes the account email; admin rights come from users.roles
+            try:
+                account = auth_service.login(username, password)
+            except AuthBusyError:
+                flash('Too many sign-in attempts right now. Please try again shortly', 'warning')
+                return render_template('login.html'), 503
+            if account is None or (role == 'admin' and 'admin' not in account['roles']):
+                flash('Invalid username or password', 'danger')
+                return render_template('login.html')
+            return start_session(username, role, account['user_id'])
+
         # Validate username and password
         if username not in VALID_USERS:
             flash('Invalid username or password', 'danger')
@@ -182,20 +230,25 @@ def login():
                 flash('Invalid admin passkey', 'danger')
                 return render_template('login.html')
 
-        # Login successful - store in session
-        session['user'] = username
-        session['role'] = role
-        flash(f'Welcome {username}!', 'success')
-
-        # Redirect based on role
-        if role == 'admin':
-            return redirect(url_for('admin_panel'))
-        else:
-            return redirect(url_for('dashboard'))
+        return start_session(username, role)
 
     return render_template('login.html')
 
 
+def start_session(username, role, user_id=None):
+    """Login successful - store in session and redirect based on role"""
+    session['user'] = username
+    session['role'] = role
+    if user_id:
+        session['user_id'] = user_id
+    flash(f'Welcome {username}!', 'success')
+
+    if role == 'admin':
+        return redirect(url_for('admin_panel'))
+    else:
+        return redirect(url_for('dashboard'))
+
+
 @app.route('/signup', methods=['GET', 'POST'])
 def signup():
     """Unified signup page for User and Admin"""
@@ -230,7 +283,7 @@ def signup():
             return render_template('signup.html')
 
         # Check if username already exists
-        if username in VALID_USERS:
+        if auth_service is None and username in VALID_USERS:
             flash('Username already exists. Please choose another', 'danger')
             return render_template('signup.html')
 
@@ -241,6 +294,20 @@ def signup():
                 flash('Invalid admin passkey. Registration failed', 'danger')
                 return render_template('signup.html')
 
+        if auth_service is not None:
+            try:
+                user_id, token = auth_service.signup(email, password, roles=['admin'] if role == 'admin' else [])
+            except IntegrityError:
+                flash('An account with this email already exists', 'danger')
+                return render_template('signup.html')
+            except AuthBusyError:
+                flash('Too many sign-ups right now. Please try again shortly', 'warning')
+                return render_template('signup.html'), 503
+            # No mail delivery in the UI yet: the link is logged, as Database/python/auth_demo.py prints the token
+            print('Verification link for', email, url_for('verify_email', token=token, _external=True))
+            flash('Account created! Verify your email with the link we sent, then login with your email address.', 'success')
+            return redirect(url_for('login'))
+
         # Create new user in mock database
         if role == 'admin':
             VALID_USERS[username] = {
@@ -263,6 +330,16 @@ def signup():
     return render_template('signup.html')
 
 
+@app.route('/verify-email/<token>')
+def verify_email(token):
+    """Email verification link sent at signup (database logins only)"""
+    if auth_service is None or auth_service.verify_email(token) is None:
+        flash('This verification link is invalid or has expired', 'danger')
+    else:
+        flash('Email verified. You can now login.', 'success')
+    return redirect(url_for('login'))
+
+
 @app.route('/logout')
 def logout():
     """Logout route - clear session"""
@@ -315,7 +392,53 @@ def get_alerts():
     if severity and severity != 'all':
         filtered_alerts = [a for a in filtered_alerts if a['severity'] == severity]
     
-    return jsonify(filtered_alerts)
+    # Optional keyset paging (newest first by timestamp, id), same scheme and cursors as Database/python/queries.py:
+    # ?limit=N returns one page and the cursor for the next one in the X-Next-Cursor header
+    limit = request.args.get('limit', None, type=int)
+    if not limit:
+        return jsonify(filtered_alerts)
+    page_key = lambda a: (datetime.fromisoformat(a['timestamp']), a['id'])
+    page = sorted(filtered_alerts, key=page_key, reverse=True)
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            after = decode_cursor(cursor, key_type=int)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        page = [a for a in page if page_key(a) < after]
+    response = jsonify(page[:limit])
+    if len(page) > limit:
+        response.headers['X-Next-Cursor'] = encode_cursor(*page_key(page[limit - 1]))
+    return response
+
+
+@app.route('/api/search', methods=['GET'])
+def search():
+    """API endpoint for ranked post search: ?q=...&days=7&limit=20&cursor=..."""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+    limit = min(request.args.get('limit', 20, type=int), 100)
+
+    if search_posts is None:
+        words = query.lower().split()
+        matches = [a for a in mock_alerts if all(w in (a['message'] + ' ' + a['type']).lower() for w in words)]
+        results = [{'id': a['id'], 'timestamp': a['timestamp'], 'platform': 'mock', 'snippet': a['message'], 'rank': 1.0} for a in matches]
+        return jsonify({'results': results[:limit], 'next_cursor': None})
+
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(days=request.args.get('days', 30, type=float))
+    db_session = rtmd_db.get_session(readonly=True)
+    try:
+        page = search_posts(db_session, query, since=since, until=now, limit=limit, cursor=request.args.get('cursor') or None,
+                            platform=request.args.get('platform') or None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db_session.close()
+    results = [{'id': str(r['post_id']), 'timestamp': r['timestamp'].strftime('%Y-%m-%d %H:%M'), 'platform': r['platform'],
+                'snippet': r['snippet'], 'rank': round(float(r['rank']), 4), 'match': r['match']} for r in page.rows]
+    return jsonify({'results': results, 'next_cursor': page.next_cursor})
 
 
 @app.route('/api/alerts/new', methods=['GET'])
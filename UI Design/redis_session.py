@@ -0,0 +1,53 @@
+"""
+Flask sessions kept in the shared Redis session store (Database/python/session_store.py) instead of signed cookies.
+The cookie carries only the opaque session id, so every UI worker sees the same sessions, and a logout or a
+revocation (password reset, admin) takes effect everywhere at once. The id is replaced whenever the logged-in
+user changes, so an id set before login is never promoted to an authenticated session.
+"""
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+
+class RedisSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None):
+        def on_update(self):
+            self.modified = True
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.loaded_user = (initial or {}).get('user')
+        self.modified = False
+
+
+class RedisSessionInterface(SessionInterface):
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        data = self.store.get(sid) if sid else None
+        if data is None:
+            return RedisSession()
+        return RedisSession(data, sid)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if not session.modified:
+            return
+        if session.sid and (not session or session.get('user') != session.loaded_user):
+            self.store.delete(session.sid)
+            session.sid = None
+        if not session:
+            response.delete_cookie(name, domain=domain, path=path)
+            return
+        if session.sid is None:
+            session.sid = self.store.create(dict(session), user_id=session.get('user_id') or session.get('user'))
+        elif not self.store.save(session.sid, dict(session)):
+            # revoked or expired while this request ran: do not bring it back
+            response.delete_cookie(name, domain=domain, path=path)
+            return
+        response.set_cookie(
+            name, session.sid, httponly=self.get_cookie_httponly(app), secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app), domain=domain, path=path,
+        )
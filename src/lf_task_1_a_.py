@@ -15,7 +15,7 @@ import json
 import timm
 import torch.nn as nn
 import torch.nn.functional as F
-from transformers import RobertaTokenizer, RobertaForSequenceClassification
+from transformers import RobertaTokenizerFast, RobertaForSequenceClassification
 from PIL import Image
 from torchvision import transforms
 
@@ -23,7 +23,7 @@ from torchvision import transforms
 
 TEXT_MODEL_DIR = "/content/drive/MyDrive/TASK01/models/final_task1a_text_roberta"
 
-tokenizer = RobertaTokenizer.from_pretrained(TEXT_MODEL_DIR)
+tokenizer = RobertaTokenizerFast.from_pretrained(TEXT_MODEL_DIR)
 text_model = RobertaForSequenceClassification.from_pretrained(TEXT_MODEL_DIR)
 text_model.eval()
 
@@ -65,7 +65,6 @@ def get_text_probs(text):
         text,
         return_tensors="pt",
         truncation=True,
-        padding="max_length",
         max_length=128
     )
 
@@ -102,6 +101,64 @@ def late_fusion(text, image_path, w_text=0.6, w_image=0.4):
 
     return pred_id, final_probs, text_probs, image_probs
 
+"""Batched late fusion
+
+One tokenizer call, one RoBERTa forward and one ViT forward per batch; images are decoded on a thread pool.
+Each batch is padded to its longest text, not to max_length.
+Rows whose image is missing or unreadable fall back to text-only (their image_probs row is NaN).
+"""
+
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+IMAGE_DECODE_WORKERS = 8
+image_decode_pool = ThreadPoolExecutor(IMAGE_DECODE_WORKERS)
+
+def load_image(image_path):
+    if not image_path or not os.path.exists(image_path):
+        return None
+    try:
+        return image_transform(Image.open(image_path).convert("RGB"))
+    except OSError:
+        return None
+
+def get_text_probs_batch(texts):
+    inputs = tokenizer(
+        list(texts),
+        return_tensors="pt",
+        truncation=True,
+        padding=True,
+        max_length=128
+    )
+
+    with torch.no_grad():
+        outputs = text_model(**inputs)
+
+    return torch.softmax(outputs.logits, dim=1).cpu().numpy()
+
+def get_image_probs_batch(images):
+    probs = np.full((len(images), 2), np.nan, dtype=np.float32)
+    present = [i for i, image in enumerate(images) if image is not None]
+    if present:
+        batch = torch.stack([images[i] for i in present]).to(device)
+        with torch.no_grad():
+            probs[present] = softmax_with_temp(image_model(batch), T=2.0).cpu().numpy()
+    return probs
+
+def late_fusion_batch(texts, image_paths, w_text=0.6, w_image=0.4):
+    # the images decode while RoBERTa runs
+    image_futures = [image_decode_pool.submit(load_image, path) for path in image_paths]
+    text_probs = get_text_probs_batch(texts)
+    image_probs = get_image_probs_batch([f.result() for f in image_futures])
+
+    has_image = ~np.isnan(image_probs).any(axis=1)
+    final_probs = text_probs.copy()
+    final_probs[has_image] = w_text * text_probs[has_image] + w_image * image_probs[has_image]
+    pred_ids = final_probs.argmax(axis=1)
+
+    return pred_ids, final_probs, text_probs, image_probs
+
 """Test fusion on ONE sample"""
 
 DATA_DIR = "/content/drive/MyDrive/TASK01/data/"
@@ -126,19 +183,22 @@ from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 TEST_CSV = "/content/drive/MyDrive/TASK01/data/test_with_clean_text.csv"
 test_df = pd.read_csv(TEST_CSV)
 
-y_true = []
-y_pred = []
+BATCH_SIZE = 32
 
-for _, row in test_df.iterrows():
+texts = test_df["clean_text"].fillna("").tolist()
+img_paths = ["/content/drive/MyDrive/TASK01/data/" + name for name in test_df["image"]]
 
-    text = row["clean_text"]
-    img_path = "/content/drive/MyDrive/TASK01/data/" + row["image"]
+y_true = test_df["label_text_id"].tolist()   # same binary label
+y_pred = np.zeros(len(test_df), dtype=int)
 
-    pred_id, _, _, _ = late_fusion(text, img_path)
-
-    y_true.append(row["label_text_id"])   # same binary label
-    y_pred.append(pred_id)
+# batches of similar token length pad less; predictions go back to row order
+lengths = [len(ids) for ids in tokenizer(texts, truncation=True, max_length=128)["input_ids"]]
+order = np.argsort(lengths, kind="stable")
 
+for start in range(0, len(order), BATCH_SIZE):
+    idx = order[start:start + BATCH_SIZE]
+    pred_ids, _, _, _ = late_fusion_batch([texts[i] for i in idx], [img_paths[i] for i in idx])
+    y_pred[idx] = pred_ids
 
 acc = accuracy_score(y_true, y_pred)
 p, r, f1, _ = precision_recall_fscore_support(y_true, y_pred, average="binary")
@@ -149,3 +209,23 @@ print("Precision:", p)
 print("Recall   :", r)
 print("F1-score :", f1)
 
+
+"""Throughput: single-item path vs batched path"""
+
+import time
+
+N_BENCH = min(256, len(test_df))
+
+start = time.perf_counter()
+for text, img_path in zip(texts[:N_BENCH], img_paths[:N_BENCH]):
+    late_fusion(text, img_path)
+single_s = time.perf_counter() - start
+
+start = time.perf_counter()
+for b in range(0, N_BENCH, BATCH_SIZE):
+    late_fusion_batch(texts[b:b + BATCH_SIZE], img_paths[b:b + BATCH_SIZE])
+batch_s = time.perf_counter() - start
+
+print(f"Single-item : {N_BENCH / single_s:.1f} samples/s ({1000 * single_s / N_BENCH:.1f} ms/sample)")
+print(f"Batched ({BATCH_SIZE}): {N_BENCH / batch_s:.1f} samples/s ({1000 * batch_s / N_BENCH:.1f} ms/sample)")
+print(f"Speed-up    : {single_s / batch_s:.2f}x")
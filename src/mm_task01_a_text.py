@@ -196,8 +196,9 @@ import pandas as pd
 import numpy as np
 
 from transformers import (
-    RobertaTokenizer,
+    RobertaTokenizerFast,
     RobertaForSequenceClassification,
+    DataCollatorWithPadding,
     Trainer,
     TrainingArguments
 )
@@ -220,21 +221,22 @@ assert train_df["clean_text"].isnull().sum() == 0
 MODEL_NAME = "roberta-large"
 MAX_LEN = 128
 
-tokenizer = RobertaTokenizer.from_pretrained(MODEL_NAME)
+tokenizer = RobertaTokenizerFast.from_pretrained(MODEL_NAME)
 
+# Tokenized without padding: the collator pads each batch to its longest tweet, and group_by_length
+# batches tweets of similar length together (cleaned tweets are far shorter than MAX_LEN)
 class TweetDataset(torch.utils.data.Dataset):
     def __init__(self, texts, labels, tokenizer):
         self.encodings = tokenizer(
             texts,
             truncation=True,
-            padding="max_length",
             max_length=MAX_LEN
         )
         self.labels = labels
 
     def __getitem__(self, idx):
-        item = {k: torch.tensor(v[idx]) for k, v in self.encodings.items()}
-        item["labels"] = torch.tensor(self.labels[idx], dtype=torch.long)
+        item = {k: v[idx] for k, v in self.encodings.items()}
+        item["labels"] = self.labels[idx]
         return item
 
     def __len__(self):
@@ -279,6 +281,8 @@ def compute_metrics(eval_pred):
         "f1": f1,
     }
 
+data_collator = DataCollatorWithPadding(tokenizer, pad_to_multiple_of=8)
+
 training_args = TrainingArguments(
     output_dir="./task1a_text_roberta",
     eval_strategy="epoch",
@@ -286,6 +290,7 @@ training_args = TrainingArguments(
     learning_rate=1e-6,              # 🔥 paper value
     per_device_train_batch_size=16,  # 🔥 paper value
     per_device_eval_batch_size=16,
+    group_by_length=True,
     num_train_epochs=10,             # 🔥 paper value
     weight_decay=0.01,
     logging_steps=100,
@@ -301,6 +306,7 @@ trainer = Trainer(
     train_dataset=train_dataset,
     eval_dataset=dev_dataset,
     tokenizer=tokenizer,
+    data_collator=data_collator,
     compute_metrics=compute_metrics
 )
 
@@ -408,7 +414,6 @@ def predict_text(text, tokenizer, model, max_len=128):
         text,
         return_tensors="pt",
         truncation=True,
-        padding="max_length",
         max_length=max_len
     )
 
@@ -421,6 +426,23 @@ def predict_text(text, tokenizer, model, max_len=128):
 
     return pred_id, probs
 
+def predict_texts(texts, tokenizer, model, batch_size=64, max_len=128):
+    """Batched predict_text: texts are sorted by token length, so each batch pads only to its own longest text."""
+    model.eval()
+    device = next(model.parameters()).device
+
+    input_ids = tokenizer(list(texts), truncation=True, max_length=max_len)["input_ids"]
+    order = np.argsort([len(ids) for ids in input_ids], kind="stable")
+    probs = np.zeros((len(input_ids), model.config.num_labels), dtype=np.float32)
+
+    for start in range(0, len(order), batch_size):
+        idx = order[start:start + batch_size]
+        inputs = tokenizer.pad({"input_ids": [input_ids[i] for i in idx]}, return_tensors="pt").to(device)
+        with torch.no_grad():
+            probs[idx] = torch.softmax(model(**inputs).logits, dim=1).cpu().numpy()
+
+    return probs.argmax(axis=1), probs
+
 sample_text = "there are still people in the buildings we need to recure them asap"
 
 pred_id, probs = predict_text(sample_text, tokenizer, trainer.model)
@@ -434,6 +456,59 @@ print("\nClass probabilities:")
 for i, p in enumerate(probs):
     print(f"{id2label[i]}: {p:.4f}")
 
+"""Inference benchmark on the test set: max_length padding (slow tokenizer) vs dynamic padding with length buckets (fast tokenizer)"""
+
+import time
+from transformers import RobertaTokenizer
+
+def benchmark_inference(texts, tokenizer, model, bucketed, batch_size=64, max_len=128):
+    model.eval()
+    device = next(model.parameters()).device
+    texts = list(texts)
+    real_tokens, padded_tokens, latencies = 0, 0, []
+
+    start = time.perf_counter()
+    if bucketed:
+        lengths = [len(ids) for ids in tokenizer(texts, truncation=True, max_length=max_len)["input_ids"]]
+        texts = [texts[i] for i in np.argsort(lengths, kind="stable")]
+
+    for b in range(0, len(texts), batch_size):
+        t0 = time.perf_counter()
+        inputs = tokenizer(
+            texts[b:b + batch_size],
+            return_tensors="pt",
+            truncation=True,
+            padding=True if bucketed else "max_length",
+            max_length=max_len
+        ).to(device)
+        with torch.no_grad():
+            model(**inputs)
+        if device.type == "cuda":
+            torch.cuda.synchronize()
+        latencies.append(time.perf_counter() - t0)
+        real_tokens += int(inputs["attention_mask"].sum())
+        padded_tokens += inputs["input_ids"].numel()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "tokens_per_s": real_tokens / elapsed,
+        "tweets_per_s": len(texts) / elapsed,
+        "padding_share": 1 - real_tokens / padded_tokens,
+        "batch_p50_ms": 1000 * np.percentile(latencies, 50),
+        "batch_p95_ms": 1000 * np.percentile(latencies, 95),
+    }
+
+test_texts = test_df["clean_text"].tolist()
+slow_tokenizer = RobertaTokenizer.from_pretrained(MODEL_NAME)
+
+fixed = benchmark_inference(test_texts, slow_tokenizer, trainer.model, bucketed=False)
+dynamic = benchmark_inference(test_texts, tokenizer, trainer.model, bucketed=True)
+
+for name, result in (("max_length padding", fixed), ("dynamic + buckets ", dynamic)):
+    print(f"{name}: {result['tokens_per_s']:.0f} tokens/s, {result['tweets_per_s']:.1f} tweets/s, "
+          f"padding {100 * result['padding_share']:.1f}%, batch p50 {result['batch_p50_ms']:.1f} ms, p95 {result['batch_p95_ms']:.1f} ms")
+print(f"Speed-up: {dynamic['tweets_per_s'] / fixed['tweets_per_s']:.2f}x")
+
 """SAVE MODEL (to Google Drive)"""
 
 #trainer.save_model("./final_task1a_text_roberta")
@@ -478,14 +553,14 @@ print("✅ Task-01A Text model saved to:", MODEL_DIR)
 
 # ===== LOAD TASK-01A TEXT MODEL =====
 
-from transformers import RobertaForSequenceClassification, RobertaTokenizer
+from transformers import RobertaForSequenceClassification, RobertaTokenizerFast
 import json
 import torch
 
 MODEL_DIR = "/content/drive/MyDrive/TASK01/models/final_task1a_text_roberta"
 
 # Load tokenizer
-tokenizer = RobertaTokenizer.from_pretrained(MODEL_DIR)
+tokenizer = RobertaTokenizerFast.from_pretrained(MODEL_DIR)
 
 # Load model
 model = RobertaForSequenceClassification.from_pretrained(MODEL_DIR)
@@ -510,7 +585,6 @@ inputs = tokenizer(
     text,
     return_tensors="pt",
     truncation=True,
-    padding="max_length",
     max_length=128
 )
 
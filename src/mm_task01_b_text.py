@@ -164,8 +164,9 @@ train_df[["tweet_text", "clean_text"]].sample(5, random_state=42)
 import torch
 import numpy as np
 from transformers import (
-    RobertaTokenizer,
+    RobertaTokenizerFast,
     RobertaForSequenceClassification,
+    DataCollatorWithPadding,
     Trainer,
     TrainingArguments
 )
@@ -173,21 +174,22 @@ from transformers import (
 MODEL_NAME = "roberta-large"
 MAX_LEN = 128
 
-tokenizer = RobertaTokenizer.from_pretrained(MODEL_NAME)
+tokenizer = RobertaTokenizerFast.from_pretrained(MODEL_NAME)
 
+# Tokenized without padding: the collator pads each batch to its longest tweet, and group_by_length
+# batches tweets of similar length together (cleaned tweets are far shorter than MAX_LEN)
 class TweetDataset(torch.utils.data.Dataset):
     def __init__(self, texts, labels, tokenizer):
         self.encodings = tokenizer(
             texts,
             truncation=True,
-            padding="max_length",
             max_length=MAX_LEN
         )
         self.labels = labels
 
     def __getitem__(self, idx):
-        item = {k: torch.tensor(v[idx]) for k, v in self.encodings.items()}
-        item["labels"] = torch.tensor(self.labels[idx], dtype=torch.long)
+        item = {k: v[idx] for k, v in self.encodings.items()}
+        item["labels"] = self.labels[idx]
         return item
 
     def __len__(self):
@@ -236,6 +238,8 @@ def compute_metrics(eval_pred):
         "f1_macro": f1
     }
 
+data_collator = DataCollatorWithPadding(tokenizer, pad_to_multiple_of=8)
+
 training_args = TrainingArguments(
     output_dir="./task1b_text_roberta_4class",
     eval_strategy="epoch",
@@ -243,6 +247,7 @@ training_args = TrainingArguments(
     learning_rate=1e-6,
     per_device_train_batch_size=16,
     per_device_eval_batch_size=16,
+    group_by_length=True,
     num_train_epochs=10,
     weight_decay=0.01,
     logging_steps=100,
@@ -258,6 +263,7 @@ trainer = Trainer(
     train_dataset=train_dataset,
     eval_dataset=dev_dataset,
     tokenizer=tokenizer,
+    data_collator=data_collator,
     compute_metrics=compute_metrics
 )
 
@@ -337,7 +343,6 @@ def predict_text(text, tokenizer, model, max_len=128):
         text,
         return_tensors="pt",
         truncation=True,
-        padding="max_length",
         max_length=max_len
     )
 
@@ -350,6 +355,23 @@ def predict_text(text, tokenizer, model, max_len=128):
 
     return pred_id, probs
 
+def predict_texts(texts, tokenizer, model, batch_size=64, max_len=128):
+    """Batched predict_text: texts are sorted by token length, so each batch pads only to its own longest text."""
+    model.eval()
+    device = next(model.parameters()).device
+
+    input_ids = tokenizer(list(texts), truncation=True, max_length=max_len)["input_ids"]
+    order = np.argsort([len(ids) for ids in input_ids], kind="stable")
+    probs = np.zeros((len(input_ids), model.config.num_labels), dtype=np.float32)
+
+    for start in range(0, len(order), batch_size):
+        idx = order[start:start + batch_size]
+        inputs = tokenizer.pad({"input_ids": [input_ids[i] for i in idx]}, return_tensors="pt").to(device)
+        with torch.no_grad():
+            probs[idx] = torch.softmax(model(**inputs).logits, dim=1).cpu().numpy()
+
+    return probs.argmax(axis=1), probs
+
 sample_text = "Heavy flooding reported in Colombo after continuous rain"
 
 pred_id, probs = predict_text(sample_text, tokenizer, trainer.model)